@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Ulanishlar sozlamasi (config/settings.py) qaysi server interfeysi ekanini shu orqali biladi
+os.environ.setdefault('DJANGO_SERVER_INTERFACE', 'asgi')
 
 application = get_asgi_application()
@@ -31,8 +31,6 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     'django_filters',
     'phonenumber_field',
-
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
@@ -43,10 +41,53 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# debug_toolbar faqat DEBUG rejimida
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
+# Metrikalar (olcha/metrics.py): o'chirilgan bo'lsa middleware yuklanmaydi va /metrics marshruti yo'q;
+# METRICS_TOKEN bo'sh bo'lsa /metrics 403 qaytaradi
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', '500'))
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '100'))
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'olcha.metrics.MetricsMiddleware')
+
+# So'rovlarni cheklash (olcha/throttling.py): URL nomi -> scope, scope -> 'soni/davr'.
+# Hisoblagichlar THROTTLE_STORE da: CacheStore (Redis bo'lsa worker'lar orasida umumiy) yoki MemoryStore
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', 'True') == 'True'
+THROTTLE_STORE = os.getenv('THROTTLE_STORE', 'olcha.throttling.CacheStore')
+THROTTLE_CACHE_ALIAS = 'default'
+# Ilova oldidagi ishonchli proksilar soni: nginx/balanser ortida 0 qolsa hamma bitta IP (proksi) hisoblagichini bo'lishadi
+THROTTLE_NUM_PROXIES = int(os.getenv('THROTTLE_NUM_PROXIES', '0'))
+THROTTLE_RATES = {
+    'login': os.getenv('THROTTLE_LOGIN_RATE', '10/m'),
+    'login_username': os.getenv('THROTTLE_LOGIN_USERNAME_RATE', '5/m'),  # bitta akkauntga, IP'dan qat'i nazar
+    'register': os.getenv('THROTTLE_REGISTER_RATE', '5/h'),
+    'refresh': '30/m',
+    'like': '60/m',
+    'checkout': '20/m',
+}
+THROTTLE_RULES = {
+    'auth_login': ('login', 'login_username'),
+    'auth_register': 'register',
+    'auth_refresh': 'refresh',
+    'product-like': 'like',
+    'order-checkout': 'checkout',
+}
+if THROTTLE_ENABLED:
+    # Sessiya va autentifikatsiya middleware'laridan oldin
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'olcha.throttling.ThrottleMiddleware')
+
+# Replikalar sozlanmagan bo'lsa middleware o'zini o'chiradi (MiddlewareNotUsed)
+MIDDLEWARE.insert(MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+                  'olcha.db_router.ReplicaRoutingMiddleware')
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -68,16 +109,72 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': os.getenv('DB_NAME'),
-        'USER': os.getenv('DB_USER'),
-        'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT', '3306'),
+# DB_ENGINE=sqlite — lokal sinov uchun (DB_NAME fayl nomi, DB_REPLICAS esa replika fayllari)
+if os.getenv('DB_ENGINE', 'mysql') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / os.getenv('DB_NAME', 'db.sqlite3'),
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'HOST': os.getenv('DB_HOST'),
+            'PORT': os.getenv('DB_PORT', '3306'),
+        }
+    }
+
+# Ulanishlar: DB_POOL=True (MySQL) — har worker jarayonida pool (olcha/db/mysql_pool), so'rov oxirida ulanish
+# yopilmay pool'ga qaytadi; DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW — bitta jarayon ochadigan ulanishlar chegarasi.
+# Pool'siz: WSGI'da doimiy ulanishlar (CONN_MAX_AGE), ASGI'da esa har so'rov o'z thread'ida bo'lgani uchun CONN_MAX_AGE=0.
+# DJANGO_SERVER_INTERFACE ni config/wsgi.py va config/asgi.py o'rnatadi
+SERVER_INTERFACE = os.getenv('DJANGO_SERVER_INTERFACE', 'wsgi')
+if DATABASES['default']['ENGINE'] == 'django.db.backends.mysql' and os.getenv('DB_POOL', 'True') == 'True':
+    DATABASES['default'].update({
+        'ENGINE': 'olcha.db.mysql_pool',
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,  # pool o'zi tekshiradi (PING_AFTER)
+        'POOL': {
+            'SIZE': int(os.getenv('DB_POOL_SIZE', '5')),
+            'MAX_OVERFLOW': int(os.getenv('DB_POOL_MAX_OVERFLOW', '5')),
+            'TIMEOUT': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'RECYCLE': int(os.getenv('DB_POOL_RECYCLE', '1800')),  # MySQL wait_timeout dan kichik
+            'PING_AFTER': int(os.getenv('DB_POOL_PING_AFTER', '30')),
+        },
+    })
+else:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 0 if SERVER_INTERFACE == 'asgi' else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+    })
+
+# O'qish replikalari (olcha/db_router.py): DB_REPLICAS — vergul bilan ajratilgan hostlar (SQLite'da fayl nomlari).
+# Katalog GET so'rovlari replikadan o'qiladi, yozgan mijoz REPLICA_PIN_SECONDS davomida primary'da qoladi
+# REPLICA_CONNECT_TIMEOUT — ishlamayotgan replikaga ulanish (va sog'liq tekshiruvi) shuncha soniyadan uzoq kutmaydi
+REPLICA_CONNECT_TIMEOUT = int(os.getenv('REPLICA_CONNECT_TIMEOUT', '2'))
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+        DATABASES[alias]['NAME'] = BASE_DIR / replica.strip()
+    else:
+        DATABASES[alias]['HOST'] = replica.strip()
+        DATABASES[alias]['OPTIONS'] = {**DATABASES['default'].get('OPTIONS', {}), 'connect_timeout': REPLICA_CONNECT_TIMEOUT}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['olcha.db_router.ReplicaRouter'] if DATABASE_REPLICAS else []
+REPLICA_MODELS = {'olcha.category', 'olcha.subcategory', 'olcha.product', 'olcha.productimage', 'olcha.comment'}
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+REPLICA_PIN_CACHE_ALIAS = 'default'
+REPLICA_HEALTH_INTERVAL = 5
+REPLICA_RETRY_SECONDS = 30
+REPLICA_MAX_LAG = int(os.getenv('REPLICA_MAX_LAG')) if os.getenv('REPLICA_MAX_LAG') else None
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -104,15 +201,24 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JWT foydalanuvchisi token claim'laridan quriladi (olcha/authentication.py), User qatori har so'rovda o'qilmaydi;
+# bloklangan foydalanuvchi holati jarayon ichida JWT_USER_STATE_TTL soniya keshlanadi
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'True') == 'True'
+JWT_USER_STATE_TTL = int(os.getenv('JWT_USER_STATE_TTL', '30'))
+# Holat keshidagi foydalanuvchilar soni chegarasi (LRU)
+JWT_USER_STATE_MAX_ENTRIES = int(os.getenv('JWT_USER_STATE_MAX_ENTRIES', '10000'))
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # Header'ga qaraydigan autentifikatorlar oldin: Bearer so'rovda bitta tekshiruv, anonimda esa bazaga murojaat yo'q
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'olcha.authentication.StatelessJWTAuthentication' if JWT_STATELESS_AUTH
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.TokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'olcha.pagination.StandardPagination',
     'PAGE_SIZE': 4,
@@ -137,19 +243,67 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_REFRESH_SERIALIZER': 'olcha.blacklist.CachedTokenRefreshSerializer',
 }
 
+# Refresh token qora ro'yxati (olcha/blacklist.py): jarayon ichidagi bloom filtr va boshqa worker'lar bilan sinxronlash oralig'i.
+# Oraliq ichidagi logout'lar umumiy kesh (REDIS_URL) orqali darhol ko'rinadi; LocMemCache'da bloom 'yo'q' javobi bazada tasdiqlanadi
+TOKEN_BLACKLIST_BLOOM_CAPACITY = int(os.getenv('TOKEN_BLACKLIST_BLOOM_CAPACITY', '1000000'))
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+TOKEN_BLACKLIST_SYNC_SECONDS = float(os.getenv('TOKEN_BLACKLIST_SYNC_SECONDS', '2'))
+
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
-        "LOCATION": BASE_DIR / "caches",
+# Redis barcha worker va serverlar orasida umumiy kesh; REDIS_URL berilmasa jarayon ichidagi LocMemCache
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "olcha",
+        }
     }
-}
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "olcha",
+        }
+    }
+
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '300'))
+# Invalidatsiyadan keyin shuncha soniya sahifa obyektlari teglari bilan list yozuvlari keshlanmaydi (olcha/cache.py)
+CATALOG_CACHE_FRESH_SECONDS = 2
+# Kategoriyalar daraxti snapshot'i (olcha/category_tree.py) jarayon ichida ko'pi bilan shuncha soniya yashaydi
+CATEGORY_TREE_MAX_AGE = int(os.getenv('CATEGORY_TREE_MAX_AGE', '60'))
 
 
 PHONENUMBER_DEFAULT_REGION = 'UZ'
 
+# Rasm variantlari (olcha/images.py): `images.process` fon vazifasi orqali; True bo'lsa commit'dan keyin shu so'rovda
+IMAGE_PROCESSING_SYNC = os.getenv('IMAGE_PROCESSING_SYNC', 'False') == 'True'
+
+# Fon vazifalari (olcha/tasks.py): False bo'lsa vazifalar bazaga yoziladi va `manage.py run_tasks` bajaradi
+TASKS_EAGER = os.getenv('TASKS_EAGER', 'False') == 'True'
+# Bajarilgan vazifa qatorlari (va ularning idempotency_key'lari) shuncha soatdan keyin o'chiriladi
+TASKS_KEEP_DONE_HOURS = int(os.getenv('TASKS_KEEP_DONE_HOURS', '24'))
+
+# Email (olcha/notifications.py): EMAIL_HOST bo'sh bo'lsa xatlar konsolga chiqariladi
+EMAIL_HOST = os.getenv('EMAIL_HOST', '')
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND') or (
+    'django.core.mail.backends.smtp.EmailBackend' if EMAIL_HOST else 'django.core.mail.backends.console.EmailBackend'
+)
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Olcha <noreply@olcha.uz>')
+SERVER_EMAIL = DEFAULT_FROM_EMAIL
+# Yangi izohlar haqida xat oladiganlar (mail_admins): vergul bilan email'lar
+ADMINS = [('Olcha', email.strip()) for email in os.getenv('ADMINS', '').split(',') if email.strip()]
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -9,6 +9,12 @@ urlpatterns = [
     path('api/v1/', include('olcha.urls')),
 ]
 
+# /metrics faqat METRICS_ENABLED=True bo'lganda ochiladi (METRICS_TOKEN talab qilinadi)
+if settings.METRICS_ENABLED:
+    from olcha.metrics import metrics_view
+
+    urlpatterns += [path('metrics', metrics_view, name='metrics')]
+
 # DEBUG holatida debug_toolbar va media fayllar
 if settings.DEBUG:
     import debug_toolbar
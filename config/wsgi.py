@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Ulanishlar sozlamasi (config/settings.py) qaysi server interfeysi ekanini shu orqali biladi
+os.environ.setdefault('DJANGO_SERVER_INTERFACE', 'wsgi')
 
 application = get_wsgi_application()
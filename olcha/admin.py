@@ -1,5 +1,72 @@
 from django.contrib import admin
-from .models import Category, SubCategory, Product, ProductImage, Comment, Order
+from django.db.models import Count
+from .models import Category, SubCategory, Product, ProductImage, Comment, Order, Task
+from .pagination import EstimatedCountPaginator
+from .search import search_products
+from .tasks import registry
+
+
+class PerformanceAdminMixin(admin.ModelAdmin):
+    """
+    Katta jadvallar uchun changelist: COUNT(*) o'rniga taxminiy son (olcha/pagination.py),
+    filtrsiz umumiy sonni alohida hisoblamaslik va mahsulot bo'yicha FULLTEXT qidiruv.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = ('-pk',)  # indeks bo'yicha, changelist va autocomplete sahifalashi barqaror bo'ladi
+    product_search_field = None  # masalan 'product' — qidiruv shu FK orqali mahsulot nomiga ham qo'llanadi
+
+    def get_search_results(self, request, queryset, search_term):
+        filtered = queryset  # list_filter'lar allaqachon qo'llangan
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if self.product_search_field and search_term:
+            products = search_products(Product.objects.all(), search_term).order_by().values('pk')
+            queryset |= filtered.filter(**{f'{self.product_search_field}__in': products})
+        return queryset, may_have_duplicates
+
+
+class DiscountListFilter(admin.SimpleListFilter):
+    # AllValuesFieldListFilter butun jadval bo'yicha DISTINCT qiladi — oraliqlar esa oldindan ma'lum
+    title = 'chegirma'
+    parameter_name = 'discount_range'
+    ranges = {'0': (0, 0), '1-20': (1, 20), '21-50': (21, 50), '51-100': (51, 100)}
+
+    def lookups(self, request, model_admin):
+        return [(key, f'{key}%') for key in self.ranges]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.ranges:
+            low, high = self.ranges[self.value()]
+            return queryset.filter(discount__gte=low, discount__lte=high)
+        return queryset
+
+
+class RatingListFilter(admin.SimpleListFilter):
+    title = 'reyting'
+    parameter_name = 'rating'
+
+    def lookups(self, request, model_admin):
+        return [(str(value), str(value)) for value in range(1, 6)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(rating=self.value())
+        return queryset
+
+
+class TaskNameListFilter(admin.SimpleListFilter):
+    # Vazifa nomlari ro'yxatga olingan handler'lardan olinadi, jadvaldan DISTINCT qilinmaydi
+    title = 'vazifa'
+    parameter_name = 'name'
+
+    def lookups(self, request, model_admin):
+        return [(name, name) for name in sorted(registry)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(name=self.value())
+        return queryset
 
 
 # ProductImage inline
@@ -17,26 +84,39 @@ class SubCategoryInline(admin.TabularInline):
 
 # Category admin
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PerformanceAdminMixin):
     list_display = ('title', 'slug', 'image', 'get_subcategories_count')
+    search_fields = ('title',)
     prepopulated_fields = {'slug': ('title',)}
     inlines = [SubCategoryInline]
 
-    def get_subcategories_count(self, obj):
-        return obj.subcategories.count()
+    def get_queryset(self, request):
+        # Har qator uchun alohida COUNT o'rniga bitta GROUP BY
+        return super().get_queryset(request).annotate(subcategories_total=Count('subcategories'))
 
-    get_subcategories_count.short_description = 'Subkategoriyalar soni'
+    @admin.display(description='Subkategoriyalar soni', ordering='subcategories_total')
+    def get_subcategories_count(self, obj):
+        return obj.subcategories_total
 
 
 # Product admin
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(PerformanceAdminMixin):
     list_display = ('name', 'price', 'quantity', 'subcategory', 'category', 'discount')
-    list_filter = ('subcategory__category', 'subcategory', 'discount')
-    search_fields = ('name', 'description')
+    list_select_related = ('subcategory', 'category')
+    list_filter = ('category', 'subcategory', DiscountListFilter)
+    search_fields = ('name',)
+    search_help_text = "Nom va tavsif bo'yicha to'liq matnli qidiruv"
+    autocomplete_fields = ('category', 'subcategory')
     prepopulated_fields = {'slug': ('name',)}
     inlines = [ProductImageInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # name/description bo'yicha LIKE '%...%' skan o'rniga search_text FULLTEXT indeksi
+        if not search_term:
+            return queryset, False
+        return search_products(queryset, search_term), False
+
     def save_model(self, request, obj, form, change):
         # Agar category tanlangan bo'lsa va subcategory tanlanmagan bo'lsa
         if obj.category and not obj.subcategory:
@@ -57,34 +137,58 @@ class ProductAdmin(admin.ModelAdmin):
 
 # ProductImage admin
 @admin.register(ProductImage)
-class ProductImageAdmin(admin.ModelAdmin):
+class ProductImageAdmin(PerformanceAdminMixin):
     list_display = ('product', 'image', 'alt_text')
-    search_fields = ('product__name',)
+    list_select_related = ('product',)
     list_filter = ('product__subcategory',)
+    search_fields = ('=product__id',)
+    product_search_field = 'product'
+    autocomplete_fields = ('product',)
 
 
 # SubCategory admin
 @admin.register(SubCategory)
-class SubCategoryAdmin(admin.ModelAdmin):
+class SubCategoryAdmin(PerformanceAdminMixin):
     list_display = ('name', 'category', 'slug')
+    list_select_related = ('category',)
     list_filter = ('category',)
     search_fields = ('name', 'category__title')
+    autocomplete_fields = ('category',)
     prepopulated_fields = {'slug': ('name',)}
 
 
 # Comment admin
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PerformanceAdminMixin):
     list_display = ('user', 'product', 'rating', 'created')
-    list_filter = ('rating', 'created')
-    search_fields = ('message', 'user__username', 'product__name')
+    list_select_related = ('user', 'product')
+    list_filter = (RatingListFilter, 'created')
+    # ^message — faqat izoh boshi bo'yicha (LIKE 'x%'); TEXT ustunida indeks yo'q, katta jadvalda filtrlar bilan toraytiring
+    search_fields = ('=user__username', '^message')
+    search_help_text = "Foydalanuvchi nomi (aniq), izoh boshi yoki mahsulot nomi bo'yicha"
+    product_search_field = 'product'
+    autocomplete_fields = ('user', 'product')
     readonly_fields = ('created',)
 
 
 # Order admin
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(PerformanceAdminMixin):
     list_display = ('id', 'full_name', 'product', 'quantity', 'total_price', 'created_at')
+    list_select_related = ('product',)
     list_filter = ('created_at',)
-    search_fields = ('full_name', 'phone', 'product__name')
-    readonly_fields = ('total_price', 'created_at', 'updated_at')
\ No newline at end of file
+    # ^full_name — order_full_name_idx indeksi bo'yicha prefiks qidiruv
+    search_fields = ('=id', '=phone', '=checkout_id', '^full_name')
+    search_help_text = "Buyurtma raqami, telefon (aniq), F.I.Sh. boshi yoki mahsulot nomi bo'yicha"
+    product_search_field = 'product'
+    autocomplete_fields = ('user', 'product')
+    readonly_fields = ('total_price', 'created_at', 'updated_at')
+
+
+# Task admin
+@admin.register(Task)
+class TaskAdmin(PerformanceAdminMixin):
+    list_display = ('id', 'name', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('status', TaskNameListFilter)
+    search_fields = ('=idempotency_key',)
+    readonly_fields = ('created_at', 'updated_at', 'locked_at', 'last_error')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OlchaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'olcha'
+
+    def ready(self):
+        from . import signals, notifications  # noqa: F401
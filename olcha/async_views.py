@@ -0,0 +1,151 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .authentication import get_jwt_authentication
+from .models import Category, SubCategory, Product, ProductImage, Comment, ProductQuerySet
+from .pagination import StandardPagination
+from .serializers import (
+    CategorySerializer, CategoryDetailSerializer, SubCategorySerializer,
+    ProductSerializer, ProductDetailSerializer, ProductImageSerializer,
+)
+
+# ASGI ostida ishlaydigan katalog endpointlari: DRF'siz, Django async ORM bilan
+
+
+class ProductAsyncDetailSerializer(ProductDetailSerializer):
+    images = serializers.SerializerMethodField()
+
+    def get_images(self, obj):
+        return ProductImageSerializer(obj.fetched_images, many=True, context=self.context).data
+
+
+class CategoryAsyncDetailSerializer(CategoryDetailSerializer):
+    subcategories = serializers.SerializerMethodField()
+
+    def get_subcategories(self, obj):
+        return SubCategorySerializer(obj.fetched_subcategories, many=True, context=self.context).data
+
+
+async def aget_user(request):
+    # JWT (Bearer) bo'lsa uni, aks holda sessiya foydalanuvchisini qaytaradi
+    try:
+        result = await sync_to_async(get_jwt_authentication().authenticate)(request)
+    except AuthenticationFailed:
+        result = None
+    if result is not None:
+        return result[0]
+    return await request.auser()
+
+
+def int_param(request, name, default=None):
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def get_page_params(request):
+    page = max(int_param(request, 'page', 1), 1)
+    page_size = int_param(request, StandardPagination.page_size_query_param, StandardPagination.page_size)
+    return page, min(max(page_size, 1), StandardPagination.max_page_size)
+
+
+async def paginate(request, queryset, serializer_class, context):
+    page, page_size = get_page_params(request)
+    offset = (page - 1) * page_size
+    count = await queryset.acount()
+    items = await _alist(queryset[offset:offset + page_size])
+    if not items and page > 1:
+        raise Http404
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, 'page', page + 1) if offset + page_size < count else None
+    previous_link = None
+    if page > 2:
+        previous_link = replace_query_param(url, 'page', page - 1)
+    elif page == 2:
+        previous_link = remove_query_param(url, 'page')
+    return JsonResponse({
+        'next': next_link,
+        'previous': previous_link,
+        'count': count,
+        'results': serializer_class(items, many=True, context=context).data,
+    }, encoder=JSONEncoder)
+
+
+async def _alist(queryset):
+    # prefetch_related bilan aiterator() ga chunk_size berish shart
+    return [obj async for obj in queryset.aiterator(chunk_size=2000)]
+
+
+@require_GET
+async def category_list(request):
+    queryset = Category.objects.annotate(subcategories_total=Count('subcategories')).order_by('id')
+    return await paginate(request, queryset, CategorySerializer, {'request': request})
+
+
+@require_GET
+async def category_detail(request, pk):
+    queryset = Category.objects.annotate(subcategories_total=Count('subcategories'))
+    try:
+        category = await queryset.aget(pk=pk)
+    except Category.DoesNotExist:
+        raise Http404
+    subcategories = await _alist(SubCategory.objects.filter(category_id=pk).select_related('category').order_by('id'))
+    category.fetched_subcategories = subcategories
+    data = CategoryAsyncDetailSerializer(category, context={'request': request}).data
+    return JsonResponse(data, encoder=JSONEncoder)
+
+
+@require_GET
+async def subcategory_list(request):
+    queryset = SubCategory.objects.select_related('category').order_by('id')
+    category_id = int_param(request, 'category')
+    if category_id is not None:
+        queryset = queryset.filter(category_id=category_id)
+    return await paginate(request, queryset, SubCategorySerializer, {'request': request})
+
+
+@require_GET
+async def subcategory_detail(request, pk):
+    try:
+        subcategory = await SubCategory.objects.select_related('category').aget(pk=pk)
+    except SubCategory.DoesNotExist:
+        raise Http404
+    return JsonResponse(SubCategorySerializer(subcategory).data, encoder=JSONEncoder)
+
+
+@require_GET
+async def product_list(request):
+    user = await aget_user(request)
+    queryset = Product.objects.with_list_data(user).order_by('-created_at')
+    for field in ('subcategory', 'category', 'discount'):
+        value = int_param(request, field)
+        if value is not None:
+            queryset = queryset.filter(**{field: value})
+    return await paginate(request, queryset, ProductSerializer, {'request': request})
+
+
+@require_GET
+async def product_detail(request, pk):
+    user = await aget_user(request)
+    product_queryset = Product.objects.select_related('subcategory', 'subcategory__category').annotate(
+        is_liked=ProductQuerySet._is_liked(user)
+    )
+    # Async ORM so'rovlarni bitta ulanish orqali ketma-ket bajaradi (asyncio.gather parallellik bermaydi),
+    # shuning uchun so'rovlar navbat bilan yuboriladi; mahsulot topilmasa qolganlari umuman yuborilmaydi
+    try:
+        product = await product_queryset.aget(pk=pk)
+    except Product.DoesNotExist:
+        raise Http404
+    images = await _alist(ProductImage.objects.filter(product_id=pk).order_by('id'))
+    comments = await _alist(Comment.objects.filter(product_id=pk).select_related('user').order_by('-created')[:5])
+    product.fetched_images = images
+    product.latest_comments = comments
+    data = ProductAsyncDetailSerializer(product, context={'request': request}).data
+    return JsonResponse(data, encoder=JSONEncoder)
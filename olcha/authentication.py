@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from .blacklist import CachedRefreshToken
+
+# user_id -> (muddati, {'is_active', 'is_staff', 'is_superuser'} yoki None); LRU, JWT_USER_STATE_MAX_ENTRIES gacha
+_user_states = OrderedDict()
+_user_states_lock = threading.Lock()
+
+
+def issue_tokens(user):
+    """
+    Refresh/access juftligi. username va is_staff claim'lari tokenga yoziladi —
+    StatelessJWTAuthentication foydalanuvchini bazadan o'qimasdan shulardan quradi.
+    """
+    refresh = CachedRefreshToken.for_user(user)
+    refresh['username'] = user.get_username()
+    refresh['is_staff'] = user.is_staff
+    refresh['is_superuser'] = user.is_superuser
+    return refresh
+
+
+def get_user_state(user_id):
+    """
+    Bloklangan/o'chirilgan foydalanuvchini aniqlash uchun holat. Jarayon ichida
+    JWT_USER_STATE_TTL soniya saqlanadi, ya'ni har foydalanuvchi uchun shu oraliqda ko'pi bilan bitta so'rov.
+    """
+    now = time.monotonic()
+    with _user_states_lock:
+        cached = _user_states.get(user_id)
+        if cached is not None and cached[0] > now:
+            _user_states.move_to_end(user_id)
+            return cached[1]
+    state = User.objects.filter(pk=user_id).values('is_active', 'is_staff', 'is_superuser').first()
+    with _user_states_lock:
+        _user_states[user_id] = (now + settings.JWT_USER_STATE_TTL, state)
+        _user_states.move_to_end(user_id)
+        # Eng uzoq ishlatilmaganlari chiqariladi — lug'at faol foydalanuvchilar soni bilan cheksiz o'smaydi
+        while len(_user_states) > getattr(settings, 'JWT_USER_STATE_MAX_ENTRIES', 10000):
+            _user_states.popitem(last=False)
+    return state
+
+
+def forget_user_state(user_id):
+    with _user_states_lock:
+        _user_states.pop(user_id, None)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Bearer token'dan User qatorini yuklamasdan TokenUser quradi (id, username, is_staff claim'lari).
+    Huquqlar (is_active/is_staff) qisqa muddatli keshdagi holat bilan tekshiriladi,
+    shuning uchun bloklash yoki admin huquqini olish TTL ichida kuchga kiradi.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Tokenda foydalanuvchi identifikatori yo'q")
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed("Foydalanuvchi topilmadi", code='user_not_found')
+        if not state['is_active']:
+            raise AuthenticationFailed("Foydalanuvchi faol emas", code='user_inactive')
+
+        user = TokenUser(validated_token)
+        # Eski tokenlarda claim bo'lmasligi mumkin — huquqlar baribir bazadagi holatdan olinadi
+        user.is_staff = state['is_staff']
+        user.is_superuser = state['is_superuser']
+        return user
+
+
+def get_jwt_authentication():
+    if settings.JWT_STATELESS_AUTH:
+        return StatelessJWTAuthentication()
+    return JWTAuthentication()
@@ -0,0 +1,157 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class BloomFilter:
+    """
+    Qora ro'yxatdagi jti'lar uchun ixcham to'plam: "yo'q" javobi aniq, "bor" javobi
+    error_rate ehtimollik bilan xato bo'lishi mumkin (shuning uchun bazada tasdiqlanadi).
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistIndex:
+    """
+    Jarayon ichidagi bloom filtr. Boshqa worker'larda qo'shilgan yozuvlar har
+    TOKEN_BLACKLIST_SYNC_SECONDS da pk > oxirgi_pk so'rovi bilan olinadi — narxi jadval hajmiga bog'liq emas.
+
+    Sinxronlash oralig'ida boshqa worker'dagi logout ham darhol amal qilishi uchun qora ro'yxatga qo'shish
+    umumiy keshga vaqt belgisi yozadi: bloom "yo'q" desa-yu, oxirgi sinxronlashdan keyin logout bo'lgan bo'lsa,
+    bazada tekshiriladi. Kesh umumiy bo'lmasa (LocMemCache) har "yo'q" javobi bazada tasdiqlanadi.
+    Baza so'rovlari lock'dan tashqarida bajariladi — sinxronlash paytida boshqa thread'lar kutmaydi.
+    """
+
+    batch_size = 10000
+    recent_key = 'token-blacklist:last-added'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._synced_wall = 0.0  # time.time() — umumiy keshdagi belgi bilan solishtirish uchun
+        self._syncing = False
+
+    def _fetch(self, queryset, last_id, add):
+        while True:
+            batch = list(queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'token__jti')[:self.batch_size])
+            if not batch:
+                return last_id
+            for _, jti in batch:
+                add(jti)
+            last_id = batch[-1][0]
+
+    def _build(self):
+        live = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        capacity = max(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, live.count() * 2)
+        bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+        return bloom, self._fetch(live, 0, bloom.add)
+
+    def sync(self, force=False):
+        started, wall = time.monotonic(), time.time()
+        with self._lock:
+            due = self._bloom is None or force or started - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_SECONDS
+            if self._syncing or not due:
+                return
+            self._syncing = True
+            bloom, last_id = self._bloom, self._last_id
+        try:
+            added = []
+            if bloom is None or bloom.count > bloom.capacity:
+                bloom, last_id = self._build()
+            else:
+                last_id = self._fetch(BlacklistedToken.objects.all(), last_id, added.append)
+            with self._lock:
+                for jti in added:
+                    bloom.add(jti)
+                self._bloom, self._last_id = bloom, last_id
+                self._synced_at, self._synced_wall = started, wall
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def _maybe_stale(self):
+        cache = caches['default']
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            return True
+        marker = cache.get(self.recent_key)
+        # 1 soniya — worker'lar soatlari orasidagi farq uchun zaxira
+        return marker is not None and marker >= self._synced_wall - 1
+
+    def _in_database(self, jti):
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def contains(self, jti):
+        self.sync()
+        bloom = self._bloom
+        if bloom is None or jti in bloom:
+            # Filtr hali boshqa thread'da qurilmoqda yoki "bor" (ehtimol noto'g'ri musbat) — unique indeks bo'yicha
+            return self._in_database(jti)
+        if self._maybe_stale():
+            return self._in_database(jti)
+        return False
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        timeout = settings.TOKEN_BLACKLIST_SYNC_SECONDS + 1
+        transaction.on_commit(lambda: caches['default'].set(self.recent_key, time.time(), timeout))
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+
+
+blacklist_index = BlacklistIndex()
+
+
+class CachedRefreshToken(RefreshToken):
+    """Qora ro'yxat tekshiruvi har refresh'da bazaga emas, bloom filtrga tushadi."""
+
+    def check_blacklist(self):
+        if blacklist_index.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("Token qora ro'yxatda")
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    # SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER'] orqali /auth/refresh/ da ishlatiladi
+    token_class = CachedRefreshToken
@@ -0,0 +1,169 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+from .metrics import record_cache
+from .db_router import used_replica
+
+# Jarayon ichidagi hit/miss hisoblagichlari (benchmark va metrikalar uchun)
+stats = {'hits': 0, 'misses': 0}
+
+
+def get_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _tag_key(tag):
+    return f'catalog:tag:{tag}'
+
+
+def _seed_version():
+    # Versiya kaliti keshdan chiqib ketsa, hisoblagich 1 dan qayta boshlansa eski versiya qaytadan chiqadi va
+    # eski yozuv (yoki 304) yaroqli bo'lib qoladi. Vaqtga asoslangan boshlang'ich qiymat hech qachon takrorlanmaydi
+    return time.time_ns()
+
+
+def get_tag_versions(tags):
+    cache = get_cache()
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, tag in keys.items():
+        if key not in found:
+            seed = _seed_version()
+            cache.add(key, seed, timeout=None)
+            found[key] = cache.get(key, seed)
+        versions[tag] = found[key]
+    return versions
+
+
+def invalidate_tags(*tags):
+    """
+    Teg versiyasini oshirish shu tegga bog'langan barcha yozuvlarni eskirtiradi. Joriy tranzaksiya
+    commit bo'lgandan keyin bajariladi — aks holda parallel o'quvchi commit'gacha bo'lgan ma'lumotni
+    yangi versiya bilan keshlab qo'yishi mumkin.
+    """
+    transaction.on_commit(lambda: bump_tags(tags))
+
+
+def bump_tags(tags):
+    cache = get_cache()
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            cache.set(_tag_key(tag), _seed_version(), timeout=None)
+    # Teglar qisqa muddat "yangi" deb belgilanadi: versiyasi DB o'qishidan keyin olinadigan yozuvlar
+    # (sahifadagi obyekt teglari, replikadan o'qish) bu oraliqda keshlanmaydi — set_entry ga qarang
+    cache.set_many({_fresh_key(tag): 1 for tag in tags}, timeout=_fresh_seconds())
+
+
+def _fresh_seconds():
+    seconds = settings.CATALOG_CACHE_FRESH_SECONDS
+    if settings.DATABASE_REPLICAS:
+        seconds = max(seconds, settings.REPLICA_PIN_SECONDS)
+    return seconds
+
+
+def _fresh_key(tag):
+    return f'catalog:tag-fresh:{tag}'
+
+
+def build_key(prefix, request, *parts, per_user=False):
+    # Query parametrlarini tartiblab normallashtiramiz: ?a=1&b=2 va ?b=2&a=1 bitta kalit
+    params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    user_id = request.user.pk if per_user and request.user.is_authenticated else 0
+    raw = repr((parts, params, user_id))
+    return f'catalog:{prefix}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def get_entry(key):
+    # Yaroqli yozuv ({'data': .., 'tags': {teg: versiya}}) yoki None
+    entry = get_cache().get(key)
+    if entry is not None and get_tag_versions(entry['tags']) == entry['tags']:
+        stats['hits'] += 1
+        record_cache(hit=True)
+        return entry
+    stats['misses'] += 1
+    record_cache(hit=False)
+    return None
+
+
+def set_entry(key, data, versions, late_tags=()):
+    # late_tags versiyasi DB o'qishidan keyin olingan; teg endigina yangilangan bo'lsa javob eski bo'lishi mumkin —
+    # keshlamaymiz. Replikadan o'qilgan javob uchun bu barcha teglarga tegishli (replika lag'i)
+    check = set(late_tags)
+    if used_replica():
+        check.update(versions)
+    if check and get_cache().get_many([_fresh_key(tag) for tag in check]):
+        return
+    timeout = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300)
+    get_cache().set(key, {'data': data, 'tags': versions}, timeout=timeout)
+
+
+class CachedReadMixin:
+    """
+    list va retrieve javoblarini teglar bilan keshlaydi.
+    Kesh model signal'lari orqali invalidate_tags() chaqirilganda eskiradi.
+    """
+    cache_prefix = None
+    cache_per_user = False  # javobda foydalanuvchiga xos maydonlar bo'lsa True
+    # True bo'lsa list yozuvi sahifadagi har obyekt tegi ({prefix}:{pk}) bilan ham belgilanadi: obyektning
+    # o'zigina o'zgarsa (like, rasm) faqat u bor sahifalar eskiradi, umumiy list tegi esa oshirilmaydi
+    cache_item_tags = False
+
+    def get_list_cache_tags(self):
+        return [self.cache_prefix]
+
+    def get_item_cache_tags(self):
+        if not self.cache_item_tags:
+            return []
+        return [f"{self.cache_prefix}:{obj.pk}" for obj in getattr(self, '_cached_page', None) or ()]
+
+    def paginate_queryset(self, queryset):
+        self._cached_page = super().paginate_queryset(queryset)
+        return self._cached_page
+
+    def get_detail_cache_tags(self):
+        return [f"{self.cache_prefix}:{self.kwargs[self.lookup_field]}"]
+
+    def get_extra_detail_cache_tags(self, data):
+        # Javob ichidagi bog'liq obyektlar (masalan, kategoriya) uchun teglar
+        return []
+
+    def list(self, request, *args, **kwargs):
+        key = build_key(self.cache_prefix, request, 'list', per_user=self.cache_per_user)
+        entry = get_entry(key)
+        if entry is not None:
+            self.cache_versions = entry['tags']
+            return Response(entry['data'])
+
+        # Versiyalarni DB o'qishidan oldin olamiz, aks holda parallel yozuv eski ma'lumotni "yangi" qilib qo'yadi
+        versions = get_tag_versions(self.get_list_cache_tags())
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            item_tags = self.get_item_cache_tags()
+            versions.update(get_tag_versions(item_tags))
+            set_entry(key, response.data, versions, late_tags=item_tags)
+        self.cache_versions = versions  # javob validatori (olcha/conditional.py)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        key = build_key(
+            self.cache_prefix, request, 'detail', self.kwargs[self.lookup_field], per_user=self.cache_per_user
+        )
+        entry = get_entry(key)
+        if entry is not None:
+            self.cache_versions = entry['tags']
+            return Response(entry['data'])
+
+        versions = get_tag_versions(self.get_detail_cache_tags())
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == 200:
+            extra_tags = self.get_extra_detail_cache_tags(response.data)
+            versions.update(get_tag_versions(extra_tags))
+            set_entry(key, response.data, versions, late_tags=extra_tags)
+        self.cache_versions = versions
+        return response
@@ -0,0 +1,236 @@
+import csv
+import io
+import json
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from .cache import invalidate_tags
+from .category_tree import TREE_TAG
+from .signals import PRODUCT_LISTS_TAG
+from .documents import schedule_refresh
+from .models import Category, SubCategory, Product
+from .search import build_search_text
+from .serializers import ProductImportSerializer
+
+FIELDS = ['name', 'slug', 'description', 'price', 'discount', 'quantity', 'category', 'subcategory']
+UPDATE_FIELDS = [
+    'name', 'description', 'price', 'discount', 'quantity', 'category', 'subcategory', 'search_text', 'updated_at',
+]
+INVALID_RECORD = '__invalid__'
+
+
+def detect_format(filename, default='csv'):
+    if filename and filename.lower().endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def iter_records(stream, file_format):
+    # Faylni satrma-satr o'qiymiz — butun fayl xotiraga yuklanmaydi
+    if file_format == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            # Buzilgan satr butun importni to'xtatmaydi — build_product uni xato sifatida qaytaradi
+            yield record if isinstance(record, dict) else {INVALID_RECORD: line[:100]}
+    else:
+        yield from csv.DictReader(stream)
+
+
+class CategoryResolver:
+    """
+    Kategoriya va subkategoriyalarni slug bo'yicha xotiradagi xaritadan topadi.
+    Yangi nomlar uchun yozuv bir marta yaratiladi va xaritaga qo'shiladi.
+    """
+
+    def __init__(self):
+        self.categories = dict(Category.objects.values_list('slug', 'id'))
+        self.subcategories = {
+            slug: (pk, category_id)
+            for slug, pk, category_id in SubCategory.objects.values_list('slug', 'id', 'category_id')
+        }
+
+    def category(self, value):
+        slug = slugify(value or '')
+        if not slug:
+            return None
+        if slug not in self.categories:
+            self.categories[slug] = Category.objects.create(title=value, slug=slug).pk
+        return self.categories[slug]
+
+    def subcategory(self, value, category_id):
+        slug = slugify(value or '')
+        if not slug:
+            return None, category_id
+        if slug not in self.subcategories:
+            if category_id is None:
+                return None, None
+            self.subcategories[slug] = (SubCategory.objects.create(name=value, slug=slug, category_id=category_id).pk,
+                                        category_id)
+        pk, parent_id = self.subcategories[slug]
+        return pk, category_id or parent_id
+
+
+def _format_errors(errors):
+    return '; '.join(f"{field}: {' '.join(str(message) for message in messages)}" for field, messages in errors.items())
+
+
+def build_product(record, resolver):
+    """
+    Qatorni ProductImportSerializer bilan tekshirib, saqlanmagan Product qaytaradi (manfiy son, NaN yoki
+    juda katta narx bazaga yetib bormaydi). Ikkinchi qiymat — slug faylda aniq berilganmi.
+    """
+    if INVALID_RECORD in record:
+        raise ValueError(f"noto'g'ri JSON: {record[INVALID_RECORD]!r}")
+    # CSV'dagi bo'sh kataklar "berilmagan" deb hisoblanadi
+    data = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in record.items() if key in FIELDS
+    }
+    data = {key: value for key, value in data.items() if value not in ('', None)}
+    serializer = ProductImportSerializer(data=data)
+    if not serializer.is_valid():
+        raise ValueError(_format_errors(serializer.errors))
+    values = serializer.validated_data
+
+    slug = values.get('slug') or slugify(values['name'])
+    if not slug:
+        raise ValueError("nomdan slug yasab bo'lmadi — slug ustunini to'ldiring")
+    category_id = resolver.category(values.get('category'))
+    subcategory_id, category_id = resolver.subcategory(values.get('subcategory'), category_id)
+    description = values.get('description')
+    product = Product(
+        name=values['name'],
+        slug=slug,
+        description=description,
+        price=values['price'],
+        discount=values['discount'],
+        quantity=values['quantity'],
+        category_id=category_id,
+        subcategory_id=subcategory_id,
+        search_text=build_search_text(values['name'], description),
+    )
+    return product, 'slug' in values
+
+
+def _write_batch(batch, errors):
+    """
+    Product.slug unique emas, shuning uchun faqat aniq berilgan slug bitta mahsulotga mos kelsa yangilanadi.
+    Slug bir nechta mahsulotda bo'lsa, yoki slug berilmagan va nomdan yasalgani band bo'lsa — qator rad etiladi
+    (boshqa mahsulotni bosib ketmaslik uchun).
+    """
+    matches = {}
+    for slug, pk in Product.objects.filter(slug__in=list(batch)).values_list('slug', 'id'):
+        matches.setdefault(slug, []).append(pk)
+    to_update, to_create = [], []
+    for slug, (line, product, explicit) in batch.items():
+        found = matches.get(slug, [])
+        if not found:
+            to_create.append(product)
+        elif not explicit:
+            errors.append({'line': line, 'error': f"slug berilmagan, '{slug}' esa boshqa mahsulotda band"})
+        elif len(found) > 1:
+            errors.append({'line': line, 'error': f"slug '{slug}' {len(found)} ta mahsulotda — qaysi biri noaniq"})
+        else:
+            product.pk = found[0]
+            product.updated_at = timezone.now()  # bulk_update auto_now'ni to'ldirmaydi
+            to_update.append(product)
+    try:
+        with transaction.atomic():
+            Product.objects.bulk_create(to_create)
+            Product.objects.bulk_update(to_update, UPDATE_FIELDS)
+    except DatabaseError as e:
+        # Tekshiruvdan o'tgan qatorlar bu yerga yetmasligi kerak; bo'lsa ham faqat shu batch bekor bo'ladi
+        lines = [line for line, _, _ in batch.values()]
+        errors.append({'line': f'{min(lines)}-{max(lines)}', 'error': f"batch saqlanmadi: {e}"})
+        return 0, []
+    # bulk yozuvlar signal yubormaydi — JSON hujjatlarni fon vazifasida yangilaymiz
+    # (MySQL bulk_create'da pk qaytarmaydi, shuning uchun yangi mahsulotlar slug bo'yicha o'qiladi)
+    created_ids = Product.objects.filter(slug__in=[product.slug for product in to_create]).values_list('pk', flat=True)
+    updated_ids = [product.pk for product in to_update]
+    schedule_refresh(list(created_ids) + updated_ids)
+    return len(to_create), updated_ids
+
+
+def import_products(records, batch_size=1000):
+    resolver = CategoryResolver()
+    result = {'created': 0, 'updated': 0, 'errors': []}
+    batch = {}
+    updated_ids = []
+
+    def flush():
+        created, updated = _write_batch(batch, result['errors'])
+        result['created'] += created
+        result['updated'] += len(updated)
+        updated_ids.extend(updated)
+        batch.clear()
+
+    for line, record in enumerate(records, start=1):
+        try:
+            product, explicit = build_product(record, resolver)
+        except (ValueError, TypeError) as e:
+            result['errors'].append({'line': line, 'error': str(e)})
+            continue
+        previous = batch.get(product.slug)
+        if previous is not None and not (explicit and previous[2]):
+            result['errors'].append({'line': line, 'error': f"slug '{product.slug}' {previous[0]}-qatorda ham bor"})
+            continue
+        batch[product.slug] = (line, product, explicit)  # aniq slug takrorlansa — oxirgisi yutadi
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    result['errors'].sort(key=lambda error: int(str(error['line']).split('-')[0]))
+
+    # bulk_create/bulk_update signal yubormaydi; yangilangan mahsulotlarning detail keshi ham eskiradi
+    invalidate_tags(
+        'products', PRODUCT_LISTS_TAG, 'categories', 'subcategories', TREE_TAG,
+        *(f'products:{pk}' for pk in updated_ids),
+    )
+    return result
+
+
+def iter_products(queryset, chunk_size=2000):
+    """
+    Keyset bo'yicha bo'laklab o'qish: MySQL drayveri iterator() natijasini baribir to'liq buferlaydi,
+    pk > last_id bilan esa xotira hajmi chunk_size bilan cheklanadi.
+    """
+    queryset = queryset.order_by('pk').values(
+        'pk', 'name', 'slug', 'description', 'price', 'discount', 'quantity', 'category__slug', 'subcategory__slug'
+    )
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1]['pk']  # export_lines qatorni o'zgartirishi mumkin — oldindan olamiz
+        for row in rows:
+            row['category'] = row.pop('category__slug')
+            row['subcategory'] = row.pop('subcategory__slug')
+            yield row
+
+
+def export_lines(queryset, file_format, chunk_size=2000):
+    if file_format == 'jsonl':
+        for row in iter_products(queryset, chunk_size):
+            row.pop('pk')
+            row['price'] = str(row['price'])
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for row in iter_products(queryset, chunk_size):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import threading
+import time
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.utils.encoders import JSONEncoder
+from .cache import get_tag_versions
+from .db_router import primary_reads
+from .models import Category, Product
+
+TREE_TAG = 'category-tree'
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'etag': None, 'body': None, 'built_at': 0.0}
+
+
+def build_tree():
+    """
+    Category -> SubCategory daraxtini mahsulot sonlari bilan bitta agregat so'rovda quradi.
+    """
+    category_products = Product.objects.filter(category_id=OuterRef('pk')).order_by().values('category_id')
+    rows = Category.objects.annotate(
+        category_product_count=Coalesce(
+            Subquery(category_products.annotate(total=Count('id')).values('total')), Value(0),
+            output_field=IntegerField(),
+        )
+    ).values(
+        'id', 'title', 'slug', 'category_product_count',
+        'subcategories__id', 'subcategories__name', 'subcategories__slug',
+    ).annotate(subcategory_product_count=Count('subcategories__products')).order_by('id', 'subcategories__id')
+
+    tree = []
+    for row in rows:
+        if not tree or tree[-1]['id'] != row['id']:
+            tree.append({
+                'id': row['id'], 'title': row['title'], 'slug': row['slug'],
+                'product_count': row['category_product_count'], 'subcategories': [],
+            })
+        if row['subcategories__id'] is not None:
+            tree[-1]['subcategories'].append({
+                'id': row['subcategories__id'], 'name': row['subcategories__name'],
+                'slug': row['subcategories__slug'], 'product_count': row['subcategory_product_count'],
+            })
+    return tree
+
+
+def _is_current(version):
+    max_age = getattr(settings, 'CATEGORY_TREE_MAX_AGE', 60)
+    return _snapshot['version'] == version and time.monotonic() - _snapshot['built_at'] < max_age
+
+
+def get_snapshot():
+    """
+    Umumiy keshdagi versiya o'zgarmagan bo'lsa, jarayon ichidagi tayyor javob qaytariladi.
+    LocMemCache'da versiya boshqa worker'larga yetib bormaydi, shuning uchun snapshot CATEGORY_TREE_MAX_AGE
+    soniyadan keyin baribir qayta quriladi. ETag tana hash'idan — worker'lar orasida bir xil ma'noga ega.
+    """
+    version = get_tag_versions([TREE_TAG])[TREE_TAG]
+    if _is_current(version):
+        return _snapshot
+    with _lock:
+        if not _is_current(version):
+            # Replika lag'ini ushlab qolmaslik uchun primary'dan quramiz
+            with primary_reads():
+                body = json.dumps(build_tree(), cls=JSONEncoder, ensure_ascii=False).encode()
+            etag = f'"tree-{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+            _snapshot.update(version=version, etag=etag, body=body, built_at=time.monotonic())
+        return _snapshot
+
+
+def tree_response(request):
+    snapshot = get_snapshot()
+    etag = snapshot['etag']
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(snapshot['body'], content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
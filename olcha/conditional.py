@@ -0,0 +1,59 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from rest_framework.response import Response
+from .cache import CachedReadMixin, get_tag_versions
+
+
+class ConditionalGetMixin:
+    """
+    list/retrieve uchun ETag. Validator faqat katalog kesh teglari versiyalaridan quriladi, DB so'rovisiz:
+    CachedReadMixin bilan — kesh yozuvining teglari (list'da sahifadagi obyektlar teglari ham), kesh hit
+    bo'lsa 304 bazaga murojaatsiz va serializatsiyasiz qaytadi; aks holda get_conditional_tags() teglari.
+    Last-Modified yuborilmaydi: like, izoh va rasmlar updated_at ni o'zgartirmaydi, faqat If-Modified-Since
+    yuboradigan mijoz esa noto'g'ri 304 olardi.
+    """
+    conditional_per_user = False
+
+    def get_conditional_tags(self, detail, instance=None):
+        # CachedReadMixin'siz view'lar uchun
+        return []
+
+    def _make_etag(self, request, detail, versions):
+        params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+        user_id = request.user.pk if self.conditional_per_user and request.user.is_authenticated else 0
+        raw = repr((self.__class__.__name__, self.kwargs, params, user_id, detail, sorted(versions.items())))
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def _finalize(self, response, etag):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if self.conditional_per_user:
+                patch_vary_headers(response, ['Authorization', 'Cookie'])
+        return response
+
+    def _respond(self, request, detail, render, instance=None):
+        if isinstance(self, CachedReadMixin):
+            # Kesh hit bo'lsa javob tayyor; miss bo'lsa teglar (sahifa obyektlari bilan) so'rovdan keyin ma'lum
+            response = render()
+            if response.status_code != 200:
+                return response
+            etag = self._make_etag(request, detail, self.cache_versions)
+            return self._finalize(get_conditional_response(request, etag=etag, response=response), etag)
+
+        etag = self._make_etag(request, detail, get_tag_versions(self.get_conditional_tags(detail, instance)))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = render()
+        return self._finalize(response, etag)
+
+    def list(self, request, *args, **kwargs):
+        return self._respond(request, False, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        if isinstance(self, CachedReadMixin):
+            return self._respond(
+                request, True, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+            )
+        # get_object: filter_queryset(get_queryset()) orqali, noto'g'ri/yo'q lookup — 404
+        instance = self.get_object()
+        return self._respond(request, True, lambda: Response(self.get_serializer(instance).data), instance)
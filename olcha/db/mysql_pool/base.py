@@ -0,0 +1,179 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from django.db import OperationalError
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+logger = logging.getLogger('olcha.db')
+
+# Har bir jarayonda (alias, ulanish parametrlari) bo'yicha bitta pool — sozlamalari boshqa ulanishlar aralashmaydi
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Jarayon ichidagi MySQL ulanishlari pool'i. Ko'pi bilan size + max_overflow ta ulanish ochiladi
+    (per-worker limit), ortiqchasi qaytarilganda yopiladi. Bo'sh ulanish recycle soniyadan eski bo'lsa
+    yangilanadi, ping_after soniyadan ko'p kutgan bo'lsa berishdan oldin ping qilinadi.
+    """
+
+    def __init__(self, connect, size=5, max_overflow=5, timeout=10, recycle=1800, ping_after=30, label=''):
+        self.connect = connect
+        self.label = label
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.idle = deque()  # (ulanish, ochilgan vaqt, qaytarilgan vaqt)
+        self.created = {}  # id(ulanish) -> ochilgan vaqt
+        self.stats = {'opened': 0, 'reused': 0, 'closed': 0, 'waited': 0}
+
+    @property
+    def open_count(self):
+        return len(self.created)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                while self.idle:
+                    connection, created, returned = self.idle.pop()
+                    now = time.monotonic()
+                    if now - created >= self.recycle or (now - returned >= self.ping_after and not self._alive(connection)):
+                        self._discard(connection)
+                        continue
+                    self.stats['reused'] += 1
+                    return connection
+                if self.open_count < self.size + self.max_overflow:
+                    break
+                remaining = deadline - time.monotonic()
+                self.stats['waited'] += 1
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    raise OperationalError(
+                        f"Ulanishlar pool'i to'lgan ({self.open_count} ta), {self.timeout}s ichida bo'shamadi"
+                    )
+            # Joyni band qilib qo'yamiz, ulanishning o'zi lock'dan tashqarida ochiladi
+            placeholder = object()
+            self.created[id(placeholder)] = time.monotonic()
+
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                del self.created[id(placeholder)]
+                self.condition.notify()
+            raise
+        with self.condition:
+            del self.created[id(placeholder)]
+            self.created[id(connection)] = time.monotonic()
+            self.stats['opened'] += 1
+        return connection
+
+    def release(self, connection, reusable=True):
+        with self.condition:
+            if id(connection) not in self.created:
+                return
+            if reusable and len(self.idle) < self.size:
+                self.idle.append((connection, self.created[id(connection)], time.monotonic()))
+            else:
+                self._discard(connection)
+            self.condition.notify()
+
+    def close_idle(self):
+        with self.condition:
+            while self.idle:
+                self._discard(self.idle.pop()[0])
+
+    def _discard(self, connection):
+        self.created.pop(id(connection), None)
+        self.stats['closed'] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _alive(connection):
+        try:
+            connection.ping(False)
+            return True
+        except Exception:
+            return False
+
+
+def _freeze(value):
+    # Ulanish parametrlarini (ichma-ich dict'lar: ssl, conv) lug'at kaliti sifatida ishlatish uchun
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def get_pool(alias, connect, options, conn_params=None):
+    conn_params = conn_params or {}
+    key = (alias, _freeze(conn_params))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and pool.pid != os.getpid():
+            # fork'dan keyin ota jarayon ulanishlarini yopmaymiz (COM_QUIT uning sessiyasini uzadi), tashlab yuboramiz
+            pool = None
+        if pool is None:
+            label = f"{alias} ({conn_params.get('user', '')}@{conn_params.get('host', '')}/{conn_params.get('database', '')})"
+            pool = _pools[key] = ConnectionPool(connect, label=label, **options)
+        return pool
+
+
+def pool_stats():
+    return {
+        pool.label: {**pool.stats, 'open': pool.open_count, 'idle': len(pool.idle)}
+        for pool in list(_pools.values()) if pool.pid == os.getpid()
+    }
+
+
+@atexit.register
+def _close_pools():
+    for pool in _pools.values():
+        if pool.pid == os.getpid():
+            pool.close_idle()
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    """
+    MySQL backend'i, lekin ulanish yopilganda (so'rov oxirida CONN_MAX_AGE=0 bilan) u jarayon pool'iga
+    qaytariladi. Sozlamalar DATABASES[alias]['POOL'] da: SIZE, MAX_OVERFLOW, TIMEOUT, RECYCLE, PING_AFTER.
+    """
+
+    _pool = None  # joriy ulanish olingan pool — qaytarish aynan unga bo'ladi
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL', {})
+        return get_pool(
+            self.alias,
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            {key.lower(): value for key, value in options.items()},
+            conn_params,
+        )
+
+    def get_new_connection(self, conn_params):
+        self._pool = self.get_pool(conn_params)
+        return self._pool.acquire()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Tranzaksiya ochiq qolgan yoki xato bo'lgan ulanish pool'ga qaytmaydi
+        reusable = not self.in_atomic_block and not self.errors_occurred and self.autocommit
+        pool = self._pool or self.get_pool(self.get_connection_params())
+        pool.release(self.connection, reusable)
@@ -0,0 +1,172 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger('olcha.db_router')
+
+# Joriy so'rov holati: replikadan o'qish mumkinmi, so'rovda yozuv bo'ldimi, replika ishlatildimi
+_state = ContextVar('olcha_replica_state', default=None)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RequestState:
+    __slots__ = ('replica_allowed', 'wrote', 'used_replica')
+
+    def __init__(self, replica_allowed):
+        self.replica_allowed = replica_allowed
+        self.wrote = False
+        self.used_replica = False
+
+
+class ReplicaHealth:
+    """
+    Replikalar holati jarayon ichida REPLICA_HEALTH_INTERVAL soniya saqlanadi. Ulanib bo'lmasa yoki
+    lag REPLICA_MAX_LAG dan oshsa replika REPLICA_RETRY_SECONDS ga chetlatiladi va o'qish primary'ga tushadi.
+    Ulanish lock'dan tashqarida tekshiriladi, kutish REPLICA_CONNECT_TIMEOUT bilan cheklangan.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}  # alias -> (keyingi tekshiruv vaqti, sog'lommi)
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        next_check, healthy = self.checked.get(alias, (0, True))
+        if now < next_check:
+            return healthy
+        with self.lock:
+            next_check, healthy = self.checked.get(alias, (0, True))
+            if now < next_check:
+                return healthy
+            # Tekshiruv davomida boshqa thread'lar oxirgi ma'lum holatdan foydalanadi — lock ulanishni kutmaydi
+            self.checked[alias] = (now + settings.REPLICA_HEALTH_INTERVAL, healthy)
+        healthy = self.probe(alias)
+        delay = settings.REPLICA_HEALTH_INTERVAL if healthy else settings.REPLICA_RETRY_SECONDS
+        with self.lock:
+            self.checked[alias] = (time.monotonic() + delay, healthy)
+        if not healthy:
+            logger.warning("Replika %s ishlamayapti, o'qishlar primary'ga yo'naltirildi", alias)
+        return healthy
+
+    def probe(self, alias):
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            max_lag = settings.REPLICA_MAX_LAG
+            if max_lag is not None and connection.vendor == 'mysql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SHOW REPLICA STATUS')
+                    row = cursor.fetchone()
+                    columns = [column[0] for column in cursor.description or ()]
+                if row:
+                    lag = dict(zip(columns, row)).get('Seconds_Behind_Source')
+                    if lag is None or lag > max_lag:
+                        return False
+            return True
+        except DatabaseError:
+            return False
+
+
+health = ReplicaHealth()
+
+
+def _pin_cache():
+    return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+
+def _pin_key(identity):
+    return f'db-pin:{identity}'
+
+
+def pin_to_primary(identity):
+    # Read-your-writes: yozgan mijozning keyingi o'qishlari REPLICA_PIN_SECONDS davomida primary'dan
+    _pin_cache().set(_pin_key(identity), 1, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(identity):
+    return _pin_cache().get(_pin_key(identity)) is not None
+
+
+def used_replica():
+    state = _state.get()
+    return state is not None and state.used_replica
+
+
+@contextmanager
+def primary_reads():
+    # Blok ichidagi o'qishlar primary'dan (masalan, uzoq saqlanadigan snapshot qurishda)
+    token = _state.set(RequestState(replica_allowed=False))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def choose_replica():
+    replicas = [alias for alias in settings.DATABASE_REPLICAS if health.is_healthy(alias)]
+    return random.choice(replicas) if replicas else None
+
+
+class ReplicaRouter:
+    """
+    REPLICA_MODELS dagi katalog modellarini so'rov xavfsiz metod (GET/HEAD) bilan kelganda va mijoz
+    yaqinda yozmagan bo'lsa replikadan o'qiydi. Boshqa hamma narsa — yozuvlar, buyurtmalar, sessiyalar,
+    so'rovdan tashqari kod (management buyruqlari, fon vazifalari) — primary'da.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower not in settings.REPLICA_MODELS:
+            return None
+        state = _state.get()
+        if state is None or not state.replica_allowed or state.wrote:
+            return 'default'
+        alias = choose_replica()
+        if alias is None:
+            return 'default'
+        state.used_replica = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar primary'ning nusxasi — obyektlar orasidagi bog'lanishlar ruxsat etiladi
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    So'rov holatini o'rnatadi va so'rov davomida yozuv bo'lgan bo'lsa mijozni primary'ga "qadaydi".
+    Mijoz identifikatori throttling'dagi kabi: Bearer token'dagi user id yoki IP.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # throttling simplejwt token modellarini import qiladi — ilovalar yuklangandan keyin
+        from .throttling import client_identity
+
+        identity = client_identity(request)
+        state = RequestState(request.method in SAFE_METHODS and not is_pinned(identity))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            pin_to_primary(identity)
+        return response
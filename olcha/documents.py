@@ -0,0 +1,73 @@
+import json
+from django.db import connections
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+from .models import Product, ProductDocument, ProductImage
+from .tasks import enqueue, task
+
+
+def render_document(product):
+    from .serializers import ProductDocumentSerializer
+
+    return json.dumps(ProductDocumentSerializer(product).data, cls=JSONEncoder, ensure_ascii=False)
+
+
+def refresh_documents(product_ids, batch_size=500):
+    """
+    Berilgan mahsulotlar uchun JSON hujjatlarni qayta yaratadi (batch'ma-batch, bulk upsert bilan).
+    """
+    product_ids = sorted(set(product_ids))
+    for start in range(0, len(product_ids), batch_size):
+        chunk = product_ids[start:start + batch_size]
+        products = Product.objects.filter(pk__in=chunk).select_related('subcategory').prefetch_related(
+            Prefetch('images', queryset=ProductImage.objects.order_by('id'))
+        )
+        documents = [ProductDocument(product_id=product.pk, body=render_document(product)) for product in products]
+        options = {'update_conflicts': True, 'update_fields': ['body', 'updated_at']}
+        if connections[ProductDocument.objects.db].features.supports_update_conflicts_with_target:
+            options['unique_fields'] = ['product']  # MySQL'da ON DUPLICATE KEY uchun kerak emas
+        ProductDocument.objects.bulk_create(documents, **options)
+
+
+@task('products.refresh_documents')
+def refresh_documents_task(product_ids):
+    refresh_documents(product_ids)
+
+
+@task('subcategories.refresh_documents')
+def refresh_subcategory_documents_task(subcategory_id):
+    # Mahsulotlar ro'yxati worker'da olinadi — subkategoriya saqlash so'rovi minglab hujjatni kutmaydi
+    product_ids = Product.objects.filter(subcategory_id=subcategory_id).values_list('pk', flat=True)
+    refresh_documents(list(product_ids))
+
+
+def schedule_refresh(product_ids):
+    # Tranzaksiya tugagach (agregatlar yozilgandan keyin) hujjatni yangilaymiz
+    product_ids = [pk for pk in product_ids if pk is not None]
+    if len(product_ids) == 1:
+        # Bitta mahsulot — eng ko'p uchraydigan holat (like, izoh, tahrir); navbatda bitta qator bo'ladi
+        enqueue('products.refresh_documents', product_ids, coalesce_key=f'product-documents:{product_ids[0]}')
+    elif product_ids:
+        enqueue('products.refresh_documents', product_ids)
+
+
+def load_documents(product_ids):
+    """
+    Tayyor hujjatlarni tartibni saqlagan holda qaytaradi; yo'qlari shu yerning o'zida yaratiladi.
+    """
+    bodies = dict(ProductDocument.objects.filter(product_id__in=product_ids).values_list('product_id', 'body'))
+    missing = [pk for pk in product_ids if pk not in bodies]
+    if missing:
+        refresh_documents(missing)
+        bodies.update(ProductDocument.objects.filter(product_id__in=missing).values_list('product_id', 'body'))
+    return [bodies[pk] for pk in product_ids if pk in bodies]
+
+
+def document_list_response(envelope, bodies):
+    # Hujjatlar qayta parse qilinmaydi — tayyor JSON satrlari bevosita birlashtiriladi
+    envelope = {key: value for key, value in envelope.items() if key != 'results'}
+    head = json.dumps(envelope, cls=JSONEncoder, ensure_ascii=False)[:-1]
+    separator = ', ' if envelope else ''
+    body = f'{head}{separator}"results": [{",".join(bodies)}]}}'
+    return HttpResponse(body.encode(), content_type='application/json')
@@ -0,0 +1,94 @@
+from decimal import Decimal, InvalidOperation
+from django.db.models import Count, Q
+from .models import Category
+
+# Narx oraliqlari (so'm): [from, to)
+PRICE_RANGES = [
+    (0, 500_000), (500_000, 1_000_000), (1_000_000, 3_000_000),
+    (3_000_000, 5_000_000), (5_000_000, 10_000_000), (10_000_000, None),
+]
+
+
+def _decimal(value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def _true(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def price_range_q(low, high):
+    condition = Q(price__gte=low)
+    if high is not None:
+        condition &= Q(price__lt=high)
+    return condition
+
+
+class ProductFacets:
+    """
+    Fasetli filtrlash: har bir faset soni boshqa barcha faset filtrlari qo'llangan holda hisoblanadi
+    (o'z filtri hisobga olinmaydi), shuning uchun foydalanuvchi tanlovini kengaytira oladi.
+    Barcha sonlar o'zgarmas sonli so'rovda: shartli agregatlar, kategoriya bo'yicha GROUP BY va nomlar.
+    """
+
+    def __init__(self, params):
+        self.conditions = {}
+        categories = [int(pk) for pk in params.get('category', '').split(',') if pk.strip().isdigit()]
+        if categories:
+            self.conditions['category'] = Q(category_id__in=categories)
+
+        price_min, price_max = _decimal(params.get('price_min')), _decimal(params.get('price_max'))
+        price = Q()
+        if price_min is not None:
+            price &= Q(price__gte=price_min)
+        if price_max is not None:
+            price &= Q(price__lte=price_max)
+        if price:
+            self.conditions['price'] = price
+
+        if _true(params.get('in_stock')):
+            self.conditions['in_stock'] = Q(quantity__gt=0)
+        if _true(params.get('has_discount')):
+            self.conditions['has_discount'] = Q(discount__gt=0)
+
+    def _except(self, facet):
+        condition = Q()
+        for name, value in self.conditions.items():
+            if name != facet:
+                condition &= value
+        return condition
+
+    def filter(self, queryset):
+        return queryset.filter(self._except(None))
+
+    def counts(self, queryset):
+        queryset = queryset.order_by()
+        aggregates = {
+            f'price_{index}': Count('id', filter=price_range_q(low, high) & self._except('price'))
+            for index, (low, high) in enumerate(PRICE_RANGES)
+        }
+        aggregates['in_stock'] = Count('id', filter=Q(quantity__gt=0) & self._except('in_stock'))
+        aggregates['has_discount'] = Count('id', filter=Q(discount__gt=0) & self._except('has_discount'))
+        totals = queryset.aggregate(**aggregates)
+
+        category_rows = (
+            queryset.filter(self._except('category')).exclude(category_id=None)
+            .values('category_id').annotate(count=Count('id')).order_by('-count')
+        )
+        category_counts = {row['category_id']: row['count'] for row in category_rows}
+        titles = dict(Category.objects.filter(pk__in=category_counts).values_list('pk', 'title'))
+
+        return {
+            'category': [
+                {'id': pk, 'title': titles.get(pk), 'count': count} for pk, count in category_counts.items()
+            ],
+            'price': [
+                {'from': low, 'to': high, 'count': totals[f'price_{index}']}
+                for index, (low, high) in enumerate(PRICE_RANGES)
+            ],
+            'in_stock': totals['in_stock'],
+            'has_discount': totals['has_discount'],
+        }
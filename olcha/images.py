@@ -0,0 +1,138 @@
+import io
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+from .tasks import enqueue as enqueue_task, task
+
+# Nom: maksimal tomon (px). Kichik rasmlar kattalashtirilmaydi.
+VARIANTS = {'thumb': 200, 'small': 400, 'medium': 800, 'large': 1600}
+FORMATS = {'webp': ('WEBP', {'quality': 80, 'method': 4}), 'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True})}
+# Buzilgan, qo'llab-quvvatlanmaydigan yoki "decompression bomb" rasmlar — variantsiz qoldiriladi
+IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError)
+
+
+def render_variants(source):
+    """
+    Rasmdan o'lchamli variantlarni yaratadi: {'thumb': {'webp': bytes, 'jpeg': bytes, 'width': .., 'height': ..}}.
+    EXIF/metadata saqlanmaydi — faqat piksellar qayta kodlanadi.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'L'):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image.convert('RGBA'), mask=image.convert('RGBA').split()[-1])
+            image = background
+        elif image.mode == 'L':
+            image = image.convert('RGB')
+
+        result = {}
+        for name, size in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            encoded = {'width': variant.width, 'height': variant.height}
+            for extension, (pil_format, options) in FORMATS.items():
+                buffer = io.BytesIO()
+                variant.save(buffer, pil_format, **options)
+                encoded[extension] = buffer.getvalue()
+            result[name] = encoded
+        return result
+
+
+def variant_paths(source_name):
+    stem = os.path.splitext(source_name)[0]
+    return {
+        (name, extension): f'variants/{stem}/{name}.{extension}'
+        for name in VARIANTS for extension in FORMATS
+    }
+
+
+def delete_variants(source_name):
+    for path in variant_paths(source_name).values():
+        if default_storage.exists(path):
+            default_storage.delete(path)
+
+
+def store_variants(field_file):
+    paths = variant_paths(field_file.name)
+    with field_file.open('rb') as source:
+        rendered = render_variants(source)
+
+    variants = {'source': field_file.name}
+    for name, encoded in rendered.items():
+        entry = {'width': encoded['width'], 'height': encoded['height']}
+        for extension in FORMATS:
+            path = paths[name, extension]
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            entry[extension] = default_storage.url(default_storage.save(path, ContentFile(encoded[extension])))
+        variants[name] = entry
+    return variants
+
+
+def process_image(model_label, pk, field_name):
+    """
+    Fon vazifasida ishlaydi: variantlarni yaratib, modelning `variants` maydoniga yozadi.
+    Rasm almashtirilgan bo'lsa eski fayl variantlari o'chiriladi.
+    """
+    from django.apps import apps
+    from .documents import refresh_documents
+
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    field_file = getattr(instance, field_name)
+    previous_source = (instance.variants or {}).get('source')
+    if not field_file:
+        variants = {}
+    else:
+        try:
+            variants = store_variants(field_file)
+        except IMAGE_ERRORS:
+            variants = {'source': field_file.name}
+    # .update() — signal va qayta navbatga qo'yish bo'lmasligi uchun
+    model.objects.filter(pk=pk).update(variants=variants)
+
+    product_id = getattr(instance, 'product_id', None)
+    if product_id:
+        refresh_documents([product_id])
+    if previous_source and previous_source != variants.get('source'):
+        delete_variants(previous_source)
+    return model_label, pk, product_id
+
+
+@task('images.process')
+def process_image_task(model_label, pk, field_name):
+    invalidate_result(process_image(model_label, pk, field_name))
+
+
+def invalidate_result(result):
+    # Variantlar yozilgach mahsulot/izoh/kategoriya keshini eskirtiramiz
+    from .cache import invalidate_tags
+
+    if result is None:
+        return
+    model_label, pk, product_id = result
+    if model_label == 'olcha.Comment':
+        # Izoh rasmi izohlar ro'yxatida ham ko'rinadi (olcha/signals.py dagi izoh teglari bilan bir xil)
+        invalidate_tags(f'products:{product_id}', 'comments', f'comments:product:{product_id}')
+    elif product_id:
+        invalidate_tags(f'products:{product_id}')
+    else:
+        invalidate_tags('categories', f'categories:{pk}')
+
+
+def enqueue(instance, field_name):
+    # Rasm o'zgarmagan bo'lsa (variantlar shu fayl uchun tayyor) qayta ishlamaymiz
+    field_file = getattr(instance, field_name)
+    if (instance.variants or {}).get('source') == (field_file.name or None):
+        return
+    args = (instance._meta.label, instance.pk, field_name)
+    if getattr(settings, 'IMAGE_PROCESSING_SYNC', False):
+        transaction.on_commit(lambda: invalidate_result(process_image(*args)))
+    else:
+        # Har web worker o'z jarayonlar pulini ochmaydi — rasm `run_tasks` worker'ida qayta ishlanadi
+        enqueue_task('images.process', *args, coalesce_key=f'image:{args[0]}:{args[1]}:{field_name}')
@@ -0,0 +1,38 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from .cache import invalidate_tags
+from .documents import schedule_refresh
+from .models import Product
+
+Like = Product.likes.through
+
+
+def _after_change(product_id, delta):
+    # Through jadvaliga to'g'ridan-to'g'ri yozilganda m2m_changed signali yuborilmaydi
+    Product.objects.filter(pk=product_id).update(like_count=F('like_count') + delta)
+    invalidate_tags(f'products:{product_id}')
+    schedule_refresh([product_id])
+
+
+def toggle_like(product_id, user_id):
+    """
+    Like/unlike: (product_id, user_id) unique indeksi bo'yicha bitta DELETE, kerak bo'lsa bitta INSERT.
+    Barcha like qilganlar xotiraga yuklanmaydi. True — like qilindi, False — olib tashlandi.
+    """
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(product_id=product_id, user_id=user_id).delete()
+        if deleted:
+            _after_change(product_id, -1)
+            return False
+        try:
+            with transaction.atomic():
+                Like.objects.create(product_id=product_id, user_id=user_id)
+        except IntegrityError:
+            # Parallel so'rov allaqachon qo'shgan
+            return True
+        _after_change(product_id, 1)
+        return True
+
+
+def liked_product_ids(user_id, product_ids):
+    return set(Like.objects.filter(user_id=user_id, product_id__in=product_ids).values_list('product_id', flat=True))
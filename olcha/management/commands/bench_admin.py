@@ -0,0 +1,65 @@
+import sys
+import time
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from olcha.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Har bir olcha admin changelist'i (oddiy, qidiruv va filtr bilan) uchun SQL so'rovlar soni va vaqtni o'lchaydi. "
+        "--max-queries berilsa, chegaradan oshgan sahifa bo'lsa xato kodi bilan tugaydi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-queries', type=int, help="Bitta changelist uchun ruxsat etilgan eng ko'p so'rovlar")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def scenarios(self):
+        product = Product.objects.order_by('-pk').values_list('name', flat=True).first() or 'telefon'
+        term = product.split()[0]
+        extra = {
+            'product': [f'?q={term}', '?discount_range=1-20', '?o=-3'],
+            'comment': [f'?q={term}', '?rating=5'],
+            'order': [f'?q={term}', '?q=%2B998901234567'],
+            'productimage': [f'?q={term}'],
+            'task': ['?status=pending'],
+            'category': ['?o=-4'],
+        }
+        for model in admin.site._registry:
+            if model._meta.app_label != 'olcha':
+                continue
+            url = reverse(f'admin:olcha_{model._meta.model_name}_changelist')
+            yield model._meta.model_name, url
+            for query in extra.get(model._meta.model_name, []):
+                yield model._meta.model_name, url + query
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            self.stderr.write("Superuser yo'q — `manage.py createsuperuser` bilan yarating")
+            return
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+
+        failed = []
+        for name, url in self.scenarios():
+            elapsed, queries, status = 0.0, 0, None
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    status = client.get(url).status_code
+                    elapsed += time.perf_counter() - start
+                queries = len(captured)
+            self.stdout.write(f"{url:<60} {status} {elapsed / options['repeat'] * 1000:8.2f}ms {queries:4d} SQL")
+            if status != 200 or (options['max_queries'] and queries > options['max_queries']):
+                failed.append(url)
+
+        if failed:
+            self.stderr.write(f"Chegaradan oshgan yoki xato sahifalar: {', '.join(failed)}")
+            sys.exit(1)
@@ -0,0 +1,52 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from olcha.authentication import StatelessJWTAuthentication, issue_tokens
+
+
+class Command(BaseCommand):
+    help = "Autentifikatsiya zanjirining har so'rovdagi narxi: vaqt va SQL so'rovlar soni"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).order_by('pk').first()
+        if user is None:
+            self.stderr.write("Faol foydalanuvchi yo'q — avval `manage.py seed` ishga tushiring")
+            return
+        access = str(issue_tokens(user).access_token)
+        factory = APIRequestFactory()
+        bearer = {'HTTP_AUTHORIZATION': f'Bearer {access}'}
+        invalid = {'HTTP_AUTHORIZATION': 'Bearer invalid.token.value'}
+
+        scenarios = [
+            ('bearer, JWTAuthentication', JWTAuthentication, bearer),
+            ('bearer, StatelessJWTAuthentication', StatelessJWTAuthentication, bearer),
+            ('noto\'g\'ri bearer, stateless', StatelessJWTAuthentication, invalid),
+            ('anonim, stateless', StatelessJWTAuthentication, {}),
+        ]
+        for label, jwt_class, headers in scenarios:
+            authenticators = [jwt_class(), TokenAuthentication(), SessionAuthentication()]
+            elapsed, queries = 0.0, 0
+            for _ in range(options['requests']):
+                request = Request(factory.get('/api/v1/products/', **headers), authenticators=authenticators)
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    try:
+                        request.user
+                    except AuthenticationFailed:
+                        pass
+                    elapsed += time.perf_counter() - start
+                queries += len(captured)
+            self.stdout.write(
+                f"{label:<40} {elapsed / options['requests'] * 1_000_000:8.1f}µs/so'rov, "
+                f"{queries / options['requests']:.3f} SQL/so'rov"
+            )
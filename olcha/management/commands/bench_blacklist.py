@@ -0,0 +1,77 @@
+import time
+import uuid
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from olcha.blacklist import CachedRefreshToken, blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Qora ro'yxat o'sgani sari refresh token tekshiruvi narxini o'lchaydi: "
+        "standart RefreshToken (har safar SQL) va bloom filtrli CachedRefreshToken"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,100000,1000000', help="Qora ro'yxat hajmlari, vergul bilan")
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--keep', action='store_true',
+                            help="Yaratilgan sintetik tokenlarni o'chirmasdan qoldirish (standart: oxirida o'chiriladi)")
+
+    def grow_blacklist(self, target, user, batch_size):
+        expires = timezone.now() + timedelta(days=1)
+        while BlacklistedToken.objects.count() < target:
+            missing = min(batch_size, target - BlacklistedToken.objects.count())
+            jtis = [f'bench-{uuid.uuid4().hex}' for _ in range(missing)]
+            OutstandingToken.objects.bulk_create([
+                OutstandingToken(user=user, jti=jti, token='', created_at=timezone.now(), expires_at=expires)
+                for jti in jtis
+            ])
+            ids = OutstandingToken.objects.filter(jti__in=jtis).values_list('pk', flat=True)
+            BlacklistedToken.objects.bulk_create([BlacklistedToken(token_id=pk) for pk in ids])
+
+    def measure(self, token_class, raw_tokens):
+        elapsed, queries = 0.0, 0
+        for raw in raw_tokens:
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                token_class(raw)
+                elapsed += time.perf_counter() - start
+            queries += len(captured)
+        return elapsed / len(raw_tokens) * 1_000_000, queries / len(raw_tokens)
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by('pk').first()
+        if user is None:
+            self.stderr.write("Foydalanuvchi yo'q — avval `manage.py seed` ishga tushiring")
+            return
+        if blacklist_index._maybe_stale():
+            self.stderr.write("Kesh umumiy emas (LocMemCache) — bloom 'yo'q' javoblari ham bazada tasdiqlanadi, REDIS_URL bilan o'lchang")
+        tokens = [CachedRefreshToken.for_user(user) for _ in range(options['requests'])]
+        raw_tokens = [str(token) for token in tokens]
+
+        try:
+            for size in sorted(int(value) for value in options['sizes'].split(',')):
+                self.grow_blacklist(size, user, options['batch_size'])
+                blacklist_index.reset()
+                start = time.perf_counter()
+                self.measure(CachedRefreshToken, raw_tokens[:1])
+                warmup = (time.perf_counter() - start) * 1000
+                plain = self.measure(RefreshToken, raw_tokens)
+                cached = self.measure(CachedRefreshToken, raw_tokens)
+                self.stdout.write(
+                    f"{size:>9} ta: standart {plain[0]:8.1f}µs ({plain[1]:.2f} SQL) | "
+                    f"bloom {cached[0]:8.1f}µs ({cached[1]:.3f} SQL) | bloom qurish {warmup:.0f}ms"
+                )
+        finally:
+            # Xato yoki Ctrl+C bo'lsa ham sintetik tokenlar bazada qolib ketmaydi
+            if not options['keep']:
+                OutstandingToken.objects.filter(jti__startswith='bench-').delete()
+                OutstandingToken.objects.filter(jti__in=[token['jti'] for token in tokens]).delete()
+                blacklist_index.reset()
@@ -0,0 +1,52 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.test import Client
+from olcha import cache
+from olcha.models import Category, SubCategory, Product
+
+
+class Command(BaseCommand):
+    help = "Katalog keshining hit-rate va kechikishini o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        client = Client(HTTP_HOST='localhost')
+
+        category_ids = list(Category.objects.values_list('pk', flat=True)[:50])
+        subcategory_ids = list(SubCategory.objects.values_list('pk', flat=True)[:50])
+        product_ids = list(Product.objects.values_list('pk', flat=True)[:200])
+        if not product_ids:
+            self.stderr.write("Mahsulotlar yo'q, avval katalogni to'ldiring")
+            return
+
+        urls = ['/api/v1/categories/', '/api/v1/subcategories/', '/api/v1/products/']
+        urls += [f'/api/v1/products/?page={page}' for page in range(1, 6)]
+        urls += [f'/api/v1/products/?subcategory={pk}' for pk in subcategory_ids]
+        urls += [f'/api/v1/categories/{pk}/' for pk in category_ids]
+        urls += [f'/api/v1/products/{pk}/' for pk in product_ids]
+
+        cache.get_cache().clear()
+        cache.stats.update(hits=0, misses=0)
+        hit_times, miss_times = [], []
+        for _ in range(options['requests']):
+            url = rng.choice(urls)
+            misses = cache.stats['misses']
+            start = time.perf_counter()
+            client.get(url)
+            elapsed = (time.perf_counter() - start) * 1000
+            (miss_times if cache.stats['misses'] > misses else hit_times).append(elapsed)
+
+        total = cache.stats['hits'] + cache.stats['misses']
+        self.stdout.write(f"So'rovlar: {total}, hit-rate: {cache.stats['hits'] / total:.1%}")
+        for label, times in (('hit', hit_times), ('miss', miss_times)):
+            if times:
+                self.stdout.write(
+                    f"{label}: n={len(times)} p50={statistics.median(times):.2f}ms "
+                    f"max={max(times):.2f}ms"
+                )
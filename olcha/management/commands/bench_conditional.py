@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from django.test import Client
+from olcha.models import Product, Category
+
+
+class Command(BaseCommand):
+    help = "O'zgarmagan resurslar uchun shartli GET (ETag/304) tejagan bayt va vaqtni o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST='localhost')
+        paths = ['/api/v1/products/?page_size=50', '/api/v1/categories/', '/api/v1/comments/']
+        product = Product.objects.order_by('-pk').first()
+        category = Category.objects.order_by('-pk').first()
+        if product:
+            paths.append(f'/api/v1/products/{product.pk}/')
+        if category:
+            paths.append(f'/api/v1/categories/{category.pk}/')
+
+        for path in paths:
+            first = client.get(path)
+            etag = first.get('ETag')
+            if not etag:
+                self.stdout.write(f"{path}: ETag yo'q ({first.status_code})")
+                continue
+            results = {}
+            for label, headers in (('full', {}), ('conditional', {'HTTP_IF_NONE_MATCH': etag})):
+                elapsed, size = 0.0, 0
+                for _ in range(options['requests']):
+                    start = time.perf_counter()
+                    response = client.get(path, **headers)
+                    elapsed += time.perf_counter() - start
+                    size += len(response.content)
+                results[label] = (elapsed / options['requests'] * 1000, size / options['requests'], response.status_code)
+            full, conditional = results['full'], results['conditional']
+            self.stdout.write(
+                f"{path}\n  200: {full[0]:.2f}ms, {full[1]:.0f} bayt | "
+                f"{conditional[2]}: {conditional[0]:.2f}ms, {conditional[1]:.0f} bayt | "
+                f"tejaldi: {full[1] - conditional[1]:.0f} bayt/so'rov"
+            )
@@ -0,0 +1,46 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+from olcha.db.mysql_pool.base import pool_stats
+
+
+class Command(BaseCommand):
+    help = "Ulanish o'rnatish narxi: har so'rovda yangi ulanish va joriy sozlama (pool / CONN_MAX_AGE)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'mysql':
+            self.stderr.write("Benchmark faqat MySQL uchun (DB_ENGINE=mysql)")
+            return
+        count = options['requests']
+        params = connection.get_connection_params()
+        raw = MySQLDatabaseWrapper(connection.settings_dict, alias='bench')
+
+        # So'rov sikli: ulanish -> SELECT 1 -> so'rov oxiri (close_old_connections kabi)
+        start = time.perf_counter()
+        for _ in range(count):
+            conn = raw.get_new_connection(params)
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.close()
+        fresh = time.perf_counter() - start
+
+        connection.close()
+        start = time.perf_counter()
+        for _ in range(count):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            # CONN_MAX_AGE=0 bo'lsa ulanish yopiladi (pool backend'ida pool'ga qaytadi)
+            connection.close_if_unusable_or_obsolete()
+        configured = time.perf_counter() - start
+
+        self.stdout.write(f"{'yangi ulanish':<30} {fresh / count * 1000:8.3f}ms/so'rov")
+        self.stdout.write(
+            f"{connection.settings_dict['ENGINE']:<30} {configured / count * 1000:8.3f}ms/so'rov "
+            f"(CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']})"
+        )
+        for label, stats in pool_stats().items():
+            self.stdout.write(f"pool {label}: {stats}")
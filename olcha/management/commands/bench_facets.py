@@ -0,0 +1,51 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from olcha.facets import PRICE_RANGES, ProductFacets, price_range_q
+from olcha.models import Product
+
+
+def naive_counts(params):
+    # Taqqoslash uchun: har bir faset qiymati alohida COUNT(*) so'rovi
+    facets = ProductFacets(params)
+    result = {}
+    for pk in Product.objects.exclude(category_id=None).values_list('category_id', flat=True).distinct():
+        result[f'category_{pk}'] = Product.objects.filter(facets._except('category'), category_id=pk).count()
+    for index, (low, high) in enumerate(PRICE_RANGES):
+        result[f'price_{index}'] = Product.objects.filter(facets._except('price'), price_range_q(low, high)).count()
+    result['in_stock'] = Product.objects.filter(facets._except('in_stock'), quantity__gt=0).count()
+    result['has_discount'] = Product.objects.filter(facets._except('has_discount'), discount__gt=0).count()
+    return result
+
+
+class Command(BaseCommand):
+    help = "Fasetli sonlarni (3 so'rov) har bir qiymat uchun alohida COUNT bilan solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        scenarios = [
+            {},
+            {'in_stock': '1'},
+            {'has_discount': '1', 'price_min': '1000000'},
+            {'category': ','.join(map(str, Product.objects.values_list('category_id', flat=True).distinct()[:2]))},
+        ]
+        self.stdout.write(f"Mahsulotlar: {Product.objects.count()}")
+        for params in scenarios:
+            for label, func in (
+                ('faceted', lambda: ProductFacets(params).counts(Product.objects.all())),
+                ('naive', lambda: naive_counts(params)),
+            ):
+                times = []
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        func()
+                        times.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"{params or 'filtrsiz'} {label}: p50={statistics.median(times):.2f}ms, "
+                    f"{len(queries) // options['repeat']} so'rov"
+                )
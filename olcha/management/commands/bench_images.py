@@ -0,0 +1,43 @@
+import io
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from PIL import Image
+from olcha.images import render_variants
+
+
+def make_image(seed, width=2400, height=1800):
+    # Shovqinli rasm — real fotosuratga yaqin siqilish murakkabligi
+    rng = random.Random(seed)
+    image = Image.effect_noise((width, height), 64).convert('RGB')
+    image.paste((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)), (0, 0, width // 2, height // 2))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=92)
+    return buffer.getvalue()
+
+
+def render(data):
+    return sum(len(encoded['webp']) + len(encoded['jpeg']) for encoded in render_variants(io.BytesIO(data)).values())
+
+
+class Command(BaseCommand):
+    help = "Rasm variantlari pipeline'ining o'tkazuvchanligini (rasm/s/yadro) o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=24)
+
+    def handle(self, *args, **options):
+        images = [make_image(seed) for seed in range(options['images'])]
+        cores = os.cpu_count() or 1
+        for workers in sorted({1, max(cores // 2, 1), cores}):
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                output = sum(pool.map(render, images))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"workers={workers}: {len(images) / elapsed:.2f} rasm/s, "
+                f"{len(images) / elapsed / workers:.2f} rasm/s/yadro, "
+                f"{sum(map(len, images)) / len(images) / 1024:.0f}KB -> {output / len(images) / 1024:.0f}KB (barcha variantlar)"
+            )
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from django.test import Client
+from olcha import cache
+
+
+class Command(BaseCommand):
+    help = "Serializer orqali list va oldindan render qilingan hujjatlar (compact) tezligini solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST='localhost')
+        page_size = options['page_size']
+        paths = {
+            'serializer': f'/api/v1/products/?page_size={page_size}',
+            'compact': f'/api/v1/products/compact/?page_size={page_size}',
+        }
+        client.get(paths['compact'])  # yetishmayotgan hujjatlarni oldindan yaratib olish
+
+        for label, path in paths.items():
+            elapsed = 0.0
+            size = 0
+            for _ in range(options['requests']):
+                cache.get_cache().clear()  # list keshi natijani buzmasligi uchun
+                start = time.perf_counter()
+                response = client.get(path)
+                elapsed += time.perf_counter() - start
+                size = len(response.content)
+            self.stdout.write(
+                f"{label}: {options['requests'] / elapsed:.1f} req/s, "
+                f"{elapsed / options['requests'] * 1000:.2f} ms/req, {size} bayt"
+            )
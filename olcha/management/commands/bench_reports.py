@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, F, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from olcha.models import Order, OrderRollup
+from olcha.reports import category_totals, day_bounds, revenue_series, top_products
+
+
+class Command(BaseCommand):
+    help = "Hisobotlarni Order jadvalidan to'g'ridan-to'g'ri yig'ish va OrderRollup'dan o'qishni solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def raw_reports(self, start, end):
+        # Ops jamoasi hozirgacha ishlatgan ad-hoc so'rovlar: butun oraliq bo'yicha Order skani
+        orders = Order.objects.filter(created_at__gte=start, created_at__lt=end).order_by()
+        by_day = {}
+        for created_at, quantity, total_price in orders.values_list('created_at', 'quantity', 'total_price').iterator():
+            row = by_day.setdefault(timezone.localdate(created_at), [0, 0, 0])
+            row[0] += 1
+            row[1] += quantity
+            row[2] += total_price
+        products = list(
+            orders.values('product_id').annotate(units=Sum('quantity'), revenue=Sum('total_price')).order_by('-revenue')[:10]
+        )
+        categories = list(
+            orders.values(category=F('product__subcategory__category_id'))
+            .annotate(count=Count('id'), revenue=Sum('total_price')).order_by('-revenue')
+        )
+        return by_day, products, categories
+
+    def rollup_reports(self, start, end):
+        return (
+            revenue_series(OrderRollup.Period.DAY, start, end),
+            top_products(start, end, 10),
+            category_totals(start, end),
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        start = day_bounds(today - timedelta(days=options['days'] - 1))[0]
+        end = day_bounds(today)[1]
+        self.stdout.write(f"{Order.objects.count()} buyurtma, {OrderRollup.objects.count()} rollup qatori")
+
+        results = {}
+        for label, build in (('Order skani', self.raw_reports), ('rollup', self.rollup_reports)):
+            elapsed, queries = 0.0, 0
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as captured:
+                    start_time = time.perf_counter()
+                    data = build(start, end)
+                    elapsed += time.perf_counter() - start_time
+                queries += len(captured)
+            results[label] = data
+            self.stdout.write(
+                f"{label:<12} {elapsed / options['repeat'] * 1000:8.2f}ms, {queries / options['repeat']:.0f} SQL"
+            )
+
+        raw_revenue = sum(row[2] for row in results['Order skani'][0].values())
+        rollup_revenue = sum(row['revenue'] for row in results['rollup'][0])
+        self.stdout.write(f"Tushum tekshiruvi: skan {raw_revenue}, rollup {rollup_revenue}")
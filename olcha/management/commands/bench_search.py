@@ -0,0 +1,64 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from olcha.models import Product
+from olcha.search import build_search_text, search_products
+
+WORDS = [
+    'telefon', 'smartfon', 'noutbuk', 'televizor', 'muzlatkich', 'changyutgich', 'kir', 'yuvish',
+    'mashinasi', 'quloqchin', 'soat', 'planshet', "o'yin", 'konsol', 'kamera', 'printer',
+    'телефон', 'ноутбук', 'холодильник', 'пылесос', 'наушники', 'часы', 'samsung', 'apple',
+    'xiaomi', 'artel', 'lg', 'sony', 'qora', 'oq', "ko'k", 'qizil', 'pro', 'max', 'mini', 'ultra',
+]
+
+
+class Command(BaseCommand):
+    help = "Mahsulot qidiruvini sintetik katalogda o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generate', type=int, default=0, help="Oldin shuncha sintetik mahsulot yaratish")
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        if options['generate']:
+            self.generate(rng, options['generate'])
+
+        queries = [' '.join(rng.sample(WORDS, rng.randint(1, 2))) for _ in range(options['queries'])]
+        # Typeahead: so'zning boshi
+        queries += [word[:rng.randint(2, len(word))] for word in rng.choices(WORDS, k=options['queries'])]
+
+        for label, func in (
+            ('fulltext', lambda q: list(search_products(Product.objects.all(), q).values_list('id', flat=True)[:20])),
+            ('icontains', lambda q: list(Product.objects.filter(
+                Q(name__icontains=q) | Q(description__icontains=q)
+            ).values_list('id', flat=True)[:20])),
+        ):
+            times = []
+            for query in queries:
+                start = time.perf_counter()
+                func(query)
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            self.stdout.write(
+                f"{label}: n={len(times)} p50={statistics.median(times):.2f}ms "
+                f"p95={times[int(len(times) * 0.95) - 1]:.2f}ms"
+            )
+
+    def generate(self, rng, count, batch_size=5000):
+        created = 0
+        while created < count:
+            batch = []
+            for _ in range(min(batch_size, count - created)):
+                name = ' '.join(rng.choices(WORDS, k=3))
+                description = ' '.join(rng.choices(WORDS, k=20))
+                batch.append(Product(
+                    name=name, description=description, price=rng.randint(10, 10000) * 1000,
+                    slug=f'bench-{created + len(batch)}', search_text=build_search_text(name, description),
+                ))
+            Product.objects.bulk_create(batch)
+            created += len(batch)
+            self.stdout.write(f"{created}/{count} mahsulot yaratildi")
@@ -0,0 +1,59 @@
+import random
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from olcha.throttling import CacheStore, MemoryStore, SlidingWindowLimiter
+
+
+class Command(BaseCommand):
+    help = (
+        "Limiter narxini o'lchaydi (MemoryStore va CacheStore), parallel thread'larda hisoblagich atomikligini "
+        "tekshiradi va cheklangan login so'rovi 429 bilan parol xeshlashsiz qaytishini ko'rsatadi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--threads', type=int, default=8)
+
+    def handle(self, *args, **options):
+        for store in (MemoryStore(), CacheStore()):
+            limiter = SlidingWindowLimiter(store)
+            start = time.perf_counter()
+            for index in range(options['requests']):
+                limiter.hit(f'bench:{index % 100}', 10 ** 9, 60)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{type(store).__name__:<12} {elapsed / options['requests'] * 1_000_000:6.2f}µs/tekshiruv"
+            )
+
+            # Atomiklik: limit 1000, thread'lar birgalikda 1000 dan ko'p ruxsat olmasligi kerak
+            allowed = []
+            key = f'bench-atomic:{time.time()}'
+
+            def worker():
+                allowed.append(sum(limiter.hit(key, 1000, 3600)[0] for _ in range(500)))
+
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.stdout.write(f"{'':<12} {options['threads'] * 500} urinish, limit 1000: {sum(allowed)} ta ruxsat")
+
+        # Har ishga tushirishda boshqa IP — oldingi hisoblagichlarni tozalash shart emas
+        client = Client(HTTP_HOST='localhost', REMOTE_ADDR=f'10.255.{random.randint(0, 255)}.{random.randint(1, 254)}')
+        data = {'username': 'bench-throttle', 'password': 'not-the-password'}
+        for attempt in range(100):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.post('/api/v1/auth/login/', data)
+                elapsed = (time.perf_counter() - start) * 1000
+            if attempt == 0 or response.status_code == 429:
+                self.stdout.write(
+                    f"login #{attempt + 1}: {response.status_code}, {elapsed:.2f}ms, {len(captured)} SQL"
+                )
+            if response.status_code == 429:
+                break
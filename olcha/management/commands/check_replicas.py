@@ -0,0 +1,45 @@
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from olcha.db_router import health, pin_to_primary
+
+
+class Command(BaseCommand):
+    help = (
+        "Replikalar holatini va so'rovlar qaysi bazaga yo'naltirilishini ko'rsatadi: oddiy GET va "
+        "yozuvdan keyingi GET (read-your-writes). Lokal sinov: DB_ENGINE=sqlite DB_REPLICAS=replica.sqlite3"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/categories/')
+
+    def capture(self, client, method, path):
+        # Katalog keshini chetlab o'tish uchun har safar yangi kalit (keshni tozalash pin belgisini ham o'chirardi)
+        self.counter += 1
+        separator = '&' if '?' in path else '?'
+        with ExitStack() as stack:
+            aliases = ['default'] + [alias for alias in settings.DATABASE_REPLICAS if health.is_healthy(alias)]
+            captured = {alias: stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases}
+            status = getattr(client, method)(f'{path}{separator}_check={self.counter}').status_code
+        counts = ', '.join(f'{alias}={len(queries)}' for alias, queries in captured.items() if len(queries))
+        return status, counts or "so'rov yo'q"
+
+    counter = 0
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            self.stdout.write("Replikalar sozlanmagan (DB_REPLICAS bo'sh) — barcha so'rovlar default bazada")
+            return
+        for alias in settings.DATABASE_REPLICAS:
+            state = "sog'lom" if health.is_healthy(alias) else "ishlamayapti (o'qishlar primary'ga)"
+            self.stdout.write(f"{alias}: {state}")
+
+        client = Client(HTTP_HOST='localhost', REMOTE_ADDR='10.254.0.1')
+        path = options['path']
+        self.stdout.write(f"GET {path}: %s, %s" % self.capture(client, 'get', path))
+        # Yozuvdan keyingi holat: middleware so'rovda yozuv bo'lganda aynan shu belgini qo'yadi
+        pin_to_primary('ip:10.254.0.1')
+        self.stdout.write(f"Yozuvdan keyingi GET {path}: %s, %s" % self.capture(client, 'get', path))
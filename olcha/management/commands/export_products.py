@@ -0,0 +1,24 @@
+import sys
+from django.core.management.base import BaseCommand
+from olcha.catalog_io import detect_format, export_lines
+from olcha.models import Product
+
+
+class Command(BaseCommand):
+    help = "Mahsulotlarni CSV/JSONL ko'rinishida o'zgarmas xotira bilan eksport qiladi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help="Bo'sh qoldirilsa stdout ga yoziladi")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], dest='file_format')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or detect_format(path)
+        lines = export_lines(Product.objects.all(), file_format, chunk_size=options['chunk_size'])
+        if not path:
+            sys.stdout.writelines(lines)
+            return
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            stream.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(f"{path} ga yozildi"))
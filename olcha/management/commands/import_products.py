@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from olcha.catalog_io import detect_format, import_products, iter_records
+
+
+class Command(BaseCommand):
+    help = "CSV/JSONL fayldan mahsulotlarni bo'laklab import qiladi (slug bo'yicha upsert)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], dest='file_format')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        file_format = options['file_format'] or detect_format(options['path'])
+        try:
+            with open(options['path'], encoding='utf-8', newline='') as stream:
+                result = import_products(iter_records(stream, file_format), batch_size=options['batch_size'])
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result['errors'][:20]:
+            self.stderr.write(f"{error['line']}-qator: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Yaratildi: {result['created']}, yangilandi: {result['updated']}, xatolar: {len(result['errors'])}"
+        ))
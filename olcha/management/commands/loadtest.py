@@ -0,0 +1,60 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand
+
+
+async def fetch(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET {path} HTTP/1.0\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1])
+
+
+async def run(url, total, concurrency):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status = await fetch(parts.hostname, parts.port or 80, path)
+            except OSError:
+                status = 0
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Ishlab turgan serverga parallel so'rovlar yuboradi. WSGI va ASGI yo'llarini solishtirish uchun, masalan: "
+        "loadtest http://127.0.0.1:8000/api/v1/products/ http://127.0.0.1:8001/api/v1/async/products/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=100)
+
+    def handle(self, *args, **options):
+        for url in options['urls']:
+            elapsed, latencies, errors = asyncio.run(run(url, options['requests'], options['concurrency']))
+            self.stdout.write(
+                f"{url}\n  {len(latencies) / elapsed:.1f} req/s, p50={statistics.median(latencies):.1f}ms "
+                f"p95={latencies[int(len(latencies) * 0.95) - 1]:.1f}ms p99={latencies[int(len(latencies) * 0.99) - 1]:.1f}ms "
+                f"xatolar={errors}"
+            )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from olcha.images import invalidate_result, process_image
+from olcha.models import Category, ProductImage, Comment
+
+
+class Command(BaseCommand):
+    help = "Variantlari yo'q (yoki --all bilan barcha) rasmlar uchun variantlarni yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in (ProductImage, Category, Comment):
+            queryset = model.objects.exclude(image='').exclude(image__isnull=True)
+            if not options['all']:
+                queryset = queryset.filter(variants={})
+            for pk in queryset.values_list('pk', flat=True).iterator():
+                invalidate_result(process_image(model._meta.label, pk, 'image'))
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f"{total} ta rasm qayta ishlandi"))
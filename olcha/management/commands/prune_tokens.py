@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from olcha.blacklist import blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Muddati o'tgan OutstandingToken (va ularning BlacklistedToken) yozuvlarini partiyalab o'chiradi. "
+        "Cron orqali davriy ishga tushiriladi, masalan soatiga bir marta"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # expires_at indeksi (0018) bo'yicha; har partiya alohida tranzaksiya — jadval uzoq qulflanmaydi
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('expires_at').values_list('pk', flat=True)
+        deleted = 0
+        while True:
+            ids = list(expired[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                count, _ = OutstandingToken.objects.filter(pk__in=ids).delete()
+            deleted += count
+        # Shu jarayondagi bloom filtr keyingi tekshiruvda faqat tirik yozuvlardan qayta quriladi
+        blacklist_index.reset()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta eskirgan token o'chirildi"))
@@ -0,0 +1,38 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from olcha.models import Order
+from olcha.reports import rebuild_day
+
+
+class Command(BaseCommand):
+    help = "OrderRollup (soatlik/kunlik) jadvalini Order jadvalidan kunma-kun qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help="YYYY-MM-DD, berilmasa birinchi buyurtma kuni")
+        parser.add_argument('--to', dest='date_to', help="YYYY-MM-DD, berilmasa oxirgi buyurtma kuni")
+
+    def handle(self, *args, **options):
+        bounds = Order.objects.aggregate(first=Min('created_at'), last=Max('created_at'))
+        if bounds['first'] is None:
+            self.stdout.write("Buyurtmalar yo'q")
+            return
+        date_from = self.parse(options['date_from']) or timezone.localdate(bounds['first'])
+        date_to = self.parse(options['date_to']) or timezone.localdate(bounds['last'])
+
+        day, rows = date_from, 0
+        while day <= date_to:
+            rows += rebuild_day(day)
+            day += timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"{date_from} — {date_to}: {rows} ta rollup qatori yozildi"))
+
+    @staticmethod
+    def parse(value):
+        if value is None:
+            return None
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"Noto'g'ri sana: {value}")
+        return date
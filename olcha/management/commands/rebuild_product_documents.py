@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from olcha.documents import refresh_documents
+from olcha.models import Product
+
+
+class Command(BaseCommand):
+    help = "Barcha mahsulotlar uchun oldindan render qilingan JSON hujjatlarni qayta yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = Product.objects.order_by('pk').values_list('pk', flat=True)
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            refresh_documents(batch, batch_size=batch_size)
+            total += len(batch)
+            last_id = batch[-1]
+        self.stdout.write(self.style.SUCCESS(f"{total} ta hujjat yangilandi"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from olcha.models import Product, Comment
+
+
+class Command(BaseCommand):
+    help = "Product.rating_sum, rating_count va like_count maydonlarini qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        comments = Comment.objects.filter(product=OuterRef('pk')).order_by().values('product')
+        likes = Product.likes.through.objects.filter(product_id=OuterRef('pk')).order_by().values('product_id')
+
+        ids = Product.objects.order_by('pk').values_list('pk', flat=True)
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                updated += Product.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]).update(
+                    rating_sum=Coalesce(Subquery(comments.annotate(total=Sum('rating')).values('total')), Value(0)),
+                    rating_count=Coalesce(Subquery(comments.annotate(total=Count('id')).values('total')), Value(0)),
+                    like_count=Coalesce(Subquery(likes.annotate(total=Count('id')).values('total')), Value(0)),
+                )
+            last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} ta mahsulot statistikasi yangilandi"))
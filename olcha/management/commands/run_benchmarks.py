@@ -0,0 +1,126 @@
+import json
+import subprocess
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from olcha import cache
+from olcha.models import Category, SubCategory, Product, ProductImage, Comment, Order
+from olcha.urls import router
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "olcha/urls.py dagi barcha router endpointlari va qo'shimcha yo'llarni ishga tushirib, "
+        "p50/p95/p99, so'rovdagi SQL soni va throughput'ni hisoblaydi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Har bir scenariy uchun")
+        parser.add_argument('--warm-cache', action='store_true', help="Kesh tozalanmaydi (hit yo'li)")
+        parser.add_argument('--json', dest='json_path', help="Natijani JSON faylga yozish")
+        parser.add_argument('--compare', help="Oldingi JSON natija bilan solishtirish")
+
+    def scenarios(self):
+        samples = {
+            'categories': Category.objects.order_by('-pk').values_list('pk', flat=True).first(),
+            'subcategories': SubCategory.objects.order_by('-pk').values_list('pk', flat=True).first(),
+            'products': Product.objects.order_by('-pk').values_list('pk', flat=True).first(),
+            'product-images': ProductImage.objects.order_by('-pk').values_list('pk', flat=True).first(),
+            'orders': Order.objects.order_by('-pk').values_list('pk', flat=True).first(),
+        }
+        authenticated = {'orders', 'reports'}
+        result = []
+        for prefix, viewset, basename in router.registry:
+            auth = prefix in authenticated
+            result.append((f'{prefix}-list', f'/api/v1/{prefix}/', auth))
+            if samples.get(prefix):
+                result.append((f'{prefix}-detail', f'/api/v1/{prefix}/{samples[prefix]}/', auth))
+
+        product_ids = ','.join(map(str, Product.objects.order_by('-pk').values_list('pk', flat=True)[:20]))
+        comment_product = Comment.objects.order_by('-pk').values_list('product_id', flat=True).first()
+        result += [
+            ('products-list-page50', '/api/v1/products/?page_size=50', False),
+            ('products-list-cursor', '/api/v1/products/?cursor=&page_size=50', False),
+            ('products-list-sparse', '/api/v1/products/?fields=id,name,price,images&page_size=50', False),
+            ('products-search', '/api/v1/products/search/?q=telefon', False),
+            ('products-typeahead', '/api/v1/products/search/?q=tel&mode=typeahead', False),
+            ('products-faceted', '/api/v1/products/faceted/?in_stock=1', False),
+            ('products-compact', '/api/v1/products/compact/?page_size=50', False),
+            ('products-liked', f'/api/v1/products/liked/?ids={product_ids}', True),
+            ('categories-tree', '/api/v1/categories/tree/', False),
+            ('comments-list', '/api/v1/comments/', False),
+            ('async-products-list', '/api/v1/async/products/', False),
+            ('auth-me', '/api/v1/auth/me/', True),
+        ]
+        if comment_product:
+            result.append(('comments-by-product', f'/api/v1/comments/by-product/{comment_product}/', False))
+        return result
+
+    def handle(self, *args, **options):
+        anonymous = Client(HTTP_HOST='localhost')
+        authenticated = Client(HTTP_HOST='localhost')
+        user = User.objects.filter(is_active=True).order_by('pk').first()
+        if user:
+            authenticated.force_login(user)
+
+        results = {}
+        for name, path, needs_auth in self.scenarios():
+            client = authenticated if needs_auth and user else anonymous
+            latencies, queries, statuses = [], 0, set()
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                if not options['warm_cache']:
+                    cache.get_cache().clear()
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                queries += len(captured)
+                statuses.add(response.status_code)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                'path': path,
+                'status': sorted(statuses),
+                'p50_ms': round(percentile(latencies, 0.50), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'p99_ms': round(percentile(latencies, 0.99), 3),
+                'queries_per_request': round(queries / options['requests'], 2),
+                'throughput_rps': round(options['requests'] / elapsed, 1),
+            }
+
+        baseline = {}
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as stream:
+                baseline = json.load(stream).get('results', {})
+
+        self.stdout.write(f"{'scenariy':<28} {'status':<10} {'p50':>8} {'p95':>8} {'p99':>8} {'sql':>6} {'rps':>8}")
+        for name, row in results.items():
+            line = (
+                f"{name:<28} {','.join(map(str, row['status'])):<10} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+                f"{row['p99_ms']:>8.2f} {row['queries_per_request']:>6} {row['throughput_rps']:>8}"
+            )
+            if name in baseline and baseline[name]['p50_ms']:
+                change = (row['p50_ms'] - baseline[name]['p50_ms']) / baseline[name]['p50_ms'] * 100
+                line += f"  p50 {change:+.1f}%, sql {row['queries_per_request'] - baseline[name]['queries_per_request']:+g}"
+            self.stdout.write(line)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as stream:
+                json.dump({'commit': self.git_commit(), 'requests': options['requests'],
+                           'warm_cache': options['warm_cache'], 'results': results}, stream, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"{options['json_path']} ga yozildi"))
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,38 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from olcha import tasks
+
+
+class Command(BaseCommand):
+    help = "Fon vazifalari navbatini jarayonlar puli bilan bajaradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--lock-timeout', type=int, default=300)
+        parser.add_argument('--once', action='store_true', help="Navbat bo'shaguncha ishlab, chiqib ketish")
+        parser.add_argument('--prune-interval', type=float, default=3600,
+                            help="Bajarilgan vazifalarni o'chirish oralig'i (soniya, TASKS_KEEP_DONE_HOURS)")
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        processed = 0
+        pruned_at = 0.0
+        with ProcessPoolExecutor(max_workers=workers, initializer=tasks.init_worker) as pool:
+            while True:
+                if time.monotonic() - pruned_at >= options['prune_interval']:
+                    pruned_at = time.monotonic()
+                    pruned = tasks.prune()
+                    if pruned:
+                        self.stdout.write(f"{pruned} ta bajarilgan vazifa o'chirildi")
+                ids = tasks.claim(workers * 2, lock_timeout=options['lock_timeout'])
+                if not ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                list(pool.map(tasks.run, ids))
+                processed += len(ids)
+                self.stdout.write(f"{processed} ta vazifa bajarildi")
+        self.stdout.write(self.style.SUCCESS(f"Tugadi: {processed} ta vazifa"))
@@ -0,0 +1,147 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+from olcha.cache import invalidate_tags
+from olcha.category_tree import TREE_TAG
+from olcha.signals import PRODUCT_LISTS_TAG
+from olcha.models import Category, SubCategory, Product, ProductImage, Comment, Order
+from olcha.search import build_search_text
+
+ADJECTIVES = ['Yangi', 'Pro', 'Max', 'Mini', 'Ultra', 'Smart', 'Lite', 'Plus', 'Qora', 'Oq', "Ko'k"]
+BRANDS = ['Samsung', 'Apple', 'Xiaomi', 'Artel', 'LG', 'Sony', 'Huawei', 'Lenovo', 'HP', 'Philips']
+NOUNS = ['telefon', 'noutbuk', 'televizor', 'muzlatkich', 'changyutgich', 'quloqchin', 'soat', 'planshet',
+         'kamera', 'printer', 'konditsioner', 'mikroto\'lqinli pech']
+MESSAGES = ["Juda yaxshi mahsulot", "Narxiga arziydi", "Yetkazib berish tez bo'ldi", "Sifati o'rtacha",
+            "Tavsiya qilaman", "Kutganimdek emas"]
+
+
+class Command(BaseCommand):
+    help = "Benchmark uchun realistik sintetik ma'lumotlarni bulk yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--subcategories', type=int, default=5, help="Har bir kategoriya uchun")
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--images', type=int, default=3, help="Har bir mahsulot uchun")
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--likes', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=30000)
+        parser.add_argument('--orders', type=int, default=20000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.tag = f"seed{options['seed']}-{self.rng.randint(0, 10 ** 6)}"
+
+        subcategories = self.seed_categories(options['categories'], options['subcategories'])
+        users = self.seed_users(options['users'])
+        products = self.seed_products(options['products'], subcategories)
+        self.seed_images(products, options['images'])
+        self.seed_likes(products, users, options['likes'])
+        self.seed_comments(products, users, options['comments'])
+        self.seed_orders(products, users, options['orders'])
+
+        call_command('rebuild_product_stats', stdout=self.stdout)
+        # bulk_create'dagi buyurtmalar rollup'larga yozilmagan — hisobotlar uchun qayta quramiz
+        call_command('rebuild_order_rollups', stdout=self.stdout)
+        invalidate_tags('categories', 'subcategories', 'products', PRODUCT_LISTS_TAG, TREE_TAG)
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
+
+    def bulk(self, model, objects, **kwargs):
+        # MySQL bulk_create pk qaytarmaydi — yaratilganlarni pk > oldingi maksimum bo'yicha qayta o'qiymiz
+        last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(objects[start:start + self.batch_size], **kwargs)
+        self.stdout.write(f"{model.__name__}: {len(objects)}")
+        return last
+
+    def seed_categories(self, count, per_category):
+        last = self.bulk(Category, [
+            Category(title=f"Kategoriya {index}", slug=f"{self.tag}-cat-{index}") for index in range(count)
+        ])
+        category_ids = list(Category.objects.filter(pk__gt=last).values_list('pk', flat=True))
+        last = self.bulk(SubCategory, [
+            SubCategory(category_id=category_id, name=f"Subkategoriya {category_id}-{index}",
+                        slug=f"{self.tag}-sub-{category_id}-{index}")
+            for category_id in category_ids for index in range(per_category)
+        ])
+        return list(SubCategory.objects.filter(pk__gt=last).values_list('pk', 'category_id'))
+
+    def seed_users(self, count):
+        password = make_password('benchmark-password')  # xeshlash bir marta
+        last = self.bulk(User, [
+            User(username=f"{self.tag}-user-{index}", email=f"user{index}@{self.tag}.uz", password=password)
+            for index in range(count)
+        ])
+        return list(User.objects.filter(pk__gt=last).values_list('pk', flat=True))
+
+    def seed_products(self, count, subcategories):
+        products = []
+        for index in range(count):
+            subcategory_id, category_id = self.rng.choice(subcategories)
+            name = f"{self.rng.choice(BRANDS)} {self.rng.choice(NOUNS)} {self.rng.choice(ADJECTIVES)} {index}"
+            description = ' '.join(self.rng.choices(NOUNS + ADJECTIVES + BRANDS, k=30))
+            products.append(Product(
+                name=name, description=description,
+                price=Decimal(self.rng.randint(50, 30000)) * 1000,
+                discount=self.rng.choice([0, 0, 0, 5, 10, 15, 25, 50]),
+                quantity=self.rng.choice([0, 1, 5, 10, 50, 100, 1000]),
+                slug=f"{self.tag}-product-{index}",
+                category_id=category_id, subcategory_id=subcategory_id,
+                search_text=build_search_text(name, description),
+            ))
+        last = self.bulk(Product, products)
+        return list(Product.objects.filter(pk__gt=last).values_list('pk', 'price', 'discount'))
+
+    def seed_images(self, products, per_product):
+        self.bulk(ProductImage, [
+            ProductImage(product_id=pk, image=f"product_images/seed-{index}.jpg", alt_text=f"Rasm {index}")
+            for pk, _, _ in products for index in range(per_product)
+        ])
+
+    def seed_likes(self, products, users, count):
+        if not users:
+            return
+        pairs = {(self.rng.choice(products)[0], self.rng.choice(users)) for _ in range(count)}
+        Like = Product.likes.through
+        self.bulk(Like, [Like(product_id=product_id, user_id=user_id) for product_id, user_id in pairs],
+                  ignore_conflicts=True)
+
+    def seed_comments(self, products, users, count):
+        if not users:
+            return
+        self.bulk(Comment, [
+            Comment(product_id=self.rng.choice(products)[0], user_id=self.rng.choice(users),
+                    message=self.rng.choice(MESSAGES), rating=self.rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 6])[0])
+            for _ in range(count)
+        ])
+
+    def seed_orders(self, products, users, count):
+        if not users:
+            return
+        orders = []
+        start = now() - timedelta(days=90)
+        for _ in range(count):
+            pk, price, discount = self.rng.choice(products)
+            quantity = self.rng.randint(1, 3)
+            unit = price * (1 - Decimal(discount) / 100)
+            orders.append(Order(
+                user_id=self.rng.choice(users), product_id=pk, full_name="Test Foydalanuvchi",
+                phone='+998901234567', address="Toshkent", quantity=quantity, total_price=unit * quantity,
+            ))
+        last = self.bulk(Order, orders)
+        # Buyurtmalarni so'nggi 90 kunga taqsimlaymiz (auto_now_add bulk_create da "hozir"ni qo'yadi)
+        ids = list(Order.objects.filter(pk__gt=last).values_list('pk', flat=True))
+        for offset in range(0, len(ids), self.batch_size):
+            updated = [Order(pk=pk, created_at=start + timedelta(seconds=self.rng.randint(0, 90 * 86400)))
+                       for pk in ids[offset:offset + self.batch_size]]
+            Order.objects.bulk_update(updated, ['created_at'])
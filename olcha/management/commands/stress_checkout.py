@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from olcha.models import Product, Order
+from olcha.orders import OutOfStockError, place_order
+
+
+class Command(BaseCommand):
+    help = "Parallel checkout'lar ostida oversell yo'qligini tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=200)
+        parser.add_argument('--per-order', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            self.stderr.write("Ogohlantirish: SQLite yozuvlarni ketma-ket bajaradi, natija MySQL'dagidek emas")
+
+        product = Product.objects.create(name='stress-checkout', price=1000, quantity=options['stock'])
+        per_order = options['per_order']
+
+        def attempt(_):
+            try:
+                place_order(None, 'Stress Test', '+998901234567', 'Toshkent', [(product.pk, per_order)])
+                return True
+            except OutOfStockError:
+                return False
+            finally:
+                connection.close()
+
+        # Kutilmagan xatoda ham sinov mahsuloti va buyurtmalari bazada qolmasligi kerak
+        try:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                results = list(pool.map(attempt, range(options['attempts'])))
+
+            product.refresh_from_db()
+            sold_total = sum(Order.objects.filter(product=product).values_list('quantity', flat=True))
+        finally:
+            Order.objects.filter(product=product).delete()
+            product.delete()
+
+        self.stdout.write(
+            f"Muvaffaqiyatli: {results.count(True)}, rad etilgan: {results.count(False)}, "
+            f"sotilgan: {sold_total}, qoldiq: {product.quantity}"
+        )
+        if sold_total + product.quantity != options['stock'] or sold_total > options['stock']:
+            raise CommandError("Oversell aniqlandi!")
+        self.stdout.write(self.style.SUCCESS("Oversell yo'q"))
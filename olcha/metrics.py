@@ -0,0 +1,204 @@
+import hmac
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger('olcha.metrics')
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar('olcha_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'query_time', 'serializer_time', 'in_serializer', 'cache_hits', 'cache_misses', 'slow_queries')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.slow_queries = []
+
+
+class Registry:
+    """
+    Jarayon ichidagi metrikalar: endpoint bo'yicha latency histogrammasi va hisoblagichlar.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, endpoint, duration, metrics):
+        with self.lock:
+            buckets, total = self.histograms.setdefault(endpoint, ([0] * len(BUCKETS), [0, 0.0]))
+            for index, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    buckets[index] += 1
+            total[0] += 1
+            total[1] += duration
+            for name, value in (
+                ('db_queries_total', metrics.queries),
+                ('db_query_duration_seconds_total', metrics.query_time),
+                ('serializer_duration_seconds_total', metrics.serializer_time),
+                ('cache_hits_total', metrics.cache_hits),
+                ('cache_misses_total', metrics.cache_misses),
+            ):
+                key = (name, endpoint)
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def render(self):
+        lines = ['# TYPE olcha_request_duration_seconds histogram']
+        with self.lock:
+            for endpoint, (buckets, (count, total)) in sorted(self.histograms.items()):
+                label = _escape(endpoint)
+                for bound, value in zip(BUCKETS, buckets):
+                    lines.append(f'olcha_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {value}')
+                lines.append(f'olcha_request_duration_seconds_bucket{{endpoint="{label}",le="+Inf"}} {count}')
+                lines.append(f'olcha_request_duration_seconds_sum{{endpoint="{label}"}} {total:.6f}')
+                lines.append(f'olcha_request_duration_seconds_count{{endpoint="{label}"}} {count}')
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f'# TYPE olcha_{name} counter')
+                for (counter, endpoint), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f'olcha_{name}{{endpoint="{_escape(endpoint)}"}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+registry = Registry()
+
+
+def record_cache(hit):
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+class TimedSerializerMixin:
+    """
+    Serializer vaqtini joriy so'rov metrikasiga qo'shadi (ichma-ich serializer'lar ikki marta sanalmaydi).
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.in_serializer:
+            return super().to_representation(instance)
+        metrics.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.in_serializer = False
+
+
+class MetricsMiddleware:
+    """
+    So'rov latency, DB so'rovlar soni/vaqti, serializer vaqti va kesh hit/miss'larini yig'adi.
+    METRICS_ENABLED=False bo'lsa middleware umuman yuklanmaydi (qo'shimcha xarajat yo'q).
+
+    Sync va async zanjirda ham ishlaydi (ASGI'da thread'ga o'tkazilmaydi). Async view'lardagi ORM
+    so'rovlari boshqa thread'dagi connection orqali ketadi, shuning uchun ular uchun DB hisoblagichlari to'liq emas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request = getattr(settings, 'SLOW_REQUEST_MS', 500) / 1000
+        self.slow_query = getattr(settings, 'SLOW_QUERY_MS', 100) / 1000
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with self.wrap_connections():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with self.wrap_connections():
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, metrics, time.perf_counter() - start)
+        return response
+
+    def wrap_connections(self):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self.wrap_query))
+        return stack
+
+    def finish(self, request, metrics, duration):
+        match = request.resolver_match
+        endpoint = f"{request.method} {match.view_name or match.route}" if match else f"{request.method} <unmatched>"
+        registry.observe(endpoint, duration, metrics)
+
+        if duration >= self.slow_request:
+            logger.warning(
+                "Sekin so'rov: %s %s %.1fms, %d ta SQL (%.1fms), serializer %.1fms, kesh %d/%d",
+                request.method, request.get_full_path(), duration * 1000, metrics.queries,
+                metrics.query_time * 1000, metrics.serializer_time * 1000, metrics.cache_hits, metrics.cache_misses,
+            )
+        for sql, query_duration in metrics.slow_queries:
+            logger.warning("Sekin SQL (%.1fms) %s: %s", query_duration * 1000, endpoint, sql)
+
+    def wrap_query(self, execute, sql, params, many, context):
+        metrics = _current.get()
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if metrics is not None:
+                elapsed = time.perf_counter() - start
+                metrics.queries += 1
+                metrics.query_time += elapsed
+                if elapsed >= self.slow_query:
+                    metrics.slow_queries.append((sql, elapsed))
+
+
+def metrics_view(request):
+    # Token sozlanmagan bo'lsa endpoint yopiq — metrikalar endpoint nomlari va yuklamani oshkor qiladi
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    supplied = request.headers.get('Authorization', '')
+    if not token or not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.7 on 2026-10-17 10:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    # Mavjud like va izohlar bo'yicha hisoblagichlarni to'ldiramiz (rebuild_product_stats bilan bir xil)
+    Product = apps.get_model('olcha', 'Product')
+    Comment = apps.get_model('olcha', 'Comment')
+    comments = Comment.objects.filter(product=OuterRef('pk')).order_by().values('product')
+    likes = Product.likes.through.objects.filter(product_id=OuterRef('pk')).order_by().values('product_id')
+
+    ids = Product.objects.order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    while True:
+        batch = list(ids.filter(pk__gt=last_id)[:5000])
+        if not batch:
+            break
+        Product.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]).update(
+            rating_sum=Coalesce(Subquery(comments.annotate(total=Sum('rating')).values('total')), Value(0)),
+            rating_count=Coalesce(Subquery(comments.annotate(total=Count('id')).values('total')), Value(0)),
+            like_count=Coalesce(Subquery(likes.annotate(total=Count('id')).values('total')), Value(0)),
+        )
+        last_id = batch[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0008_product_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
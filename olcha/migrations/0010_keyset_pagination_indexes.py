@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0009_product_like_count_product_rating_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created_at', 'id'], name='product_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created', 'id'], name='comment_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['product', 'created', 'id'], name='comment_product_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+def fill_search_text(apps, schema_editor):
+    from olcha.search import build_search_text
+
+    Product = apps.get_model('olcha', 'Product')
+    batch = []
+    for product in Product.objects.only('id', 'name', 'description').iterator(chunk_size=2000):
+        product.search_text = build_search_text(product.name, product.description)
+        batch.append(product)
+        if len(batch) >= 2000:
+            Product.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Product.objects.bulk_update(batch, ['search_text'])
+
+
+def create_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('CREATE FULLTEXT INDEX product_search_text_ft ON olcha_product (search_text)')
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('DROP INDEX product_search_text_ft ON olcha_product')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
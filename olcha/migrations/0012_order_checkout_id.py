@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0011_product_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='checkout_id',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0012_order_checkout_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDocument',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='olcha.product')),
+                ('body', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0013_productdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-17 15:00
+
+from django.db import migrations
+
+
+def create_expires_index(apps, schema_editor):
+    schema_editor.execute('CREATE INDEX outstandingtoken_expires_idx ON token_blacklist_outstandingtoken (expires_at)')
+
+
+def drop_expires_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('DROP INDEX outstandingtoken_expires_idx ON token_blacklist_outstandingtoken')
+    else:
+        schema_editor.execute('DROP INDEX outstandingtoken_expires_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0017_product_facet_indexes'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    # token_blacklist ilovasi o'zimizniki emas — `prune_tokens` uchun expires_at indeksini shu yerda qo'shamiz
+    operations = [
+        migrations.RunPython(create_expires_index, drop_expires_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-17 16:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0018_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_rollups', to='olcha.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_rollups', to='olcha.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'bucket'], name='orderrollup_period_bucket_idx'), models.Index(fields=['period', 'category', 'bucket'], name='orderrollup_category_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'bucket', 'product'), name='orderrollup_unique_bucket')],
+            },
+        ),
+    ]
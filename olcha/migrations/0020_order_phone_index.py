@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-17 17:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0019_orderrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['phone'], name='order_phone_idx'),
+        ),
+    ]
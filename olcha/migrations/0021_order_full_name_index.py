@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0020_order_phone_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['full_name'], name='order_full_name_idx'),
+        ),
+    ]
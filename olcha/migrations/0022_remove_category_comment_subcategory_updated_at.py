@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('olcha', '0021_order_full_name_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='category',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='subcategory',
+            name='updated_at',
+        ),
+    ]
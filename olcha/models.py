@@ -1,14 +1,17 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BooleanField, Exists, OuterRef, Prefetch, Value
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from phonenumber_field.modelfields import PhoneNumberField
-from decimal import Decimal
+from .search import build_search_text
+from .cache import invalidate_tags
 
 
 class Category(models.Model):
     title = models.CharField(max_length=200)
     image = models.ImageField(upload_to='category_images/', null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True, editable=False)  # olcha/images.py
     slug = models.SlugField(null=True, unique=True)
 
     def save(self, *args, **kwargs):
@@ -34,6 +37,63 @@ class SubCategory(models.Model):
         return self.name
 
 
+class ProductQuerySet(models.QuerySet):
+    # Serializer maydoni -> kerakli ustunlar (?fields= bo'yicha .only() uchun)
+    FIELD_COLUMNS = {
+        'id': ['id'], 'name': ['name'], 'description': ['description'], 'price': ['price'],
+        'discounted_price': ['price', 'discount'], 'discount': ['discount'], 'quantity': ['quantity'],
+        'like_count': ['like_count'], 'slug': ['slug'], 'created_at': ['created_at'], 'updated_at': ['updated_at'],
+        'average_rating': ['rating_sum', 'rating_count'], 'comment_count': ['rating_count'],
+        'subcategory_name': ['subcategory__name'], 'subcategory_id': ['subcategory__id'],
+        'category_name': ['subcategory__category__title'], 'category_id': ['subcategory__category__id'],
+    }
+
+    # List va detail endpointlar uchun so'rovlar rejasi: sahifa hajmidan qat'i nazar so'rovlar soni o'zgarmas.
+    # fields berilsa (sparse fieldset), faqat shu maydonlar uchun kerakli JOIN/prefetch/annotatsiyalar qo'shiladi.
+    def with_list_data(self, user=None, fields=None):
+        if fields is None:
+            queryset = self.select_related('subcategory', 'subcategory__category').prefetch_related(
+                Prefetch('images', queryset=ProductImage.objects.order_by('id'))
+            )
+            return queryset.annotate(is_liked=self._is_liked(user))
+
+        # id va created_at doim kerak (keyset cursor va tartiblash uchun)
+        columns = {'id', 'created_at'}
+        for field in fields:
+            columns.update(self.FIELD_COLUMNS.get(field, []))
+        queryset = self
+        if fields & {'category_name', 'category_id'}:
+            queryset = queryset.select_related('subcategory', 'subcategory__category')
+            columns.update(['subcategory', 'subcategory__category'])
+        elif fields & {'subcategory_name', 'subcategory_id'}:
+            queryset = queryset.select_related('subcategory')
+            columns.add('subcategory')
+        queryset = queryset.only(*columns)
+        if 'images' in fields:
+            queryset = queryset.prefetch_related(Prefetch('images', queryset=ProductImage.objects.order_by('id')))
+        if 'likes' in fields:
+            queryset = queryset.annotate(is_liked=self._is_liked(user))
+        return queryset
+
+    def with_detail_data(self, user=None, fields=None):
+        queryset = self.with_list_data(user, fields)
+        if fields is not None and 'comments' not in fields:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch(
+                'comment_product',
+                queryset=Comment.objects.select_related('user').order_by('-created')[:5],
+                to_attr='latest_comments',
+            )
+        )
+
+    @staticmethod
+    def _is_liked(user):
+        if user is None or not user.is_authenticated:
+            return Value(False, output_field=BooleanField())
+        return Exists(Product.likes.through.objects.filter(product_id=OuterRef('pk'), user_id=user.pk))
+
+
 class Product(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(null=True, blank=True)
@@ -48,25 +108,77 @@ class Product(models.Model):
     subcategory = models.ForeignKey(SubCategory, on_delete=models.SET_NULL, null=True, blank=True,
                                     related_name='products')
 
+    # To'liq matnli qidiruv uchun normallashtirilgan matn (olcha/search.py)
+    search_text = models.TextField(default='', blank=True, editable=False)
+
+    # Denormalizatsiya qilingan agregatlar (olcha/signals.py orqali yangilanadi)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+
+    AGGREGATE_FIELDS = ('rating_sum', 'rating_count', 'like_count')
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='product_created_id_idx'),
+            models.Index(fields=['category', 'price'], name='product_category_price_idx'),
+            models.Index(fields=['price'], name='product_price_idx'),
+            models.Index(fields=['category', 'quantity'], name='product_category_qty_idx'),
+            models.Index(fields=['category', 'discount'], name='product_category_discount_idx'),
+        ]
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return 0
+        return round(self.rating_sum / self.rating_count, 1)
+
     def save(self, *args, **kwargs):
         # Agar subcategory tanlangan bo'lsa, category ni avtomatik ravishda o'rnatish
         if self.subcategory and not self.category:
             self.category = self.subcategory.category
         if not self.slug:
             self.slug = slugify(self.name)
+        self.search_text = build_search_text(self.name, self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # To'liq saqlashda agregatlar yozilmaydi — xotiradagi eski qiymat signallardagi F() yangilanishlarini
+            # (parallel like/izohlar) bosib ketmasligi uchun. Ular faqat .update() orqali o'zgaradi
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.AGGREGATE_FIELDS
+            ]
+        elif update_fields is not None and {'name', 'description'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+class ProductDocument(models.Model):
+    # Mahsulotning oldindan render qilingan JSON ko'rinishi (olcha/documents.py)
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='document')
+    body = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Document for product #{self.product_id}"
+
+
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='product_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)  # olcha/images.py
     alt_text = models.CharField(max_length=255, blank=True, null=True)
 
     def __str__(self):
-        return f"Image for {self.product.name}"
+        # product oldindan yuklanmagan bo'lsa (select_related'siz ro'yxatlar) qo'shimcha so'rov qilmaymiz
+        if ProductImage.product.is_cached(self):
+            return f"Image for {self.product.name}"
+        return f"Image for product #{self.product_id}"
 
 
 class Comment(models.Model):
@@ -82,8 +194,15 @@ class Comment(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='comment_product')
     created = models.DateTimeField(auto_now_add=True)
     image = models.FileField(upload_to='comments', null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True, editable=False)  # olcha/images.py
     rating = models.IntegerField(choices=RatingChoices)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created', 'id'], name='comment_created_id_idx'),
+            models.Index(fields=['product', 'created', 'id'], name='comment_product_created_idx'),
+        ]
+
 
 class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='orders')
@@ -93,32 +212,122 @@ class Order(models.Model):
     address = models.TextField()
     quantity = models.PositiveIntegerField(default=1)
     total_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, editable=False)
+    checkout_id = models.UUIDField(null=True, blank=True, editable=False, db_index=True)  # bitta checkout'dagi qatorlar
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+            models.Index(fields=['phone'], name='order_phone_idx'),  # admin qidiruvi
+            models.Index(fields=['full_name'], name='order_full_name_idx'),  # admin prefiks qidiruvi (^full_name)
+        ]
+
     def save(self, *args, **kwargs):
-        # Agar yangi buyurtma bo'lsa va mahsulot yetarli bo'lsa
-        if not self.pk and self.product.quantity >= self.quantity:
-            # Chegirmali narxni hisoblaymiz
-            if self.product.discount > 0:
-                # self.product.discount ni Decimal turiga o'tkazish
-                discount = Decimal(self.product.discount)
-                price = self.product.price * (1 - discount / 100)
-            else:
-                price = self.product.price
-
-            self.total_price = price * self.quantity
-
-            # Mahsulot miqdorini kamaytiramiz
-            self.product.quantity -= self.quantity
-            self.product.save(update_fields=["quantity"])
+        # Agar mavjud buyurtma yangilanayotgan bo'lsa
+        if self.pk:
+            return self._save_existing(*args, **kwargs)
 
+        from .documents import schedule_refresh
+        from .orders import OutOfStockError, reserve_stock, unit_price
+        from .reports import record_orders
+
+        # Yangi buyurtma: zaxirani atomik kamaytirish va saqlash bitta tranzaksiyada
+        with transaction.atomic():
+            if not reserve_stock(self.product_id, self.quantity):
+                raise OutOfStockError("Yetarli mahsulot mavjud emas!")
+            self.total_price = unit_price(self.product) * self.quantity
             super().save(*args, **kwargs)
-        # Agar mavjud buyurtma yangilanayotgan bo'lsa
-        elif self.pk:
+            record_orders([self])
+            # zaxira (quantity) o'zgardi — kesh va oldindan render qilingan hujjat
+            invalidate_tags(f'products:{self.product_id}')
+            schedule_refresh([self.product_id])
+
+    def _save_existing(self, *args, **kwargs):
+        """
+        Mahsulot yoki miqdor o'zgarsa (PATCH/PUT, admin) total_price qayta hisoblanadi va
+        OrderRollup'larga farq yoziladi: eski qiymatlar ayiriladi, yangilari qo'shiladi.
+        """
+        from .orders import unit_price
+        from .reports import forget_order, record_orders
+
+        update_fields = kwargs.get('update_fields')
+        tracked = {'product', 'product_id', 'quantity', 'total_price'}
+        if update_fields is not None and not tracked & set(update_fields):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous = Order.objects.select_for_update().filter(pk=self.pk).only(
+                'product_id', 'quantity', 'total_price', 'created_at'
+            ).first()
+            if previous is not None and (previous.product_id, previous.quantity) != (self.product_id, self.quantity):
+                product = Product.objects.only('price', 'discount').get(pk=self.product_id)
+                self.total_price = unit_price(product) * self.quantity
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'total_price'}
             super().save(*args, **kwargs)
-        else:
-            raise ValueError("Yetarli mahsulot mavjud emas!")
+            if previous is not None and (previous.product_id, previous.quantity, previous.total_price) != (
+                self.product_id, self.quantity, self.total_price
+            ):
+                forget_order(previous)
+                record_orders([self])
 
     def __str__(self):
         return f"Order #{self.id} - {self.full_name}"
+
+
+class OrderRollup(models.Model):
+    # Hisobotlar uchun oldindan yig'ilgan buyurtma statistikasi (olcha/reports.py); Order jadvali skan qilinmaydi
+    class Period(models.TextChoices):
+        HOUR = 'hour'
+        DAY = 'day'
+
+    period = models.CharField(max_length=4, choices=Period.choices)
+    bucket = models.DateTimeField()  # soat yoki kun boshi, TIME_ZONE bo'yicha
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='order_rollups')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='order_rollups')
+    orders = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'bucket', 'product'], name='orderrollup_unique_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'bucket'], name='orderrollup_period_bucket_idx'),
+            models.Index(fields=['period', 'category', 'bucket'], name='orderrollup_category_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.bucket:%Y-%m-%d %H:%M} - {self.product_id}"
+
+
+class Task(models.Model):
+    # Fon vazifalari navbati (olcha/tasks.py, manage.py run_tasks)
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    idempotency_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task #{self.id} - {self.name} ({self.status})"
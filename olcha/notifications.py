@@ -0,0 +1,33 @@
+from django.core.mail import mail_admins, send_mail
+from .models import Comment, Order
+from .tasks import task
+
+
+@task('orders.send_confirmation')
+def send_order_confirmation(order_ids):
+    orders = list(Order.objects.filter(pk__in=order_ids).select_related('user', 'product'))
+    if not orders or not orders[0].user or not orders[0].user.email:
+        return
+    lines = [f"{order.product.name} x {order.quantity} = {order.total_price}" for order in orders]
+    send_mail(
+        "Buyurtmangiz qabul qilindi",
+        "\n".join(lines),
+        None,
+        [orders[0].user.email],
+    )
+
+
+@task('comments.notify_admins')
+def notify_admins_about_comment(comment_id):
+    comment = Comment.objects.filter(pk=comment_id).select_related('user', 'product').first()
+    if comment is None:
+        return
+    mail_admins(
+        f"Yangi izoh: {comment.product.name} ({comment.rating}/5)",
+        f"{comment.user.username}: {comment.message}",
+    )
+
+
+@task('users.send_welcome')
+def send_welcome_email(username, email):
+    send_mail("Olcha'ga xush kelibsiz!", f"Salom, {username}! Ro'yxatdan o'tganingiz uchun rahmat.", None, [email])
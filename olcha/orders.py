@@ -0,0 +1,71 @@
+import uuid
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F
+from .cache import invalidate_tags
+from .documents import schedule_refresh
+from .models import Product, Order
+from .reports import record_orders
+from .tasks import enqueue
+
+
+class OutOfStockError(ValueError):
+    pass
+
+
+def unit_price(product):
+    # Chegirmali narxni hisoblaymiz
+    if product.discount > 0:
+        return product.price * (1 - Decimal(product.discount) / 100)
+    return product.price
+
+
+def reserve_stock(product_id, quantity):
+    """
+    Shartli UPDATE: quantity = quantity - n WHERE quantity >= n.
+    Tekshiruv va kamaytirish bitta atomik so'rovda — parallel buyurtmalarda oversell bo'lmaydi.
+    """
+    return Product.objects.filter(pk=product_id, quantity__gte=quantity).update(
+        quantity=F('quantity') - quantity
+    ) == 1
+
+
+def _invalidate_products(product_ids):
+    # .update() signal yubormaydi, shuning uchun katalog keshini va hujjatlardagi quantity'ni o'zimiz yangilaymiz
+    invalidate_tags(*(f'products:{pk}' for pk in product_ids))
+    schedule_refresh(product_ids)
+
+
+def place_order(user, full_name, phone, address, items):
+    """
+    Bir nechta mahsulotli buyurtmani bitta tranzaksiyada joylashtiradi.
+    items: [(product_id, quantity), ...]. Birorta mahsulot yetmasa, hammasi bekor qilinadi.
+    """
+    quantities = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+    with transaction.atomic():
+        # id tartibida qulflaymiz — parallel checkout'lar orasida deadlock bo'lmasligi uchun
+        for product_id in sorted(quantities):
+            if not reserve_stock(product_id, quantities[product_id]):
+                raise OutOfStockError(f"Yetarli mahsulot mavjud emas! (product={product_id})")
+
+        products = Product.objects.only('id', 'price', 'discount').in_bulk(list(quantities))
+        checkout_id = uuid.uuid4()
+        Order.objects.bulk_create([
+            Order(
+                user_id=user.pk if user is not None and user.is_authenticated else None,
+                product_id=product_id, full_name=full_name, phone=phone, address=address,
+                quantity=quantity, total_price=unit_price(products[product_id]) * quantity,
+                checkout_id=checkout_id,
+            )
+            for product_id, quantity in quantities.items()
+        ])
+        _invalidate_products(list(quantities))
+
+        # MySQL bulk_create da pk qaytarmaydi, shuning uchun checkout_id bo'yicha qayta o'qiymiz
+        orders = list(Order.objects.filter(checkout_id=checkout_id).select_related('product').order_by('id'))
+        record_orders(orders)
+        enqueue('orders.send_confirmation', [order.pk for order in orders], idempotency_key=f'checkout:{checkout_id}')
+    return orders
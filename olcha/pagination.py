@@ -1,15 +1,163 @@
+import base64
+import json
+from datetime import datetime
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+ESTIMATE_CAP = 10000
+
+
+def estimate_count(queryset):
+    """
+    COUNT(*) o'rniga taxminiy son: filtrsiz so'rov uchun jadval statistikasi,
+    filtrli so'rov uchun esa ESTIMATE_CAP gacha cheklangan hisob.
+    """
+    if not queryset.query.where:
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    [table],
+                )
+                row = cursor.fetchone()
+                if row and row[0] is not None:
+                    return int(row[0])
+            elif connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    return int(row[0])
+    return queryset.order_by()[:ESTIMATE_CAP].count()
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
 
 class StandardPagination(PageNumberPagination):
     page_size = 4
     page_size_query_param = 'page_size'
     max_page_size = 1000
+    count_query_param = 'count'
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # ?cursor= yuborilgan va view keyset_fields ni qo'llasa — keyset rejimi (OFFSET va COUNT(*) siz)
+        self.keyset = None
+        if self.cursor_query_param in request.query_params and getattr(view, 'keyset_fields', None):
+            self.keyset = KeysetPagination(view.keyset_fields, self)
+            return self.keyset.paginate_queryset(queryset, request)
+
+        if request.query_params.get(self.count_query_param) == 'estimated':
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'count': self.page.paginator.count,
             'results': data
         })
+
+
+class KeysetPagination:
+    """
+    (created_at, id) kabi juftlik bo'yicha kamayish tartibidagi keyset pagination.
+    Cursor shaffof emas: base64 ichida oxirgi ko'rilgan qiymatlar va yo'nalish saqlanadi.
+    """
+
+    def __init__(self, fields, pagination):
+        self.field, self.tiebreaker = fields
+        self.pagination = pagination
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        payload = json.dumps([value.isoformat(), getattr(obj, self.tiebreaker), reverse])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, raw):
+        if not raw:
+            return None
+        try:
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+            return datetime.fromisoformat(value), int(pk), bool(reverse)
+        except (TypeError, ValueError):
+            raise NotFound("Noto'g'ri cursor")
+
+    def check_ordering(self, queryset):
+        # Keyset faqat (field, tiebreaker) kamayish tartibida ishlaydi — ?ordering= yoki qidiruv relevance
+        # tartibi jimgina almashtirilmasligi uchun so'rov rad etiladi
+        allowed = ([], [f'-{self.field}'], [f'-{self.field}', f'-{self.tiebreaker}'])
+        if list(queryset.query.order_by) not in allowed:
+            raise ValidationError({self.pagination.cursor_query_param: (
+                f"cursor rejimida tartib faqat -{self.field}, -{self.tiebreaker}; "
+                f"ordering yoki qidiruv (relevance) uchun ?page= rejimidan foydalaning"
+            )})
+
+    def paginate_queryset(self, queryset, request):
+        self.check_ordering(queryset)
+        self.request = request
+        self.page_size = self.pagination.get_page_size(request)
+        self.cursor = self.decode_cursor(request.query_params.get(self.pagination.cursor_query_param))
+        self.count = None
+        count_mode = request.query_params.get(self.pagination.count_query_param)
+        if count_mode == 'estimated':
+            self.count = estimate_count(queryset)
+        elif count_mode == 'exact':
+            self.count = queryset.count()
+
+        field, tiebreaker = self.field, self.tiebreaker
+        reverse = bool(self.cursor and self.cursor[2])
+        if self.cursor:
+            value, pk = self.cursor[0], self.cursor[1]
+            if reverse:
+                queryset = queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, f'{tiebreaker}__gt': pk}))
+            else:
+                queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, f'{tiebreaker}__lt': pk}))
+
+        if reverse:
+            queryset = queryset.order_by(field, tiebreaker)
+        else:
+            queryset = queryset.order_by(f'-{field}', f'-{tiebreaker}')
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.results = results
+        return results
+
+    def get_link(self, obj, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.pagination.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    def get_paginated_response(self, data):
+        next_link = previous_link = None
+        if self.results and self.has_next:
+            next_link = self.get_link(self.results[-1], False)
+        if self.results and self.has_previous:
+            previous_link = self.get_link(self.results[0], True)
+        elif self.has_previous:
+            previous_link = replace_query_param(self.request.build_absolute_uri(), self.pagination.cursor_query_param, '')
+        response = {'next': next_link, 'previous': previous_link, 'ordering': [f'-{self.field}', f'-{self.tiebreaker}']}
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
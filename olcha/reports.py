@@ -0,0 +1,157 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from .models import Category, Order, OrderRollup, Product
+
+# Hisobotlar faqat OrderRollup'dan o'qiydi. Rollup'lar buyurtma yaratilganda/o'chirilganda
+# qisman yangilanadi, `manage.py rebuild_order_rollups` esa ularni Order jadvalidan qayta quradi.
+
+PERIODS = (OrderRollup.Period.HOUR, OrderRollup.Period.DAY)
+
+
+def bucket_start(moment, period):
+    local = timezone.localtime(moment)
+    if period == OrderRollup.Period.DAY:
+        local = local.replace(hour=0)
+    return local.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _product_categories(product_ids):
+    return dict(Product.objects.filter(pk__in=product_ids).values_list('pk', 'category_id'))
+
+
+def _apply(totals, categories):
+    # Qatorlarni bir xil tartibda yangilaymiz — parallel buyurtmalar orasida deadlock bo'lmasligi uchun
+    with transaction.atomic():
+        for (period, bucket, product_id), (count, units, revenue) in sorted(totals.items()):
+            rollups = OrderRollup.objects.filter(period=period, bucket=bucket, product_id=product_id)
+            changes = {'orders': F('orders') + count, 'units': F('units') + units, 'revenue': F('revenue') + revenue}
+            if count < 0:
+                rollups.update(**changes)
+                rollups.filter(orders=0).delete()
+                continue
+            if rollups.update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    OrderRollup.objects.create(
+                        period=period, bucket=bucket, product_id=product_id,
+                        category_id=categories.get(product_id), orders=count, units=units, revenue=revenue,
+                    )
+            except IntegrityError:
+                # Parallel buyurtma qatorni allaqachon yaratgan
+                rollups.update(**changes)
+
+
+def _collect(orders, sign):
+    totals = {}
+    for order in orders:
+        for period in PERIODS:
+            row = totals.setdefault((period, bucket_start(order.created_at, period), order.product_id), [0, 0, Decimal(0)])
+            row[0] += sign
+            row[1] += sign * order.quantity
+            row[2] += sign * order.total_price
+    return totals
+
+
+def record_orders(orders):
+    """Yangi buyurtmalarni soatlik va kunlik rollup'larga qo'shadi (buyurtma tranzaksiyasi ichida chaqiriladi)."""
+    if orders:
+        _apply(_collect(orders, 1), _product_categories({order.product_id for order in orders}))
+
+
+def forget_order(order):
+    _apply(_collect([order], -1), {})
+
+
+def rebuild_day(day):
+    """
+    Bir kunlik rollup'larni Order jadvalidan qayta quradi: har soat uchun created_at indeksi bo'yicha
+    bitta GROUP BY so'rov (MySQL'da vaqt zonasi jadvallariga bog'liq funksiyalarsiz), kunlik qatorlar soatliklardan yig'iladi.
+    Kunning rollup qatorlari avval qulflanadi: shu kunga tushgan parallel buyurtmaning qisman yangilanishi (_apply)
+    qayta qurish tugaguncha kutadi, shuning uchun uning ulushi na yo'qoladi, na ikki marta qo'shiladi.
+    """
+    start, end = day_bounds(day)
+    day_rollups = OrderRollup.objects.filter(
+        Q(period=OrderRollup.Period.HOUR, bucket__gte=start, bucket__lt=end)
+        | Q(period=OrderRollup.Period.DAY, bucket=start)
+    )
+    hourly, daily = [], {}
+    with transaction.atomic():
+        list(day_rollups.select_for_update().values_list('pk', flat=True))
+        moment = start
+        while moment < end:
+            rows = (
+                Order.objects.filter(created_at__gte=moment, created_at__lt=moment + timedelta(hours=1))
+                .values('product_id', category_id=F('product__category_id'))
+                .annotate(count=Count('id'), quantity=Sum('quantity'), revenue=Sum('total_price'))
+                .order_by()
+            )
+            for row in rows:
+                hourly.append(OrderRollup(
+                    period=OrderRollup.Period.HOUR, bucket=moment, product_id=row['product_id'],
+                    category_id=row['category_id'], orders=row['count'], units=row['quantity'], revenue=row['revenue'],
+                ))
+                total = daily.setdefault(row['product_id'], OrderRollup(
+                    period=OrderRollup.Period.DAY, bucket=start, product_id=row['product_id'],
+                    category_id=row['category_id'],
+                ))
+                total.orders += row['count']
+                total.units += row['quantity']
+                total.revenue += row['revenue']
+            moment += timedelta(hours=1)
+
+        day_rollups.delete()
+        OrderRollup.objects.bulk_create(hourly + list(daily.values()), batch_size=1000)
+    return len(hourly) + len(daily)
+
+
+def revenue_series(period, start, end):
+    rows = (
+        OrderRollup.objects.filter(period=period, bucket__gte=start, bucket__lt=end)
+        .values('bucket')
+        .annotate(order_count=Sum('orders'), unit_count=Sum('units'), revenue_total=Sum('revenue'))
+        .order_by('bucket')
+    )
+    return [
+        {'bucket': row['bucket'], 'orders': row['order_count'], 'units': row['unit_count'], 'revenue': row['revenue_total']}
+        for row in rows
+    ]
+
+
+def top_products(start, end, limit=10, by='revenue'):
+    ordering = '-revenue_total' if by == 'revenue' else '-unit_count'
+    rows = list(
+        OrderRollup.objects.filter(period=OrderRollup.Period.DAY, bucket__gte=start, bucket__lt=end)
+        .values('product_id')
+        .annotate(order_count=Sum('orders'), unit_count=Sum('units'), revenue_total=Sum('revenue'))
+        .order_by(ordering, 'product_id')[:limit]
+    )
+    names = dict(Product.objects.filter(pk__in=[row['product_id'] for row in rows]).values_list('pk', 'name'))
+    return [
+        {'product': row['product_id'], 'product_name': names.get(row['product_id']),
+         'orders': row['order_count'], 'units': row['unit_count'], 'revenue': row['revenue_total']}
+        for row in rows
+    ]
+
+
+def category_totals(start, end):
+    rows = list(
+        OrderRollup.objects.filter(period=OrderRollup.Period.DAY, bucket__gte=start, bucket__lt=end)
+        .values('category_id')
+        .annotate(order_count=Sum('orders'), unit_count=Sum('units'), revenue_total=Sum('revenue'))
+        .order_by('-revenue_total', 'category_id')
+    )
+    names = dict(Category.objects.filter(pk__in=[row['category_id'] for row in rows]).values_list('pk', 'title'))
+    return [
+        {'category': row['category_id'], 'category_title': names.get(row['category_id']),
+         'orders': row['order_count'], 'units': row['unit_count'], 'revenue': row['revenue_total']}
+        for row in rows
+    ]
@@ -0,0 +1,72 @@
+import re
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+# O'zbek (kirill) va rus harflarini lotinga o'giramiz: "телефон" va "telefon" bitta tokenga tushadi
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh',
+    'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+# o‘zbek, oʻzbek, o'zbek, o`zbek -> ozbek
+APOSTROPHES = re.compile(r"['`ʻʼ‘’]")
+TOKEN_RE = re.compile(r'\w+')
+MIN_TOKEN_LENGTH = 2
+MAX_QUERY_TOKENS = 8
+
+
+def normalize(text):
+    text = (text or '').lower()
+    text = ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    return APOSTROPHES.sub('', text)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(normalize(text)) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def build_search_text(name, description):
+    # Nom ikki marta yoziladi — relevance hisobida nomdagi moslik ko'proq og'irlik oladi
+    return ' '.join(tokenize(f'{name} {name} {description or ""}'))
+
+
+def search_products(queryset, query, prefix=True):
+    """
+    search_text bo'yicha qidiruv: MySQL'da FULLTEXT (BOOLEAN MODE), boshqa bazalarda LIKE fallback.
+    prefix=True bo'lsa har bir token prefiks sifatida qidiriladi (typeahead).
+    """
+    tokens = tokenize(query)[:MAX_QUERY_TOKENS]
+    if not tokens:
+        return queryset.none()
+
+    if connections[queryset.db].vendor == 'mysql':
+        suffix = '*' if prefix else ''
+        against = ' '.join(f'+{token}{suffix}' for token in tokens)
+        relevance = RawSQL(
+            'MATCH (olcha_product.search_text) AGAINST (%s IN BOOLEAN MODE)', [against], output_field=FloatField()
+        )
+        return queryset.annotate(relevance=relevance).filter(relevance__gt=0).order_by('-relevance', '-created_at')
+
+    # Fallback (SQLite va h.k.): search_text allaqachon normallashtirilgan, shuning uchun oddiy LIKE yetarli
+    condition = Q()
+    for token in tokens:
+        condition &= Q(search_text__contains=token)
+    return queryset.filter(condition).annotate(relevance=Value(1.0, output_field=FloatField())).order_by(
+        '-relevance', '-created_at'
+    )
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    SearchFilter (icontains) o'rniga ?search= ni to'liq matnli indeks orqali bajaradi.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_products(queryset, query)
@@ -1,53 +1,104 @@
+from datetime import timedelta
 from decimal import Decimal
 from rest_framework import serializers
-from .models import Category, SubCategory, Product, ProductImage, Comment, Order
+from .models import Category, SubCategory, Product, ProductImage, Comment, Order, OrderRollup
+from .orders import place_order
+from .metrics import TimedSerializerMixin
+from .tasks import enqueue
+from phonenumber_field.serializerfields import PhoneNumberField
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+def build_variant_urls(variants, request):
+    # Variantlar nisbiy URL bilan saqlanadi, so'rov bo'lsa to'liq URL qaytaramiz
+    result = {}
+    for name, entry in (variants or {}).items():
+        if name == 'source':
+            continue
+        result[name] = {
+            key: request.build_absolute_uri(value) if request and key in ('webp', 'jpeg') else value
+            for key, value in entry.items()
+        }
+    return result
 
 
-class ProductImageSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = ProductImage
-        fields = ['id', 'image', 'alt_text']
+class ProductImageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
 
+    def get_variants(self, obj):
+        return build_variant_urls(obj.variants, self.context.get('request'))
 
-class ProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductImage
+        fields = ['id', 'image', 'alt_text', 'variants']
+
+
+class SparseFieldsMixin:
+    """
+    ?fields=name,price — faqat ko'rsatilgan maydonlar; ?expand=average_rating — qo'shimcha maydonlar.
+    Parametrlar berilmasa javob avvalgidek (expandable_fields dan tashqari barcha maydonlar).
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    expandable_fields = ()
+
+    @staticmethod
+    def _split(value):
+        return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        all_fields = set(cls.Meta.fields)
+        default = all_fields - set(cls.expandable_fields)
+        params = getattr(request, 'query_params', None) or getattr(request, 'GET', None)
+        if not params:
+            return default
+        expand = cls._split(params.get(cls.expand_query_param)) & set(cls.expandable_fields)
+        requested = cls._split(params.get(cls.fields_query_param)) & all_fields
+        if requested:
+            return requested | expand
+        return default | expand
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        allowed = self.get_requested_fields(self.context.get('request'))
+        for name in set(self.fields) - allowed:
+            self.fields.pop(name)
+
+
+class ProductSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     subcategory_name = serializers.CharField(source='subcategory.name', read_only=True)
     likes = serializers.SerializerMethodField()
     images = ProductImageSerializer(many=True, read_only=True)
     like_count = serializers.SerializerMethodField()
     discounted_price = serializers.SerializerMethodField()
+    category_name = serializers.SerializerMethodField()
+    category_id = serializers.SerializerMethodField()
+    subcategory_id = serializers.SerializerMethodField()
+    average_rating = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+
+    # List'da faqat ?expand= bilan qaytariladigan maydonlar
+    expandable_fields = ('subcategory_id', 'category_name', 'category_id', 'average_rating', 'comment_count')
 
     def get_likes(self, instance):
-        user = self.context.get('request').user
-        if not user.is_authenticated:
+        # with_list_data() annotatsiyasi bo'lsa, qo'shimcha so'rov yuborilmaydi
+        if hasattr(instance, 'is_liked'):
+            return instance.is_liked
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated:
             return False
-        return user in instance.likes.all()
+        return instance.likes.filter(pk=request.user.pk).exists()
 
     def get_like_count(self, instance):
-        return instance.likes.count()
+        return instance.like_count
 
     def get_discounted_price(self, instance):
         if instance.discount > 0:
             return round(instance.price * (Decimal(1) - instance.discount / Decimal(100)), 2)
         return instance.price
 
-    class Meta:
-        model = Product
-        fields = [
-            "id", "name", "description", "price", "discounted_price",
-            "discount", "quantity", "likes", "like_count",
-            "subcategory_name", "images", "created_at", "updated_at", "slug"
-        ]
-
-
-class ProductDetailSerializer(ProductSerializer):
-    category_name = serializers.SerializerMethodField()
-    category_id = serializers.SerializerMethodField()
-    subcategory_id = serializers.SerializerMethodField()
-    comments = serializers.SerializerMethodField()
-    average_rating = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-
     def get_category_name(self, obj):
         if obj.subcategory and obj.subcategory.category:
             return obj.subcategory.category.title
@@ -63,19 +114,46 @@ class ProductDetailSerializer(ProductSerializer):
             return obj.subcategory.id
         return None
 
-    def get_comments(self, obj):
-        comments = obj.comment_product.all().order_by('-created')[:5]   # Faqat so'nggi 5 ta commentni qaytarish
-        return CommentModelSerializer(comments, many=True, context=self.context).data
-
     def get_average_rating(self, obj):
-        comments = obj.comment_product.all()
-        if not comments:
-            return 0
-        total = sum(comment.rating for comment in comments)
-        return round(total / comments.count(), 1)
+        return obj.average_rating
 
     def get_comment_count(self, obj):
-        return obj.comment_product.count()
+        return obj.rating_count
+
+    class Meta:
+        model = Product
+        fields = [
+            "id", "name", "description", "price", "discounted_price",
+            "discount", "quantity", "likes", "like_count",
+            "subcategory_name", "subcategory_id", "category_name", "category_id",
+            "images", "created_at", "updated_at", "slug", "average_rating", "comment_count"
+        ]
+
+
+class ProductDocumentSerializer(ProductSerializer):
+    # Foydalanuvchiga bog'liq "likes" maydonisiz — hujjat hamma uchun bir xil
+    expandable_fields = ()
+
+    class Meta:
+        model = Product
+        fields = [
+            "id", "name", "description", "price", "discounted_price",
+            "discount", "quantity", "like_count", "average_rating", "comment_count",
+            "subcategory_name", "images", "created_at", "updated_at", "slug"
+        ]
+
+
+class ProductDetailSerializer(ProductSerializer):
+    comments = serializers.SerializerMethodField()
+
+    expandable_fields = ()
+
+    def get_comments(self, obj):
+        if hasattr(obj, 'latest_comments'):
+            comments = obj.latest_comments
+        else:
+            comments = obj.comment_product.select_related('user').order_by('-created')[:5]   # Faqat so'nggi 5 ta commentni qaytarish
+        return CommentModelSerializer(comments, many=True, context=self.context).data
 
     class Meta:
         model = Product
@@ -88,7 +166,7 @@ class ProductDetailSerializer(ProductSerializer):
         ]
 
 
-class SubCategorySerializer(serializers.ModelSerializer):
+class SubCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.title', read_only=True)
 
     class Meta:
@@ -96,15 +174,23 @@ class SubCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "category", "category_name", "slug"]
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     subcategories_count = serializers.SerializerMethodField()
 
+    image_variants = serializers.SerializerMethodField()
+
+    def get_image_variants(self, obj):
+        return build_variant_urls(obj.variants, self.context.get('request'))
+
     def get_subcategories_count(self, obj):
+        # Count('subcategories') annotatsiyasi bo'lsa, har bir qator uchun alohida so'rov yuborilmaydi
+        if hasattr(obj, 'subcategories_total'):
+            return obj.subcategories_total
         return obj.subcategories.count()
 
     class Meta:
         model = Category
-        fields = ["id", "title", "image", "slug", "subcategories_count"]
+        fields = ["id", "title", "image", "image_variants", "slug", "subcategories_count"]
 
 
 class CategoryDetailSerializer(CategorySerializer):
@@ -112,40 +198,109 @@ class CategoryDetailSerializer(CategorySerializer):
 
     class Meta:
         model = Category
-        fields = ["id", "title", "image", "slug", "subcategories_count", "subcategories"]
+        fields = ["id", "title", "image", "image_variants", "slug", "subcategories_count", "subcategories"]
 
 
-class CommentModelSerializer(serializers.ModelSerializer):
+class CommentModelSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
+    image_variants = serializers.SerializerMethodField()
+
+    def get_image_variants(self, obj):
+        return build_variant_urls(obj.variants, self.context.get('request'))
 
     class Meta:
         model = Comment
-        fields = ['id', 'message', 'user', 'user_name', 'product', 'created', 'image', 'rating']
+        fields = ['id', 'message', 'user', 'user_name', 'product', 'created', 'image', 'image_variants', 'rating']
         read_only_fields = ['user', 'created']
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
 
     class Meta:
         model = Order
         fields = [
             'id', 'user', 'product', 'product_name', 'full_name',
-            'phone', 'address', 'quantity', 'total_price',
+            'phone', 'address', 'quantity', 'total_price', 'checkout_id',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['user', 'total_price', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'total_price', 'checkout_id', 'created_at', 'updated_at']
 
     def create(self, validated_data):
         # Foydalanuvchi autentifikatsiya qilingan bo'lsa, uni buyurtmaga qo'shamiz
         user = self.context['request'].user
         if user.is_authenticated:
-            validated_data['user'] = user
+            validated_data['user_id'] = user.pk
 
         try:
-            return Order.objects.create(**validated_data)
+            order = Order.objects.create(**validated_data)
         except ValueError as e:
             raise serializers.ValidationError({"error": str(e)})
+        # Tasdiqlash xabari fon vazifasi sifatida — javob kutmaydi
+        enqueue('orders.send_confirmation', [order.pk], idempotency_key=f'order-confirmation:{order.pk}')
+        return order
+
+
+class OrderItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    full_name = serializers.CharField(max_length=255)
+    phone = PhoneNumberField(region='UZ')
+    address = serializers.CharField()
+    items = OrderItemSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_items(self, items):
+        # Barcha mahsulotlar mavjudligini bitta so'rovda tekshiramiz
+        product_ids = {item['product'] for item in items}
+        found = set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+        missing = product_ids - found
+        if missing:
+            raise serializers.ValidationError(f"Mahsulot topilmadi: {sorted(missing)}")
+        return items
+
+    def create(self, validated_data):
+        try:
+            return place_order(
+                self.context['request'].user,
+                validated_data['full_name'], validated_data['phone'], validated_data['address'],
+                [(item['product'], item['quantity']) for item in validated_data['items']],
+            )
+        except ValueError as e:
+            raise serializers.ValidationError({"error": str(e)})
+
+
+class ProductImportSerializer(serializers.Serializer):
+    # Import qatorini bazaga yozishdan oldin tekshirish (olcha/catalog_io.py)
+    name = serializers.CharField(max_length=200)
+    slug = serializers.SlugField(max_length=255, required=False)
+    description = serializers.CharField(required=False)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal(0))
+    discount = serializers.IntegerField(min_value=0, max_value=100, default=0)
+    quantity = serializers.IntegerField(min_value=0, max_value=2 ** 31 - 1, default=0)
+    category = serializers.CharField(max_length=200, required=False)
+    subcategory = serializers.CharField(max_length=200, required=False)
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    # /reports/ so'rov parametrlari; date_to kuni ham oraliqqa kiradi
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    period = serializers.ChoiceField(choices=OrderRollup.Period.choices, default=OrderRollup.Period.DAY)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    by = serializers.ChoiceField(choices=['revenue', 'units'], default='revenue')
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        attrs.setdefault('date_to', today)
+        attrs.setdefault('date_from', attrs['date_to'] - timedelta(days=29))
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from date_to dan keyin bo'lishi mumkin emas")
+        if attrs['period'] == OrderRollup.Period.HOUR and (attrs['date_to'] - attrs['date_from']).days > 31:
+            raise serializers.ValidationError("Soatlik hisobot ko'pi bilan 31 kunlik oraliq uchun")
+        return attrs
 
 
 # Authentication serializer'lar
@@ -182,6 +337,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         )
         user.set_password(validated_data['password'])
         user.save()
+        enqueue('users.send_welcome', user.username, user.email, idempotency_key=f'welcome:{user.pk}')
         return user
 
 
@@ -0,0 +1,199 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+from .models import Category, SubCategory, Product, ProductImage, Comment, Order
+from .authentication import forget_user_state
+from .cache import invalidate_tags
+from .category_tree import TREE_TAG
+from .documents import schedule_refresh
+from .images import enqueue as enqueue_image
+from .tasks import enqueue
+from .reports import forget_order
+
+
+def refresh_like_counts(product_ids):
+    # Bitta UPDATE bilan like_count ni through jadvaldan qayta hisoblash
+    likes = Product.likes.through.objects.filter(product_id=OuterRef('pk')).order_by().values('product_id')
+    Product.objects.filter(pk__in=product_ids).update(
+        like_count=Coalesce(Subquery(likes.annotate(total=Count('id')).values('total')), Value(0))
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_rating(sender, instance, **kwargs):
+    # Mavjud comment tahrirlansa, eski mahsulot va reytingni eslab qolamiz
+    instance._previous = None
+    if instance.pk:
+        instance._previous = Comment.objects.filter(pk=instance.pk).values_list('product_id', 'rating').first()
+
+
+def _add_rating(product_id, rating, count):
+    Product.objects.filter(pk=product_id).update(
+        rating_sum=F('rating_sum') + rating * count,
+        rating_count=F('rating_count') + count,
+    )
+
+
+@receiver(post_save, sender=Comment)
+def add_comment_rating(sender, instance, created, **kwargs):
+    if created:
+        _add_rating(instance.product_id, instance.rating, 1)
+        return
+    if instance._previous is None:
+        return
+    old_product_id, old_rating = instance._previous
+    if old_product_id != instance.product_id:
+        # Izoh boshqa mahsulotga o'tkazildi — eskisidan ayirib, yangisiga qo'shamiz
+        _add_rating(old_product_id, old_rating, -1)
+        _add_rating(instance.product_id, instance.rating, 1)
+        invalidate_tags(f'products:{old_product_id}', f'comments:product:{old_product_id}')
+        schedule_refresh([old_product_id])
+    elif old_rating != instance.rating:
+        Product.objects.filter(pk=instance.product_id).update(
+            rating_sum=F('rating_sum') + (instance.rating - old_rating)
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_rating(sender, instance, **kwargs):
+    Product.objects.filter(pk=instance.product_id, rating_count__gt=0).update(
+        rating_sum=F('rating_sum') - instance.rating,
+        rating_count=F('rating_count') - 1,
+    )
+
+
+@receiver(m2m_changed, sender=Product.likes.through)
+def update_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        # Like faqat mahsulotning o'zini o'zgartiradi — umumiy list tegi emas, mahsulot tegi
+        if not reverse:
+            invalidate_tags(f'products:{instance.pk}')
+        elif pk_set:
+            invalidate_tags(*(f'products:{pk}' for pk in pk_set))
+
+    if action == 'pre_clear' and reverse:
+        # user.products.clear() — qaysi mahsulotlar ta'sirlanishini oldindan yozib qo'yamiz
+        instance._cleared_product_ids = list(instance.products.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if action == 'post_add' and not reverse:
+        # post_add da pk_set faqat haqiqatan qo'shilgan userlarni o'z ichiga oladi
+        if pk_set:
+            Product.objects.filter(pk=instance.pk).update(like_count=F('like_count') + len(pk_set))
+    elif action == 'post_add':
+        if pk_set:
+            Product.objects.filter(pk__in=pk_set).update(like_count=F('like_count') + 1)
+    elif action == 'post_clear':
+        product_ids = getattr(instance, '_cleared_product_ids', []) if reverse else [instance.pk]
+        refresh_like_counts(product_ids)
+    else:
+        refresh_like_counts(pk_set if reverse else [instance.pk])
+
+
+# Katalog keshini invalidatsiya qilish (olcha/cache.py). Mahsulot list teglari:
+# 'products' — filtrsiz ro'yxatlar, 'products:subcategory:{id}' — subkategoriya bo'yicha ro'yxatlar,
+# 'products:lists' — barcha ro'yxatlar (nomlar o'zgarishi, bulk import)
+PRODUCT_LISTS_TAG = 'products:lists'
+
+
+def product_list_tags(*subcategory_ids):
+    return ['products', *(f'products:subcategory:{pk}' for pk in set(subcategory_ids) if pk is not None)]
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    # Kategoriya nomi mahsulot ro'yxatlarida ham bor (category_name)
+    invalidate_tags(
+        'categories', f'categories:{instance.pk}', 'subcategories', TREE_TAG, 'products', PRODUCT_LISTS_TAG,
+    )
+
+
+@receiver([post_save, post_delete], sender=SubCategory)
+def invalidate_subcategory_cache(sender, instance, **kwargs):
+    invalidate_tags(
+        'subcategories', f'subcategories:{instance.pk}',
+        'categories', f'categories:{instance.category_id}', 'products', PRODUCT_LISTS_TAG, TREE_TAG,
+    )
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_subcategory(sender, instance, **kwargs):
+    # Boshqa subkategoriyaga ko'chirilsa eski subkategoriya ro'yxati ham eskirishi kerak
+    instance._previous_subcategory_id = None
+    if instance.pk:
+        instance._previous_subcategory_id = Product.objects.filter(pk=instance.pk).values_list(
+            'subcategory_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product_cache(sender, instance, created=False, update_fields=None, **kwargs):
+    previous = getattr(instance, '_previous_subcategory_id', None)
+    invalidate_tags(f'products:{instance.pk}', *product_list_tags(instance.subcategory_id, previous))
+    # Daraxtdagi mahsulot sonlari faqat yaratish/o'chirish yoki kategoriya o'zgarganda o'zgaradi
+    if created or kwargs.get('signal') is post_delete or update_fields is None or \
+            {'category', 'subcategory'} & set(update_fields):
+        invalidate_tags(TREE_TAG)
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def invalidate_product_image_cache(sender, instance, **kwargs):
+    invalidate_tags(f'products:{instance.product_id}')
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment_cache(sender, instance, **kwargs):
+    # Mahsulot detail'idagi so'nggi izohlar va reyting, izohlar ro'yxati ETag'i (olcha/conditional.py)
+    invalidate_tags(f'products:{instance.product_id}', 'comments', f'comments:product:{instance.product_id}')
+
+
+# Oldindan render qilingan mahsulot hujjatlarini yangilash (olcha/documents.py)
+@receiver(post_save, sender=Product)
+def refresh_product_document(sender, instance, **kwargs):
+    schedule_refresh([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=Comment)
+def refresh_related_product_document(sender, instance, **kwargs):
+    schedule_refresh([instance.product_id])
+
+
+@receiver(post_save, sender=SubCategory)
+def refresh_subcategory_documents(sender, instance, created, **kwargs):
+    if not created:
+        enqueue('subcategories.refresh_documents', instance.pk, coalesce_key=f'subcategory-documents:{instance.pk}')
+
+
+@receiver(m2m_changed, sender=Product.likes.through)
+def refresh_liked_product_documents(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schedule_refresh([instance.pk])
+    else:
+        schedule_refresh(pk_set or getattr(instance, '_cleared_product_ids', []))
+
+
+# Rasm variantlarini fon jarayonida yaratish (olcha/images.py)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Comment)
+def process_uploaded_image(sender, instance, **kwargs):
+    enqueue_image(instance, 'image')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_user_state(sender, instance, **kwargs):
+    # Bloklash/huquq o'zgarishi shu jarayonda darhol, boshqalarida JWT_USER_STATE_TTL ichida kuchga kiradi
+    forget_user_state(instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_rollups(sender, instance, **kwargs):
+    # Bekor qilingan (o'chirilgan) buyurtma hisobotlardan ham ayriladi
+    forget_order(instance)
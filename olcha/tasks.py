@@ -0,0 +1,140 @@
+import logging
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+from .models import Task
+
+logger = logging.getLogger('olcha.tasks')
+
+registry = {}
+
+
+def task(name, max_attempts=5):
+    """
+    Funksiyani fon vazifasi sifatida ro'yxatdan o'tkazadi. Argumentlar JSON'ga mos bo'lishi kerak.
+    """
+    def decorator(func):
+        registry[name] = (func, max_attempts)
+        func.task_name = name
+        return func
+    return decorator
+
+
+def enqueue(name, *args, idempotency_key=None, coalesce_key=None, delay=0):
+    """
+    Vazifani navbatga qo'yadi. Joriy tranzaksiya bilan birga commit bo'ladi.
+    TASKS_EAGER=True bo'lsa vazifa commit'dan keyin shu jarayonning o'zida bajariladi.
+
+    idempotency_key — vazifa bir marta bajariladi: bir xil kalit bilan qayta qo'yilgani e'tiborsiz qoldiriladi
+    (eager rejimda ham). Bajarilgan qatorlar TASKS_KEEP_DONE_HOURS dan keyin o'chiriladi (prune).
+    coalesce_key — navbatda kutib turgan vazifaga qo'shiladi; bajarilgan yoki bajarilayotgan bo'lsa qayta
+    navbatga qo'yiladi (keshni/hujjatlarni yangilash kabi vazifalar uchun — qatorlar soni o'smaydi).
+    """
+    if name not in registry:
+        raise ValueError(f"Noma'lum vazifa: {name}")
+    eager = getattr(settings, 'TASKS_EAGER', False)
+    if eager and idempotency_key is None:
+        transaction.on_commit(lambda: run_eager(name, args))
+        return None
+
+    key = idempotency_key or coalesce_key
+    # Eager rejimda qator faqat idempotency_key'ni eslab qolish uchun yoziladi
+    status = Task.Status.DONE if eager else Task.Status.PENDING
+    run_at = now() + timedelta(seconds=delay)
+    try:
+        with transaction.atomic():
+            task_obj = Task.objects.create(
+                name=name, args=list(args), idempotency_key=key, status=status,
+                max_attempts=registry[name][1], run_at=run_at,
+            )
+    except IntegrityError:
+        existing = Task.objects.filter(idempotency_key=key)
+        if coalesce_key is not None:
+            existing.exclude(status=Task.Status.PENDING).update(
+                status=Task.Status.PENDING, args=list(args), attempts=0, locked_at=None, last_error='', run_at=run_at,
+            )
+        return existing.first()
+    if eager:
+        transaction.on_commit(lambda: run_eager(name, args))
+    return task_obj
+
+
+def prune(keep_hours=None):
+    """
+    Bajarilgan vazifalarni o'chiradi (xatolilari tekshirish uchun qoldiriladi). O'chirilganlar sonini qaytaradi.
+    """
+    if keep_hours is None:
+        keep_hours = getattr(settings, 'TASKS_KEEP_DONE_HOURS', 24)
+    deleted, _ = Task.objects.filter(
+        status=Task.Status.DONE, updated_at__lt=now() - timedelta(hours=keep_hours)
+    ).delete()
+    return deleted
+
+
+def run_eager(name, args):
+    # Eager rejimda ham vazifa xatosi so'rovni buzmasligi kerak
+    try:
+        registry[name][0](*args)
+    except Exception:
+        logger.exception("Vazifa %s xato bilan tugadi", name)
+
+
+def claim(limit, lock_timeout=300):
+    """
+    Bajarishga tayyor vazifalarni band qiladi. SKIP LOCKED — bir nechta worker bir vazifani olmaydi.
+    lock_timeout dan uzoq "running" holatida qolganlar (worker o'lgan) qayta olinadi.
+    """
+    current = now()
+    ready = Q(status=Task.Status.PENDING, run_at__lte=current) | Q(
+        status=Task.Status.RUNNING, locked_at__lt=current - timedelta(seconds=lock_timeout)
+    )
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True).filter(ready).order_by('run_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        Task.objects.filter(id__in=ids).update(
+            status=Task.Status.RUNNING, locked_at=current, attempts=F('attempts') + 1
+        )
+    return ids
+
+
+def run(task_id):
+    task_obj = Task.objects.filter(pk=task_id, status=Task.Status.RUNNING).first()
+    if task_obj is None:
+        return
+    func = registry.get(task_obj.name, (None,))[0]
+    try:
+        if func is None:
+            raise LookupError(f"Noma'lum vazifa: {task_obj.name}")
+        func(*task_obj.args)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Vazifa #%s (%s) xato bilan tugadi: %s", task_obj.pk, task_obj.name, error)
+        # status=RUNNING sharti: bajarilayotganda coalesce_key bilan qayta qo'yilgan vazifa yana ishlaydi
+        if task_obj.attempts >= task_obj.max_attempts:
+            Task.objects.filter(pk=task_id, status=Task.Status.RUNNING).update(
+                status=Task.Status.FAILED, last_error=error, locked_at=None,
+            )
+        else:
+            # Eksponensial kutish: 2, 4, 8, ... soniya
+            Task.objects.filter(pk=task_id, status=Task.Status.RUNNING).update(
+                status=Task.Status.PENDING, last_error=error, locked_at=None,
+                run_at=now() + timedelta(seconds=2 ** task_obj.attempts),
+            )
+        return
+    Task.objects.filter(pk=task_id, status=Task.Status.RUNNING).update(
+        status=Task.Status.DONE, locked_at=None, last_error='',
+    )
+
+
+def init_worker():
+    # run_tasks jarayonlar pulining initializer'i
+    import django
+    django.setup()
+    # fork qilingan jarayon ota jarayonning DB soketini yopmasligi va ishlatmasligi kerak
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+from olcha.authentication import get_user_state, issue_tokens
+from olcha.models import Category, SubCategory, Product, ProductImage, Comment
+
+
+class CatalogTestCase(TestCase):
+    """
+    Kichik katalog: 2 kategoriya, har birida subkategoriya va `products` ta mahsulot (rasmlar, izohlar, like'lar bilan).
+    Kesh har testdan oldin tozalanadi — so'rovlar soni keshdan qat'i nazar o'lchanadi.
+    """
+    products = 12
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('olcha-user', 'user@olcha.uz', 'parol-12345')
+        cls.admin = User.objects.create_superuser('olcha-admin', 'admin@olcha.uz', 'parol-12345')
+        cls.categories, cls.subcategories = [], []
+        for index in range(2):
+            category = Category.objects.create(title=f'Kategoriya {index}')
+            cls.categories.append(category)
+            cls.subcategories.append(SubCategory.objects.create(category=category, name=f'Subkategoriya {index}'))
+        for index in range(cls.products):
+            subcategory = cls.subcategories[index % 2]
+            product = Product.objects.create(
+                name=f'Mahsulot {index}', description='Tavsif', price=1000 + index, quantity=10,
+                subcategory=subcategory, discount=10 if index % 3 == 0 else 0,
+            )
+            ProductImage.objects.create(product=product, image=f'product_images/test-{index}.jpg')
+            Comment.objects.create(product=product, user=cls.user, message='Yaxshi', rating=4)
+            if index % 2 == 0:
+                product.likes.add(cls.user)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        get_user_state(user.pk)  # holat keshi — birinchi so'rov sonini o'zgartirmasligi uchun
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_tokens(user).access_token}')
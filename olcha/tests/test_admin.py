@@ -0,0 +1,45 @@
+from django.test import Client
+from olcha.models import Comment, Order, Product
+from .base import CatalogTestCase
+
+
+class AdminChangelistQueryCountTests(CatalogTestCase):
+    """
+    Changelist so'rovlari soni qatorlar sonidan qat'i nazar o'zgarmas (list_select_related, taxminiy COUNT).
+    Sessiya va foydalanuvchi so'rovlari ham hisobga kiradi.
+    """
+    # sessiya + foydalanuvchi + taxminiy COUNT + sahifa; qolganlari list_filter variantlari (kategoriya/subkategoriya)
+    changelists = {
+        'category': 4, 'subcategory': 5, 'product': 6, 'productimage': 5, 'comment': 4, 'order': 4, 'task': 4,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        product = Product.objects.first()
+        for index in range(3):
+            Order(product=product, full_name=f'Ali Valiyev {index}', phone='+998901234567', address='Toshkent').save()
+
+    def get(self, path):
+        response = self.admin_client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_changelists(self):
+        for round_number in range(2):
+            for model, expected in self.changelists.items():
+                with self.subTest(model=model, round=round_number), self.assertNumQueries(expected):
+                    self.get(f'/admin/olcha/{model}/')
+            # Qatorlar ko'payganda ham so'rovlar soni o'zgarmaydi
+            product = Product.objects.create(name='Yana', price=1, quantity=100, subcategory=self.subcategories[0])
+            for _ in range(5):
+                Comment.objects.create(product=product, user=self.admin, message='Yana', rating=3)
+                Order(product=product, full_name='Yana', phone='+998901234567', address='Toshkent').save()
+
+    def test_prefix_search(self):
+        Comment.objects.create(product=Product.objects.first(), user=self.user, message='Ajoyib sifat', rating=5)
+        response = self.get('/admin/olcha/order/?q=Ali')
+        self.assertEqual(len(response.context['cl'].result_list), Order.objects.count())
+        response = self.get('/admin/olcha/comment/?q=Ajoyib')
+        self.assertEqual([comment.message for comment in response.context['cl'].result_list], ['Ajoyib sifat'])
@@ -0,0 +1,37 @@
+from olcha.models import Product, Comment
+from .base import CatalogTestCase
+
+
+class ProductAggregateTests(CatalogTestCase):
+    def test_full_save_keeps_concurrent_aggregates(self):
+        product = Product.objects.get(name='Mahsulot 1')
+        # Boshqa so'rov shu orada like va izoh qo'shdi
+        product.likes.add(self.admin)
+        Comment.objects.create(product=product, user=self.admin, message='Zo\'r', rating=5)
+
+        product.price = 5000
+        product.save()  # xotirada eski like_count/rating qiymatlari
+
+        product.refresh_from_db()
+        self.assertEqual(product.price, 5000)
+        self.assertEqual(product.like_count, 1)
+        self.assertEqual((product.rating_sum, product.rating_count), (9, 2))
+
+    def test_comment_moved_to_another_product(self):
+        first, second = Product.objects.order_by('pk')[:2]
+        comment = Comment.objects.get(product=first)
+        comment.product = second
+        comment.rating = 2
+        comment.save()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.rating_sum, first.rating_count), (0, 0))
+        self.assertEqual((second.rating_sum, second.rating_count), (6, 2))
+
+    def test_comment_rating_change(self):
+        comment = Comment.objects.select_related('product').first()
+        comment.rating = 1
+        comment.save()
+        comment.product.refresh_from_db()
+        self.assertEqual((comment.product.rating_sum, comment.product.rating_count), (1, 1))
@@ -0,0 +1,57 @@
+from olcha.models import Product
+from .base import CatalogTestCase
+
+
+class AsyncCatalogTests(CatalogTestCase):
+    # Async endpointlar: so'rovlar soni sahifa hajmi va bog'liq obyektlar soniga bog'liq emas
+
+    def get(self, path, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_category_list_and_detail(self):
+        data = self.get('/api/v1/async/categories/', 2)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([item['subcategories_count'] for item in data['results']], [1, 1])
+
+        category = self.categories[0]
+        data = self.get(f'/api/v1/async/categories/{category.pk}/', 2)
+        self.assertEqual(data['title'], category.title)
+        self.assertEqual([item['id'] for item in data['subcategories']], [self.subcategories[0].pk])
+
+    def test_subcategory_list_and_detail(self):
+        category = self.categories[1]
+        data = self.get(f'/api/v1/async/subcategories/?category={category.pk}', 2)
+        self.assertEqual([item['id'] for item in data['results']], [self.subcategories[1].pk])
+
+        subcategory = self.subcategories[0]
+        data = self.get(f'/api/v1/async/subcategories/{subcategory.pk}/', 1)
+        self.assertEqual((data['name'], data['category_name']), (subcategory.name, self.categories[0].title))
+
+    def test_product_list_pages(self):
+        data = self.get('/api/v1/async/products/?page_size=5', 3)
+        self.assertEqual((data['count'], len(data['results'])), (self.products, 5))
+        self.assertIsNotNone(data['next'])
+        self.assertIsNone(data['previous'])
+
+        last = self.get('/api/v1/async/products/?page_size=5&page=3', 3)
+        self.assertEqual(len(last['results']), 2)
+        self.assertIsNone(last['next'])
+
+    def test_product_detail(self):
+        product = Product.objects.get(slug='mahsulot-0')
+        data = self.get(f'/api/v1/async/products/{product.pk}/', 3)
+        self.assertEqual((data['id'], data['discounted_price'], data['likes']), (product.pk, 900.0, False))
+        self.assertEqual(len(data['images']), 1)
+        self.assertEqual(len(data['comments']), 1)
+
+        self.authenticate(self.user)
+        self.assertTrue(self.client.get(f'/api/v1/async/products/{product.pk}/').json()['likes'])
+
+    def test_missing_objects_return_404(self):
+        for path in ('/api/v1/async/categories/999/', '/api/v1/async/subcategories/999/',
+                     '/api/v1/async/products/999/', '/api/v1/async/products/?page=99'):
+            with self.assertNumQueries(1 if 'page' not in path else 2):
+                self.assertEqual(self.client.get(path).status_code, 404)
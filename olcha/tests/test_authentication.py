@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from olcha import authentication
+from olcha.authentication import get_user_state
+
+
+@override_settings(JWT_USER_STATE_MAX_ENTRIES=2)
+class UserStateCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f'user-{index}') for index in range(3)]
+
+    def setUp(self):
+        authentication._user_states.clear()
+
+    def test_cache_is_bounded_lru(self):
+        first, second, third = (user.pk for user in self.users)
+        get_user_state(first)
+        get_user_state(second)
+        get_user_state(first)  # endi eng yangi — second chiqariladi
+        get_user_state(third)
+        self.assertEqual(list(authentication._user_states), [first, third])
+
+        with self.assertNumQueries(0):
+            get_user_state(first)
+        with self.assertNumQueries(1):
+            get_user_state(second)
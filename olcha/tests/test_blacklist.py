@@ -0,0 +1,44 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from olcha.blacklist import BlacklistIndex, CachedRefreshToken
+
+
+@override_settings(TOKEN_BLACKLIST_SYNC_SECONDS=3600)
+class BlacklistIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('olcha-user')
+
+    def setUp(self):
+        # Boshqa worker: o'z bloom filtri bor, sinxronlash oralig'i hali tugamagan
+        self.other_worker = BlacklistIndex()
+        self.other_worker.sync()
+
+    def logout(self):
+        token = CachedRefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+        return token['jti']
+
+    @mock.patch.object(BlacklistIndex, '_maybe_stale', lambda self: False)
+    def test_miss_without_recent_logout_skips_database(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(self.other_worker.contains('yangi-jti'))
+
+    def test_logout_seen_by_other_worker_within_sync_window(self):
+        jti = self.logout()
+        with mock.patch('olcha.blacklist.LocMemCache', type(None)):  # kesh umumiy (Redis kabi) deb hisoblaymiz
+            self.assertTrue(self.other_worker._maybe_stale())
+            self.assertTrue(self.other_worker.contains(jti))
+
+    def test_local_cache_checks_database_on_miss(self):
+        jti = self.logout()
+        self.assertTrue(self.other_worker.contains(jti))
+
+    def test_blacklisted_token_rejected(self):
+        token = CachedRefreshToken.for_user(self.user)
+        token.blacklist()
+        with self.assertRaises(TokenError):
+            CachedRefreshToken(str(token))
@@ -0,0 +1,106 @@
+from django.test import override_settings
+from olcha import cache
+from olcha.likes import toggle_like
+from olcha.models import Product
+from .base import CatalogTestCase
+
+
+class CatalogCacheTests(CatalogTestCase):
+    # Kesh LocMemCache'da (REDIS_URL berilmagan) — Redis bilan bir xil API
+
+    def get(self, path):
+        hits = cache.stats['hits']
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, cache.stats['hits'] > hits
+
+    def test_list_and_detail_are_cached(self):
+        product = Product.objects.first()
+        for path in ('/api/v1/products/?page_size=3', f'/api/v1/products/{product.pk}/', '/api/v1/categories/'):
+            first, hit = self.get(path)
+            self.assertFalse(hit)
+            second, hit = self.get(path)
+            self.assertTrue(hit)
+            self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_normalized(self):
+        self.get('/api/v1/products/?page_size=2&discount=0')
+        _, hit = self.get('/api/v1/products/?discount=0&page_size=2')
+        self.assertTrue(hit)
+
+    def test_like_invalidates_only_pages_with_the_product(self):
+        first_page, _ = self.get('/api/v1/products/?page_size=2')
+        second_page, _ = self.get('/api/v1/products/?page_size=2&page=2')
+        liked = second_page.data['results'][0]['id']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(liked, self.admin.pk)
+
+        _, hit = self.get('/api/v1/products/?page_size=2')
+        self.assertTrue(hit)
+        response, hit = self.get('/api/v1/products/?page_size=2&page=2')
+        self.assertFalse(hit)
+        self.assertEqual(response.data['results'][0]['like_count'], second_page.data['results'][0]['like_count'] + 1)
+
+    def test_subcategory_lists_are_invalidated_separately(self):
+        first, second = self.subcategories
+        self.get(f'/api/v1/products/?subcategory={first.pk}')
+        self.get(f'/api/v1/products/?subcategory={second.pk}')
+        self.get('/api/v1/products/')
+
+        product = Product.objects.filter(subcategory=second).first()
+        product.price = 1
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+
+        self.assertTrue(self.get(f'/api/v1/products/?subcategory={first.pk}')[1])
+        self.assertFalse(self.get(f'/api/v1/products/?subcategory={second.pk}')[1])
+        self.assertFalse(self.get('/api/v1/products/')[1])
+
+    def test_moving_product_invalidates_old_subcategory(self):
+        first, second = self.subcategories
+        self.get(f'/api/v1/products/?subcategory={first.pk}')
+        product = Product.objects.filter(subcategory=first).first()
+        product.subcategory = second
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        response, hit = self.get(f'/api/v1/products/?subcategory={first.pk}')
+        self.assertFalse(hit)
+        self.assertNotIn(product.pk, [item['id'] for item in response.data['results']])
+
+    def test_invalidation_waits_for_commit(self):
+        before = cache.get_tag_versions(['products'])['products']
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            cache.invalidate_tags('products')
+            # Tranzaksiya ichida parallel o'quvchi hali eski versiyani ko'radi
+            self.assertEqual(cache.get_tag_versions(['products'])['products'], before)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get_tag_versions(['products'])['products'], before + 1)
+
+    @override_settings(CATALOG_CACHE_FRESH_SECONDS=0)
+    def test_evicted_version_is_not_reused(self):
+        product = Product.objects.first()
+        path = f'/api/v1/products/{product.pk}/'
+        self.get(path)
+        with self.captureOnCommitCallbacks(execute=True):
+            cache.invalidate_tags(f'products:{product.pk}')
+        # Versiya kaliti keshdan chiqib ketdi — qayta yaratilgan versiya eski yozuvnikiga teng bo'lmasligi kerak
+        cache.get_cache().delete(f'catalog:tag:products:{product.pk}')
+        self.assertFalse(self.get(path)[1])
+
+    def test_recently_invalidated_items_are_not_cached(self):
+        response, _ = self.get('/api/v1/products/?page_size=2')
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(response.data['results'][0]['id'], self.admin.pk)
+        # Sahifa teglarining versiyasi DB o'qishidan keyin olinadi — "yangi" teg bilan yozuv saqlanmaydi
+        self.get('/api/v1/products/?page_size=2')
+        self.assertFalse(self.get('/api/v1/products/?page_size=2')[1])
+
+    @override_settings(CATALOG_CACHE_FRESH_SECONDS=0)
+    def test_items_cached_again_after_fresh_window(self):
+        response, _ = self.get('/api/v1/products/?page_size=2')
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(response.data['results'][0]['id'], self.admin.pk)
+        self.get('/api/v1/products/?page_size=2')
+        self.assertTrue(self.get('/api/v1/products/?page_size=2')[1])
@@ -0,0 +1,74 @@
+import io
+from django.test import override_settings
+from olcha.catalog_io import export_lines, import_products, iter_records
+from olcha import tasks
+from olcha.models import Product, ProductDocument, Task
+from .base import CatalogTestCase
+
+
+def run_import(text, file_format='jsonl', batch_size=1000):
+    return import_products(iter_records(io.StringIO(text), file_format), batch_size=batch_size)
+
+
+class ProductImportTests(CatalogTestCase):
+    def test_invalid_rows_are_reported_and_valid_rows_saved(self):
+        result = run_import(
+            '{"name": "Yangi 1", "price": "10.50", "quantity": -3}\n'
+            '{"name": "Yangi 2", "price": "NaN"}\n'
+            '{"name": "Yangi 3", "price": "1e20"}\n'
+            'buzilgan satr\n'
+            '{"name": "Yangi 4", "price": "99.90", "quantity": 5}\n',
+            batch_size=2,
+        )
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([error['line'] for error in result['errors']], [1, 2, 3, 4])
+        self.assertTrue(Product.objects.filter(slug='yangi-4', quantity=5).exists())
+        self.assertFalse(Product.objects.filter(slug__in=['yangi-1', 'yangi-2', 'yangi-3']).exists())
+
+    def test_row_without_slug_does_not_overwrite_existing_product(self):
+        existing = Product.objects.get(slug='mahsulot-0')
+        result = run_import('name,price,quantity\nMahsulot 0,1.00,0\n', file_format='csv')
+
+        self.assertEqual((result['created'], result['updated']), (0, 0))
+        self.assertEqual(len(result['errors']), 1)
+        existing.refresh_from_db()
+        self.assertEqual((existing.price, existing.quantity), (1000, 10))
+
+    def test_explicit_slug_updates(self):
+        result = run_import('{"name": "Yangilangan", "slug": "mahsulot-1", "price": "7.00", "quantity": 2}\n')
+        self.assertEqual((result['created'], result['updated'], result['errors']), (0, 1, []))
+        product = Product.objects.get(slug='mahsulot-1')
+        self.assertEqual((product.name, product.price, product.quantity), ('Yangilangan', 7, 2))
+
+    @override_settings(TASKS_EAGER=False)
+    def test_update_refreshes_cache_and_document(self):
+        product = Product.objects.get(slug='mahsulot-1')
+        detail = self.client.get(f'/api/v1/products/{product.pk}/')
+        Task.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            run_import('{"name": "Yangilangan", "slug": "mahsulot-1", "price": "7.00", "quantity": 2}\n')
+
+        updated = Product.objects.get(pk=product.pk)
+        self.assertGreater(updated.updated_at, product.updated_at)
+        response = self.client.get(f'/api/v1/products/{product.pk}/')
+        self.assertNotEqual(response.data['name'], detail.data['name'])
+        self.assertEqual(response.data['name'], 'Yangilangan')
+
+        for pk in tasks.claim(1000):
+            tasks.run(pk)
+        self.assertIn('Yangilangan', ProductDocument.objects.get(product=product).body)
+
+    def test_ambiguous_slug_is_rejected(self):
+        Product.objects.create(name='Nusxa', slug='mahsulot-2', price=1, quantity=1)
+        result = run_import('{"name": "X", "slug": "mahsulot-2", "price": "5.00"}\n')
+
+        self.assertEqual((result['created'], result['updated']), (0, 0))
+        self.assertIn('mahsulot-2', result['errors'][0]['error'])
+        self.assertFalse(Product.objects.filter(slug='mahsulot-2', price=5).exists())
+
+    def test_export_import_round_trip_updates(self):
+        for file_format in ('csv', 'jsonl'):
+            exported = ''.join(export_lines(Product.objects.all(), file_format))
+            result = run_import(exported, file_format=file_format)
+            self.assertEqual((result['created'], result['updated'], result['errors']), (0, self.products, []))
+        self.assertEqual(Product.objects.count(), self.products)
@@ -0,0 +1,35 @@
+from django.test import override_settings
+from olcha import category_tree
+from olcha.models import Category
+from .base import CatalogTestCase
+
+URL = '/api/v1/categories/tree/'
+
+
+class CategoryTreeTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category_tree._snapshot.update(version=None, etag=None, body=None, built_at=0.0)
+
+    def rename_elsewhere(self):
+        # Boshqa worker'dagi o'zgarish: bu jarayonning LocMem versiyasi o'zgarmaydi
+        Category.objects.filter(pk=self.categories[0].pk).update(title='Boshqa worker')
+
+    def test_etag_is_content_hash(self):
+        first = self.client.get(URL)
+        category_tree._snapshot.update(version=None, built_at=0.0)  # boshqa jarayon o'zi quradi
+        second = self.client.get(URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+        self.rename_elsewhere()
+        category_tree._snapshot.update(version=None, built_at=0.0)
+        third = self.client.get(URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third['ETag'], first['ETag'])
+
+    def test_snapshot_expires(self):
+        self.client.get(URL)
+        self.rename_elsewhere()
+        self.assertNotIn('Boshqa worker', self.client.get(URL).content.decode())
+        with override_settings(CATEGORY_TREE_MAX_AGE=0):
+            self.assertIn('Boshqa worker', self.client.get(URL).content.decode())
@@ -0,0 +1,84 @@
+from olcha.likes import toggle_like
+from olcha.models import Category, Comment, Product
+from .base import CatalogTestCase
+
+
+class ConditionalGetTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        # Izohlar ro'yxati dam olish kunlari faqat adminlarga ochiq (IsWeekdayOrAdmin)
+        self.authenticate(self.admin)
+
+    def conditional(self, path):
+        first = self.client.get(path)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('ETag', first)
+        self.assertNotIn('Last-Modified', first)
+        return first, self.client.get(path, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    def test_unchanged_resources_return_304_without_body(self):
+        product = Product.objects.first()
+        category = Category.objects.first()
+        paths = [
+            '/api/v1/products/?page_size=12', f'/api/v1/products/{product.pk}/',
+            '/api/v1/categories/', f'/api/v1/categories/{category.pk}/',
+            '/api/v1/comments/?page_size=12', f'/api/v1/comments/by-product/{product.pk}/',
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                first, second = self.conditional(path)
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b'')
+                self.assertEqual(second['ETag'], first['ETag'])
+                self.assertGreater(len(first.content), 0)
+
+    def test_bytes_saved(self):
+        # Kesh hit'ida 304: tana yo'q, baza va serializer ishlamaydi (vaqt uchun `manage.py bench_conditional`)
+        path = '/api/v1/products/?page_size=12'
+        full = self.client.get(path)
+        saved = 0
+        for _ in range(5):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=full['ETag'])
+            self.assertEqual(response.status_code, 304)
+            saved += len(full.content) - len(response.content)
+        self.assertEqual(saved, 5 * len(full.content))
+        self.assertGreater(len(full.content), 4000)
+
+    def test_cached_304_runs_no_queries(self):
+        for path in ('/api/v1/products/?page_size=12', f'/api/v1/products/{Product.objects.first().pk}/'):
+            etag = self.client.get(path)['ETag']
+            with self.subTest(path=path), self.assertNumQueries(0):
+                self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_comment_304_runs_no_queries(self):
+        etag = self.client.get('/api/v1/comments/')['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/v1/comments/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_like_and_delete_change_list_etag(self):
+        path = '/api/v1/products/?page_size=12'
+        etag = self.client.get(path)['ETag']
+        product = Product.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(product.pk, self.admin.pk)
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE='Wed, 01 Jan 2099 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.order_by('pk').last().delete()
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_new_comment_changes_comment_etag(self):
+        product = Product.objects.first()
+        path = f'/api/v1/comments/by-product/{product.pk}/'
+        etag = self.client.get(path)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(product=product, user=self.admin, message='Yangi', rating=5)
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_lookup_returns_404(self):
+        # Regressiya: noto'g'ri pk 500 emas, 404 qaytarishi kerak
+        for path in ('/api/v1/products/abc/', '/api/v1/categories/abc/', '/api/v1/products/999999/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
@@ -0,0 +1,120 @@
+import os
+import threading
+from unittest import mock
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from olcha.db.mysql_pool import base
+from olcha.db.mysql_pool.base import ConnectionPool, get_pool
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.alive = True
+
+    def ping(self, reconnect):
+        if not self.alive:
+            raise OSError("ulanish uzilgan")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnect:
+    def __init__(self):
+        self.opened = []
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise OperationalError("server javob bermadi")
+        connection = FakeConnection(len(self.opened))
+        self.opened.append(connection)
+        return connection
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def pool(self, **options):
+        self.connect = FakeConnect()
+        return ConnectionPool(self.connect, **{'size': 1, 'max_overflow': 1, 'timeout': 0.05, **options})
+
+    def test_released_connection_is_reused(self):
+        pool = self.pool()
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual((pool.stats['opened'], pool.stats['reused']), (1, 1))
+
+    def test_limit_and_timeout(self):
+        pool = self.pool()
+        pool.acquire()
+        pool.acquire()
+        with self.assertRaises(OperationalError):
+            pool.acquire()
+        self.assertEqual(pool.open_count, 2)
+
+    def test_waiter_gets_released_connection(self):
+        pool = self.pool(timeout=5)
+        first, second = pool.acquire(), pool.acquire()
+        threading.Timer(0.05, pool.release, args=(first,)).start()
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats['waited'], 1)
+        pool.release(second)
+
+    def test_overflow_closed_on_release(self):
+        pool = self.pool()
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual((len(pool.idle), pool.open_count), (1, 1))
+        self.assertTrue(second.closed)
+
+    def test_unusable_connection_not_returned(self):
+        pool = self.pool()
+        connection = pool.acquire()
+        pool.release(connection, reusable=False)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_recycle_and_ping(self):
+        pool = self.pool(recycle=0)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIsNot(pool.acquire(), first)
+        self.assertTrue(first.closed)
+
+        pool = self.pool(ping_after=0)
+        first = pool.acquire()
+        pool.release(first)
+        first.alive = False
+        self.assertIsNot(pool.acquire(), first)
+
+    def test_failed_connect_frees_slot(self):
+        pool = self.pool(max_overflow=0)
+        self.connect.fail = True
+        with self.assertRaises(OperationalError):
+            pool.acquire()
+        self.connect.fail = False
+        self.assertIsNotNone(pool.acquire())
+        self.assertEqual(pool.open_count, 1)
+
+
+class GetPoolTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(base, '_pools', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_keyed_by_connection_params(self):
+        params = {'host': 'db1', 'user': 'olcha', 'database': 'olcha', 'ssl': {'ca': '/ca.pem'}}
+        first = get_pool('default', FakeConnect(), {}, params)
+        self.assertIs(get_pool('default', FakeConnect(), {}, dict(params)), first)
+        self.assertIsNot(get_pool('default', FakeConnect(), {}, {**params, 'host': 'db2'}), first)
+        self.assertIsNot(get_pool('default', FakeConnect(), {}, {**params, 'user': 'hisobot'}), first)
+        self.assertIn('default (olcha@db1/olcha)', base.pool_stats())
+
+    def test_new_pool_after_fork(self):
+        first = get_pool('default', FakeConnect(), {}, {'host': 'db1'})
+        with mock.patch.object(base.os, 'getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(get_pool('default', FakeConnect(), {}, {'host': 'db1'}), first)
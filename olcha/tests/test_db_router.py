@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from olcha import db_router
+from olcha.db_router import RequestState, _state, health
+from olcha.models import Category
+
+REPLICA = 'replica_test'
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA], DATABASE_ROUTERS=['olcha.db_router.ReplicaRouter'], REPLICA_HEALTH_INTERVAL=60,
+)
+class ReplicaRoutingTests(TestCase):
+    """
+    Ikkita SQLite bazasi: primary (test bazasi) va alohida fayldagi replika. Replikaga faqat unda bor yozuv
+    qo'yiladi — o'qish qaysi bazadan kelganini shu bilan ajratamiz.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        replica_settings = {**connections.settings['default']}
+        if replica_settings['ENGINE'] != 'django.db.backends.sqlite3':
+            raise unittest.SkipTest("faqat DB_ENGINE=sqlite bilan")
+        super().setUpClass()
+        # Replika alias'i test runner'dan keyin qo'shiladi (runner uni bilmaydi), fayl oxirida o'chiriladi
+        cls.directory = tempfile.mkdtemp()
+        replica_settings.update(
+            NAME=str(Path(cls.directory) / 'replica.sqlite3'), TEST={**replica_settings['TEST'], 'NAME': None, 'MIRROR': None},
+        )
+        connections.settings[REPLICA] = replica_settings
+        cls.databases = cls.databases | {REPLICA}
+        call_command('migrate', database=REPLICA, verbosity=0)
+        Category.objects.using(REPLICA).create(title='Replika')
+
+    @classmethod
+    def tearDownClass(cls):
+        if REPLICA in connections.settings:
+            connections[REPLICA].close()
+            del connections[REPLICA]
+            del connections.settings[REPLICA]
+            cls.databases = cls.databases - {REPLICA}
+            shutil.rmtree(cls.directory, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        Category.objects.create(title='Primary')
+
+    def setUp(self):
+        health.checked.clear()
+
+    def request(self, method='GET'):
+        token = _state.set(RequestState(method in db_router.SAFE_METHODS))
+        self.addCleanup(_state.reset, token)
+        return _state.get()
+
+    def titles(self):
+        return set(Category.objects.values_list('title', flat=True))
+
+    def test_safe_request_reads_replica(self):
+        state = self.request()
+        self.assertEqual(self.titles(), {'Replika'})
+        self.assertTrue(state.used_replica)
+
+    def test_reads_after_write_go_to_primary(self):
+        self.request()
+        Category.objects.create(title='Yangi')
+        self.assertEqual(self.titles(), {'Primary', 'Yangi'})
+
+    def test_unsafe_request_and_background_code_use_primary(self):
+        self.assertEqual(self.titles(), {'Primary'})
+        self.request('POST')
+        self.assertEqual(self.titles(), {'Primary'})
+
+    def test_unhealthy_replica_falls_back_and_probes_outside_lock(self):
+        def probe(alias):
+            self.assertFalse(health.lock.locked())
+            return False
+
+        self.request()
+        with mock.patch.object(health, 'probe', side_effect=probe) as patched:
+            self.assertEqual(self.titles(), {'Primary'})
+            self.assertEqual(self.titles(), {'Primary'})
+        self.assertEqual(patched.call_count, 1)  # natija REPLICA_RETRY_SECONDS saqlanadi
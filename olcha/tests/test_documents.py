@@ -0,0 +1,46 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from olcha import tasks
+from olcha.documents import refresh_documents
+from olcha.models import Product, ProductDocument, Task
+from olcha.orders import place_order
+from .base import CatalogTestCase
+
+
+class SubCategoryDocumentTests(CatalogTestCase):
+    @override_settings(TASKS_EAGER=False)
+    def test_subcategory_save_enqueues_single_task(self):
+        subcategory = self.subcategories[0]
+        subcategory.name = 'Yangi nom'
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                subcategory.save()
+        # So'rov ichida mahsulotlar o'qilmaydi va hujjatlar render qilinmaydi
+        self.assertFalse([query for query in queries if 'olcha_product' in query['sql']])
+
+        task_obj = Task.objects.get(name='subcategories.refresh_documents')
+        self.assertEqual(task_obj.args, [subcategory.pk])
+
+        ProductDocument.objects.all().delete()
+        tasks.claim(1000)
+        tasks.run(task_obj.pk)
+        self.assertEqual(ProductDocument.objects.count(), self.products // 2)
+        self.assertIn('Yangi nom', ProductDocument.objects.first().body)
+
+
+class OrderDocumentTests(CatalogTestCase):
+    @override_settings(TASKS_EAGER=False)
+    def test_order_refreshes_compact_quantity(self):
+        product = Product.objects.get(slug='mahsulot-0')
+        refresh_documents([product.pk])  # eski quantity bilan hujjat tayyor turibdi
+        Task.objects.all().delete()  # setUpTestData'dan qolgan vazifalar hujjatni yangilab qo'ymasin
+        with self.captureOnCommitCallbacks(execute=True):
+            place_order(None, 'Test', '+998901234567', 'Toshkent', [(product.pk, 3)])
+        for pk in tasks.claim(1000):
+            tasks.run(pk)
+
+        response = self.client.get('/api/v1/products/compact/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        document = next(item for item in response.json()['results'] if item['id'] == product.pk)
+        self.assertEqual(document['quantity'], product.quantity - 3)
@@ -0,0 +1,72 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from PIL import Image
+from olcha import cache
+from olcha.images import invalidate_result, process_image
+from olcha.models import Comment, Product, ProductImage, Task
+from .base import CatalogTestCase
+
+
+def png(size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'PNG')
+    return ContentFile(buffer.getvalue())
+
+
+class ImageVariantTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root, TASKS_EAGER=False)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.product = Product.objects.first()
+
+    def add_image(self, name, content):
+        image = ProductImage(product=self.product)
+        image.image.save(name, content, save=False)
+        image.save()
+        return image
+
+    def test_upload_enqueues_task(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = self.add_image('birinchi.png', png())
+        task_obj = Task.objects.get(idempotency_key=f'image:olcha.ProductImage:{image.pk}:image')
+        self.assertEqual(task_obj.args, ['olcha.ProductImage', image.pk, 'image'])
+
+    def test_replaced_image_variants_are_deleted(self):
+        image = self.add_image('birinchi.png', png())
+        process_image('olcha.ProductImage', image.pk, 'image')
+        image.refresh_from_db()
+        old_source = image.variants['source']
+        old_path = f"variants/{old_source.rsplit('.', 1)[0]}/thumb.webp"
+        self.assertTrue(default_storage.exists(old_path))
+
+        image.image.save('ikkinchi.png', png((32, 32)), save=False)
+        image.save()
+        process_image('olcha.ProductImage', image.pk, 'image')
+        image.refresh_from_db()
+        self.assertFalse(default_storage.exists(old_path))
+        self.assertEqual(image.variants['thumb']['width'], 32)
+
+    def test_decompression_bomb_is_skipped(self):
+        image = self.add_image('katta.png', png((400, 400)))
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            process_image('olcha.ProductImage', image.pk, 'image')
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {'source': image.image.name})
+
+    def test_comment_image_invalidates_comment_lists(self):
+        comment = Comment.objects.filter(product=self.product).first()
+        tags = ['comments', f'comments:product:{self.product.pk}', f'products:{self.product.pk}']
+        before = cache.get_tag_versions(tags)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_result(('olcha.Comment', comment.pk, self.product.pk))
+        after = cache.get_tag_versions(tags)
+        self.assertTrue(all(after[tag] > before[tag] for tag in tags))
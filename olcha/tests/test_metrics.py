@@ -0,0 +1,44 @@
+import asyncio
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from olcha.metrics import MetricsMiddleware, metrics_view, registry
+
+
+@override_settings(METRICS_ENABLED=True, SLOW_REQUEST_MS=10_000)
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        registry.reset()
+        self.factory = RequestFactory()
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_view_denied_without_configured_token(self):
+        self.assertEqual(metrics_view(self.factory.get('/metrics')).status_code, 403)
+
+    @override_settings(METRICS_TOKEN='maxfiy')
+    def test_view_requires_token(self):
+        self.assertEqual(metrics_view(self.factory.get('/metrics')).status_code, 403)
+        wrong = self.factory.get('/metrics', HTTP_AUTHORIZATION='Bearer boshqa')
+        self.assertEqual(metrics_view(wrong).status_code, 403)
+        response = metrics_view(self.factory.get('/metrics', HTTP_AUTHORIZATION='Bearer maxfiy'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_route_absent_when_disabled(self):
+        from config import settings as project_settings, urls
+
+        if project_settings.METRICS_ENABLED:
+            self.skipTest("muhitda METRICS_ENABLED=True")
+        self.assertNotIn('metrics', [getattr(pattern, 'name', None) for pattern in urls.urlpatterns])
+
+    def test_async_chain(self):
+        async def view(request):
+            return HttpResponse('ok')
+
+        middleware = MetricsMiddleware(view)
+        response = asyncio.run(middleware(self.factory.get('/async')))
+        self.assertEqual(response.content, b'ok')
+        self.assertIn('endpoint="GET <unmatched>"', registry.render())
+
+    def test_sync_chain(self):
+        middleware = MetricsMiddleware(lambda request: HttpResponse('ok'))
+        self.assertEqual(middleware(self.factory.get('/sync')).content, b'ok')
+        self.assertIn('olcha_request_duration_seconds_count{endpoint="GET <unmatched>"} 1', registry.render())
@@ -0,0 +1,114 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from olcha.models import Order, OrderRollup, Product
+from olcha.orders import OutOfStockError, place_order
+from olcha.reports import rebuild_day
+from .base import CatalogTestCase
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """
+    Parallel checkout'lar: oversell bo'lmasligi kerak. Test bazasi (SQLite shared-cache) bir vaqtda bitta
+    yozuvchiga ruxsat beradi va qolganlariga darhol "table is locked" qaytaradi — bunday urinish qayta
+    yuboriladi, MySQL'dagi qulf kutishga o'xshab. MySQL'da `manage.py stress_checkout` bilan tekshiring.
+    """
+    stock = 10
+    attempts = 40
+
+    def test_no_oversell(self):
+        product = Product.objects.create(name='Parallel', price=1000, quantity=self.stock)
+        other = Product.objects.create(name='Boshqa', price=500, quantity=self.attempts)
+        barrier = threading.Barrier(8)
+
+        def checkout():
+            for _ in range(1000):
+                try:
+                    place_order(None, 'Test', '+998901234567', 'Toshkent', [(product.pk, 1), (other.pk, 1)])
+                    return 'ok'
+                except OutOfStockError:
+                    return 'out'
+                except OperationalError:
+                    time.sleep(0.001)
+            return 'locked'
+
+        def attempt(index):
+            try:
+                if index < 8:
+                    barrier.wait(timeout=5)  # birinchi to'lqin bir vaqtda boshlanadi
+                return checkout()
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(attempt, range(self.attempts)))
+
+        product.refresh_from_db()
+        other.refresh_from_db()
+        sold = sum(Order.objects.filter(product=product).values_list('quantity', flat=True))
+        self.assertEqual(sold, results.count('ok'))
+        self.assertLessEqual(sold, self.stock)
+        self.assertEqual(sold + product.quantity, self.stock)
+        self.assertEqual(results.count('ok'), self.stock)
+        self.assertEqual(results.count('out'), self.attempts - self.stock)
+        # Muvaffaqiyatsiz checkout ikkinchi mahsulot zaxirasini ham kamaytirmaydi (hammasi yoki hech narsa)
+        self.assertEqual(other.quantity, self.attempts - sold)
+        self.assertEqual(Order.objects.filter(product=other).count(), sold)
+        day = OrderRollup.objects.get(period=OrderRollup.Period.DAY, product=product)
+        self.assertEqual(day.units, sold)
+
+    def test_out_of_stock_rolls_back_whole_checkout(self):
+        first = Product.objects.create(name='Birinchi', price=1000, quantity=5)
+        second = Product.objects.create(name='Ikkinchi', price=1000, quantity=1)
+        with self.assertRaises(OutOfStockError):
+            place_order(None, 'Test', '+998901234567', 'Toshkent', [(first.pk, 2), (second.pk, 2)])
+        first.refresh_from_db()
+        self.assertEqual(first.quantity, 5)
+        self.assertFalse(Order.objects.exists())
+
+
+class OrderRollupUpdateTests(CatalogTestCase):
+    def rollup(self, product):
+        return OrderRollup.objects.filter(period=OrderRollup.Period.DAY, product=product).values_list(
+            'orders', 'units', 'revenue'
+        ).first()
+
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = Product.objects.filter(discount=0).order_by('pk')[:2]
+        self.order = Order(product=self.first, full_name='Test', phone='+998901234567', address='Toshkent', quantity=1)
+        self.order.save()
+
+    def test_quantity_change_updates_rollup(self):
+        self.authenticate(self.admin)
+        response = self.client.patch(f'/api/v1/orders/{self.order.pk}/', {'quantity': 3}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.rollup(self.first), (1, 3, self.first.price * 3))
+
+    def test_product_change_moves_rollup(self):
+        self.order.product = self.second
+        self.order.save()
+        self.assertIsNone(self.rollup(self.first))
+        self.assertEqual(self.rollup(self.second), (1, 1, self.second.price))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.total_price, self.second.price)
+
+    def test_unrelated_change_keeps_rollup(self):
+        self.order.address = 'Samarqand'
+        with self.assertNumQueries(1):
+            self.order.save(update_fields=['address'])
+        self.assertEqual(self.rollup(self.first), (1, 1, self.first.price))
+
+    def test_rebuild_day_matches_incremental_rollup(self):
+        # Subkategoriyasiz mahsulot ham kategoriyasi bo'yicha hisobotga tushadi
+        loose = Product.objects.create(name='Subkategoriyasiz', price=200, quantity=5, category=self.categories[1])
+        place_order(None, 'Test', '+998901234567', 'Toshkent', [(loose.pk, 2), (self.first.pk, 1)])
+        before = set(OrderRollup.objects.values_list('period', 'product', 'category', 'orders', 'units', 'revenue'))
+
+        rebuild_day(timezone.localdate(self.order.created_at))
+        after = set(OrderRollup.objects.values_list('period', 'product', 'category', 'orders', 'units', 'revenue'))
+        self.assertEqual(after, before)
+        self.assertIn((OrderRollup.Period.DAY, loose.pk, self.categories[1].pk, 1, 2, 400), after)
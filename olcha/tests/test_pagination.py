@@ -0,0 +1,49 @@
+from olcha.models import Order
+from .base import CatalogTestCase
+
+
+class KeysetPaginationTests(CatalogTestCase):
+    def walk(self, path):
+        ids, url = [], path
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_cursor_walks_all_products_once(self):
+        ids = self.walk('/api/v1/products/?cursor=&page_size=5')
+        self.assertEqual(len(ids), self.products)
+        self.assertEqual(len(set(ids)), self.products)
+
+    def test_cursor_response_reports_ordering(self):
+        response = self.client.get('/api/v1/products/?cursor=')
+        self.assertEqual(response.data['ordering'], ['-created_at', '-id'])
+        self.assertNotIn('count', response.data)
+        self.assertEqual(self.client.get('/api/v1/products/?cursor=&count=exact').data['count'], self.products)
+
+    def test_cursor_rejects_other_orderings(self):
+        for path in (
+            '/api/v1/products/?cursor=&ordering=price',
+            '/api/v1/products/?cursor=&search=Mahsulot',
+            '/api/v1/products/search/?q=Mahsulot&cursor=',
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data)
+
+    def test_cursor_accepts_default_ordering(self):
+        response = self.client.get('/api/v1/products/?cursor=&ordering=-created_at')
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/v1/products/?cursor=garbage').status_code, 404)
+
+    def test_orders_cursor(self):
+        for index in range(3):
+            Order.objects.create(user=self.user, product_id=self.subcategories[0].products.first().pk,
+                                 full_name='Test', phone='+998901234567', address='Toshkent')
+        self.authenticate(self.user)
+        self.assertEqual(len(self.walk('/api/v1/orders/?cursor=&page_size=2')), 3)
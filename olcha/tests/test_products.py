@@ -0,0 +1,70 @@
+from olcha.models import Product
+from .base import CatalogTestCase
+
+
+class ProductQueryCountTests(CatalogTestCase):
+    # Sahifa hajmi qanday bo'lmasin so'rovlar soni o'zgarmas bo'lishi kerak
+    page_sizes = (1, 5, 12)
+
+    def test_list_anonymous(self):
+        # COUNT, mahsulotlar (JOIN subcategory/category), rasmlar prefetch
+        for page_size in self.page_sizes:
+            with self.subTest(page_size=page_size), self.assertNumQueries(3):
+                response = self.client.get(f'/api/v1/products/?page_size={page_size}')
+            self.assertEqual(len(response.data['results']), page_size)
+
+    def test_list_authenticated(self):
+        self.authenticate(self.user)
+        for page_size in self.page_sizes:
+            with self.subTest(page_size=page_size), self.assertNumQueries(3):
+                response = self.client.get(f'/api/v1/products/?page_size={page_size}')
+            liked = [item['likes'] for item in response.data['results']]
+            self.assertEqual(len(liked), page_size)
+        self.assertIn(True, liked)
+
+    def test_list_cursor_mode(self):
+        # Keyset rejimida COUNT yo'q
+        for page_size in self.page_sizes:
+            with self.subTest(page_size=page_size), self.assertNumQueries(2):
+                self.client.get(f'/api/v1/products/?cursor=&page_size={page_size}')
+
+    def test_detail(self):
+        # Mahsulot, rasmlar, so'nggi izohlar (foydalanuvchisi bilan)
+        self.authenticate(self.user)
+        for product in Product.objects.order_by('pk')[:3]:
+            with self.subTest(product=product.pk), self.assertNumQueries(3):
+                response = self.client.get(f'/api/v1/products/{product.pk}/')
+            self.assertEqual(len(response.data['comments']), 1)
+            self.assertEqual(len(response.data['images']), 1)
+
+
+class SparseFieldsetQueryCountTests(CatalogTestCase):
+    # ?fields= — faqat so'ralgan maydonlar uchun JOIN/prefetch; keyinchalik deferred maydon yuklanmasligi kerak
+    list_cases = {
+        'id,name,price': 2,                       # COUNT, mahsulotlar
+        'id,discounted_price,average_rating': 2,
+        'id,category_name,subcategory_name': 2,   # JOIN bilan, alohida so'rovsiz
+        'id,likes': 2,                            # is_liked annotatsiyasi
+        'id,images': 3,                           # + rasmlar prefetch
+    }
+    detail_cases = {
+        'id,name': 1,
+        'id,images': 2,
+        'id,comments': 2,                         # + so'nggi izohlar (foydalanuvchisi bilan)
+    }
+
+    def test_list_fields(self):
+        self.authenticate(self.user)
+        for fields, expected in self.list_cases.items():
+            for page_size in (1, 12):
+                with self.subTest(fields=fields, page_size=page_size), self.assertNumQueries(expected):
+                    response = self.client.get(f'/api/v1/products/?fields={fields}&page_size={page_size}')
+                self.assertEqual(set(response.data['results'][0]), set(fields.split(',')))
+
+    def test_detail_fields(self):
+        self.authenticate(self.user)
+        product = Product.objects.order_by('pk').first()
+        for fields, expected in self.detail_cases.items():
+            with self.subTest(fields=fields), self.assertNumQueries(expected):
+                response = self.client.get(f'/api/v1/products/{product.pk}/?fields={fields}')
+            self.assertEqual(set(response.data), set(fields.split(',')))
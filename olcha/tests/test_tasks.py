@@ -0,0 +1,70 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from olcha import tasks
+from olcha.models import Task
+
+calls = []
+
+
+@tasks.task('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@tasks.task('tests.changed_while_running')
+def changed_while_running():
+    # Vazifa ishlayotganda ma'lumot yana o'zgardi va vazifa qayta qo'yildi
+    tasks.enqueue('tests.changed_while_running', coalesce_key='ishlayapti')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_respects_idempotency_key(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue('tests.record', 1, idempotency_key='bir-marta')
+            tasks.enqueue('tests.record', 2, idempotency_key='bir-marta')
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue('tests.record', 3, idempotency_key='bir-marta')
+            tasks.enqueue('tests.record', 4)
+        self.assertEqual(calls, [1, 4])
+
+    def test_coalesce_key_reuses_row(self):
+        first = tasks.enqueue('tests.record', 1, coalesce_key='yangilash')
+        tasks.enqueue('tests.record', 1, coalesce_key='yangilash')
+        self.assertEqual(Task.objects.count(), 1)
+
+        tasks.claim(10)
+        tasks.run(first.pk)
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+        again = tasks.enqueue('tests.record', 1, coalesce_key='yangilash')
+        self.assertEqual((again.pk, again.status), (first.pk, Task.Status.PENDING))
+
+    def test_coalesced_while_running_runs_again(self):
+        task_obj = tasks.enqueue('tests.changed_while_running', coalesce_key='ishlayapti')
+        tasks.claim(10)
+        tasks.run(task_obj.pk)
+        # Tugagan ishga tushirish qatorni DONE qilmaydi — o'zgarish keyingi ishga tushirishda ko'riladi
+        self.assertEqual(Task.objects.get().status, Task.Status.PENDING)
+
+    def test_idempotency_key_is_not_rearmed(self):
+        task_obj = tasks.enqueue('tests.record', 1, idempotency_key='xat')
+        tasks.claim(10)
+        tasks.run(task_obj.pk)
+        tasks.enqueue('tests.record', 1, idempotency_key='xat')
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+    def test_prune_deletes_only_old_done_tasks(self):
+        for key, status, age in (
+            ('eski', Task.Status.DONE, 48), ('yangi', Task.Status.DONE, 1), ('xato', Task.Status.FAILED, 48),
+        ):
+            task_obj = tasks.enqueue('tests.record', 1, idempotency_key=key)
+            Task.objects.filter(pk=task_obj.pk).update(status=status, updated_at=now() - timedelta(hours=age))
+
+        self.assertEqual(tasks.prune(keep_hours=24), 1)
+        self.assertEqual(set(Task.objects.values_list('idempotency_key', flat=True)), {'yangi', 'xato'})
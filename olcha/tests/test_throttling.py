@@ -0,0 +1,62 @@
+import asyncio
+from unittest import mock
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from olcha.throttling import MemoryStore, SlidingWindowLimiter, ThrottleMiddleware
+
+
+class MemoryStoreTests(SimpleTestCase):
+    def test_incr_and_expiry(self):
+        store = MemoryStore()
+        with mock.patch('olcha.throttling.time.monotonic', return_value=100.0):
+            self.assertEqual([store.incr('a', 10) for _ in range(3)], [1, 2, 3])
+            self.assertEqual(store.get('a'), 3)
+        with mock.patch('olcha.throttling.time.monotonic', return_value=111.0):
+            self.assertEqual(store.get('a'), 0)
+            self.assertEqual(store.incr('a', 10), 1)
+
+    def test_sweep_drops_expired_keys(self):
+        store = MemoryStore()
+        store.sweep_every = 3
+        with mock.patch('olcha.throttling.time.monotonic', return_value=100.0):
+            store.incr('eski', 1)
+        with mock.patch('olcha.throttling.time.monotonic', return_value=200.0):
+            store.incr('yangi', 10)
+            store.incr('yangi', 10)
+        self.assertEqual(set(store.values), {'yangi'})
+
+    def test_sliding_window(self):
+        limiter = SlidingWindowLimiter(MemoryStore())
+        with mock.patch('olcha.throttling.time.time', return_value=60.0):
+            self.assertEqual([limiter.hit('k', 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        # Keyingi oynaning yarmida oldingi 4 ta so'rov 2 ta deb hisoblanadi
+        with mock.patch('olcha.throttling.time.time', return_value=150.0):
+            self.assertEqual(limiter.hit('k', 3, 60), (True, 0))
+            self.assertEqual(limiter.hit('k', 3, 60), (False, 30))
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()  # CacheStore hisoblagichlari
+
+    def test_username_limited_across_ips(self):
+        client = APIClient()
+        statuses = [
+            client.post('/api/v1/auth/login/', {'username': 'Olcha', 'password': 'xato'}, format='json',
+                        REMOTE_ADDR=f'10.0.0.{index}').status_code
+            for index in range(6)
+        ]
+        self.assertEqual(statuses, [400] * 5 + [429])
+        # Boshqa akkaunt uchun cheklov alohida
+        response = client.post('/api/v1/auth/login/', {'username': 'boshqa', 'password': 'xato'}, REMOTE_ADDR='10.0.1.1')
+        self.assertEqual(response.status_code, 400)
+
+    def test_async_chain(self):
+        async def view(request):
+            return HttpResponse('ok')
+
+        middleware = ThrottleMiddleware(view)
+        response = asyncio.run(middleware(RequestFactory().get('/')))
+        self.assertEqual(response.content, b'ok')
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed, RequestDataTooBig
+from django.http import JsonResponse
+from django.http.multipartparser import MultiPartParserError
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+logger = logging.getLogger('olcha.throttling')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    # '5/m', '100/hour' — DRF'dagi kabi format
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class MemoryStore:
+    """
+    Jarayon ichidagi hisoblagichlar (testlar va bitta jarayonli ishga tushirish uchun).
+    incr lock ostida — parallel thread'larda ham atomik.
+    """
+
+    sweep_every = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.operations = 0
+
+    def incr(self, key, ttl):
+        now = time.monotonic()
+        with self.lock:
+            value, expires = self.values.get(key, (0, 0))
+            if expires <= now:
+                value, expires = 0, now + ttl
+            self.values[key] = (value + 1, expires)
+            self.operations += 1
+            if self.operations % self.sweep_every == 0:
+                self.values = {k: v for k, v in self.values.items() if v[1] > now}
+            return value + 1
+
+    def get(self, key):
+        value, expires = self.values.get(key, (0, 0))
+        return value if expires > time.monotonic() else 0
+
+    def clear(self):
+        with self.lock:
+            self.values = {}
+
+
+class CacheStore:
+    """
+    Django kesh backend'idagi hisoblagichlar: Redis bo'lsa barcha worker'lar uchun umumiy.
+    cache.add + cache.incr — Redis'da ham, LocMemCache'da ham atomik.
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def incr(self, key, ttl):
+        self.cache.add(key, 0, ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # add va incr orasida kalit muddati tugagan
+            self.cache.set(key, 1, ttl)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class SlidingWindowLimiter:
+    """
+    Sirpanuvchi oyna (ikki qo'shni oyna hisoblagichining vaznli yig'indisi): faqat atomik incr kerak,
+    shuning uchun istalgan umumiy store bilan ishlaydi. Rad etilgan so'rovlar ham sanaladi.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def hit(self, key, limit, window):
+        """(ruxsat, retry_after_soniya) qaytaradi."""
+        now = time.time()
+        current = int(now // window)
+        elapsed = now - current * window
+        count = self.store.incr(f'throttle:{key}:{current}', window * 2)
+        previous = self.store.get(f'throttle:{key}:{current - 1}')
+        weighted = previous * (window - elapsed) / window + count
+        if weighted <= limit:
+            return True, 0
+        return False, max(1, math.ceil(window - elapsed))
+
+
+_limiter = None
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = SlidingWindowLimiter(import_string(settings.THROTTLE_STORE)())
+    return _limiter
+
+
+_proxy_warning_logged = False
+
+
+def client_ip(request):
+    """
+    THROTTLE_NUM_PROXIES — ilova oldidagi ishonchli proksilar (nginx, balanser) soni. 0 bo'lsa X-Forwarded-For
+    e'tiborsiz qoldiriladi (soxtalashtirib bo'ladi); proksi ortida esa REMOTE_ADDR hammada bir xil bo'ladi
+    va barcha mijozlar bitta hisoblagichni bo'lishadi — bu holat logga bir marta yoziladi.
+    """
+    global _proxy_warning_logged
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    proxies = settings.THROTTLE_NUM_PROXIES
+    if forwarded and not proxies and not _proxy_warning_logged:
+        _proxy_warning_logged = True
+        logger.warning(
+            "X-Forwarded-For keldi, lekin THROTTLE_NUM_PROXIES=0: cheklov REMOTE_ADDR (%s) bo'yicha — proksi ortida "
+            "barcha mijozlar bitta hisoblagichga tushadi. THROTTLE_NUM_PROXIES ni proksilar soniga tenglang.",
+            request.META.get('REMOTE_ADDR', ''),
+        )
+    if forwarded and proxies:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_identity(request):
+    """
+    Bearer token imzosi to'g'ri bo'lsa foydalanuvchi id'si (bazaga murojaatsiz), aks holda IP.
+    """
+    header = request.META.get(api_settings.AUTH_HEADER_NAME, '')
+    parts = header.split()
+    if len(parts) == 2 and parts[0] in api_settings.AUTH_HEADER_TYPES:
+        try:
+            return f'user:{AccessToken(parts[1])[api_settings.USER_ID_CLAIM]}'
+        except (TokenError, KeyError):
+            pass
+    return f'ip:{client_ip(request)}'
+
+
+def request_username(request):
+    """
+    Login so'rovidagi username (form yoki JSON) — IP'dan qat'i nazar bitta akkauntga parol terishni cheklash uchun.
+    Tana DATA_UPLOAD_MAX_MEMORY_SIZE doirasida o'qiladi; keyin DRF uni qayta o'qiy oladi.
+    """
+    try:
+        if request.content_type == 'application/json':
+            username = json.loads(request.body or b'{}').get('username')
+        else:
+            username = request.POST.get('username')
+    except (ValueError, AttributeError, RequestDataTooBig, MultiPartParserError):
+        return None
+    if not isinstance(username, str) or not username.strip():
+        return None
+    digest = hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+    return f'username:{digest}'
+
+
+# scope -> hisoblagich kaliti; ro'yxatda bo'lmagan scope'lar client_identity bo'yicha
+IDENTITIES = {'login_username': request_username}
+
+
+class ThrottleMiddleware:
+    """
+    THROTTLE_RULES dagi URL nomlari uchun so'rov sonini cheklaydi. process_view view'dan oldin,
+    ya'ni autentifikatsiya (parol xeshlash), sessiya va bazaga murojaatdan oldin ishlaydi.
+    Bitta URL'ga bir nechta scope berilishi mumkin (masalan login: IP va username bo'yicha).
+    Sync va async zanjirda ham ishlaydi.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'THROTTLE_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rules = {}
+        for url_name, scopes in settings.THROTTLE_RULES.items():
+            if isinstance(scopes, str):
+                scopes = (scopes,)
+            self.rules[url_name] = [(scope, *parse_rate(settings.THROTTLE_RATES[scope])) for scope in scopes]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        rules = self.rules.get(request.resolver_match.url_name)
+        if rules is None or request.method == 'OPTIONS':
+            return None
+        for scope, limit, window in rules:
+            identity = IDENTITIES.get(scope, client_identity)(request)
+            if identity is None:
+                continue
+            allowed, retry_after = get_limiter().hit(f'{scope}:{identity}', limit, window)
+            if allowed:
+                continue
+            response = JsonResponse(
+                {'detail': f"So'rovlar soni cheklovdan oshdi. {retry_after} soniyadan keyin urinib ko'ring."},
+                status=429,
+            )
+            response['Retry-After'] = str(retry_after)
+            return response
+        return None
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
-from olcha import views
+from olcha import views, async_views
 
 router = DefaultRouter()
 router.register(r'categories', views.CategoryViewSet)
@@ -9,6 +9,7 @@ router.register(r'subcategories', views.SubCategoryViewSet)
 router.register(r'products', views.ProductViewSet)
 router.register(r'product-images', views.ProductImageViewSet)  # Bu yerda ro'yxatga olish kerak
 router.register(r'orders', views.OrderViewSet, basename='order')
+router.register(r'reports', views.ReportViewSet, basename='report')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -16,6 +17,14 @@ urlpatterns = [
     path('comments/', views.CommentListCreateView.as_view(), name='comment-list-create'),
     path('comments/by-product/<int:pk>/', views.CommentListCreateView.as_view(), name='comment-list-create-by-product'),
 
+    # ASGI uchun async katalog endpointlari
+    path('async/categories/', async_views.category_list, name='async-category-list'),
+    path('async/categories/<int:pk>/', async_views.category_detail, name='async-category-detail'),
+    path('async/subcategories/', async_views.subcategory_list, name='async-subcategory-list'),
+    path('async/subcategories/<int:pk>/', async_views.subcategory_detail, name='async-subcategory-detail'),
+    path('async/products/', async_views.product_list, name='async-product-list'),
+    path('async/products/<int:pk>/', async_views.product_detail, name='async-product-detail'),
+
     # Authentication URL'lar:
     path('auth/register/', views.RegisterView.as_view(), name='auth_register'),
     path('auth/login/', views.LoginView.as_view(), name='auth_login'),
@@ -1,26 +1,45 @@
+import csv
+import io
 from rest_framework import viewsets, filters, generics
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.parsers import MultiPartParser
 from rest_framework.generics import ListCreateAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework_simplejwt.tokens import RefreshToken
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from .models import Category, SubCategory, Product, ProductImage, Comment, Order
 from .serializers import (
     CategorySerializer, CategoryDetailSerializer, SubCategorySerializer,
     ProductSerializer, ProductDetailSerializer, ProductImageSerializer,
-    CommentModelSerializer, RegisterSerializer, UserSerializer, OrderSerializer
+    CommentModelSerializer, RegisterSerializer, UserSerializer, OrderSerializer, CheckoutSerializer,
+    ReportQuerySerializer,
 )
+from .authentication import issue_tokens
+from .blacklist import CachedRefreshToken
 from .permissions import IsWeekdayOrAdmin, IsAdminOrReadOnly, CanDeleteProductInTwoMinutes
 from .pagination import StandardPagination
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-
-
-class CategoryViewSet(viewsets.ModelViewSet):
+from .cache import CachedReadMixin
+from .conditional import ConditionalGetMixin
+from .signals import PRODUCT_LISTS_TAG
+from .category_tree import tree_response
+from .search import ProductSearchFilter, search_products
+from .facets import ProductFacets
+from .documents import document_list_response, load_documents
+from .tasks import enqueue
+from .likes import liked_product_ids, toggle_like
+from .reports import category_totals, day_bounds, revenue_series, top_products
+from .catalog_io import detect_format, export_lines, import_products, iter_records
+
+
+class CategoryViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ModelViewSet):
+    cache_prefix = 'categories'
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
     lookup_field = 'pk'
@@ -35,10 +54,16 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return CategorySerializer
 
     def get_queryset(self):
-        return Category.objects.all()  # Pagination ishlashi uchun
+        return Category.objects.annotate(subcategories_total=Count('subcategories')).order_by('id')  # Pagination ishlashi uchun
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        # Navigatsiya menyusi uchun butun daraxt: jarayon ichidagi snapshot + ETag/304
+        return tree_response(request)
 
 
-class SubCategoryViewSet(viewsets.ModelViewSet):
+class SubCategoryViewSet(CachedReadMixin, viewsets.ModelViewSet):
+    cache_prefix = 'subcategories'
     queryset = SubCategory.objects.all().order_by('id')
     serializer_class = SubCategorySerializer
     lookup_field = 'pk'
@@ -49,18 +74,22 @@ class SubCategoryViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
 
     def get_queryset(self):
-        return SubCategory.objects.all()  # Pagination ishlashi uchun
+        return SubCategory.objects.select_related('category').order_by('id')  # Pagination ishlashi uchun
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, CachedReadMixin, viewsets.ModelViewSet):
+    cache_prefix = 'products'
+    cache_per_user = True  # "likes" maydoni foydalanuvchiga bog'liq
+    cache_item_tags = True  # like/rasm/izoh faqat o'sha mahsulot bor sahifalarni eskirtiradi
+    conditional_per_user = True
     queryset = Product.objects.all().order_by('-created_at')
     serializer_class = ProductSerializer
     lookup_field = 'pk'
     permission_classes = [IsAdminOrReadOnly, CanDeleteProductInTwoMinutes]
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    keyset_fields = ('created_at', 'id')  # ?cursor= bilan keyset pagination
+    filter_backends = [DjangoFilterBackend, ProductSearchFilter, filters.OrderingFilter]
     filterset_fields = ['subcategory', 'discount']
-    search_fields = ['name', 'description']
     ordering_fields = ['price', 'created_at', 'name']
 
     def get_serializer_class(self):
@@ -68,21 +97,124 @@ class ProductViewSet(viewsets.ModelViewSet):
             return ProductDetailSerializer
         return ProductSerializer
 
+    def get_list_cache_tags(self):
+        # ?subcategory= bo'yicha ro'yxat boshqa subkategoriyalardagi o'zgarishlardan eskirmaydi
+        subcategory = self.request.query_params.get('subcategory', '')
+        if subcategory.isdigit():
+            return [f'products:subcategory:{subcategory}', PRODUCT_LISTS_TAG]
+        return ['products']
+
+    def get_extra_detail_cache_tags(self, data):
+        tags = []
+        if data.get('category_id'):
+            tags.append(f"categories:{data['category_id']}")
+        if data.get('subcategory_id'):
+            tags.append(f"subcategories:{data['subcategory_id']}")
+        return tags
+
     def get_queryset(self):
         # pagination uchun maxsus filterlashni qo'shish mumkin
-        return Product.objects.all().order_by('-created_at')  # Pagination ishlashi uchun
+        queryset = Product.objects.all()
+        if self.action in ('list', 'search', 'faceted'):
+            queryset = queryset.with_list_data(self.request.user, self.get_requested_fields())
+        elif self.action == 'retrieve':
+            queryset = queryset.with_detail_data(self.request.user, self.get_requested_fields())
+        return queryset.order_by('-created_at')  # Pagination ishlashi uchun
+
+    def get_requested_fields(self):
+        # ?fields= / ?expand= bo'lmasa None — to'liq so'rov rejasi
+        params = self.request.query_params
+        if 'fields' not in params and 'expand' not in params:
+            return None
+        return self.get_serializer_class().get_requested_fields(self.request)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "q parametri talab qilinadi"}, status=400)
+
+        # Typeahead: faqat yengil maydonlar, annotatsiya va paginationsiz
+        if request.query_params.get('mode') == 'typeahead':
+            try:
+                limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+            except ValueError:
+                limit = 10
+            queryset = DjangoFilterBackend().filter_queryset(request, Product.objects.all(), self)
+            return Response(list(search_products(queryset, query).values('id', 'name', 'slug')[:limit]))
+
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        queryset = search_products(queryset, query)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def faceted(self, request):
+        # ?category=1,2&price_min=&price_max=&in_stock=1&has_discount=1 — natijalar va barcha faset sonlari
+        facets = ProductFacets(request.query_params)
+        base = self.filter_queryset(Product.objects.all())
+        page = self.paginate_queryset(facets.filter(self.filter_queryset(self.get_queryset())))
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        response.data['facets'] = facets.counts(base)
+        return response
+
+    @action(detail=False, methods=['get'])
+    def compact(self, request):
+        # Oldindan render qilingan JSON hujjatlar: serializer ishlamaydi, baytlar birlashtiriladi
+        queryset = self.filter_queryset(Product.objects.all().order_by('-created_at')).only('id', 'created_at')
+        page = self.paginate_queryset(queryset)
+        bodies = load_documents([product.pk for product in page])
+        return document_list_response(self.get_paginated_response([]).data, bodies)
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser],
+            parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "file talab qilinadi"}, status=400)
+
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        try:
+            result = import_products(iter_records(stream, file_format))
+        except (ValueError, csv.Error) as e:
+            return Response({"error": str(e)}, status=400)
+        result['errors'] = result['errors'][:100]
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAdminUser])
+    def bulk_export(self, request):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in ('csv', 'jsonl'):
+            return Response({"error": "file_format csv yoki jsonl bo'lishi kerak"}, status=400)
+
+        queryset = DjangoFilterBackend().filter_queryset(request, Product.objects.all(), self)
+        content_type = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(export_lines(queryset, file_format), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="products.{file_format}"'
+        return response
 
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def like(self, request, pk=None):
-        product = self.get_object()
-        user = request.user
+        product = get_object_or_404(Product.objects.only('id'), pk=pk)
 
-        if user in product.likes.all():
-            product.likes.remove(user)
-            return Response({'status': 'unliked'})
-        else:
-            product.likes.add(user)
+        if toggle_like(product.pk, request.user.pk):
             return Response({'status': 'liked'})
+        return Response({'status': 'unliked'})
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def liked(self, request):
+        # ?ids=1,2,3 — joriy foydalanuvchining like holatlari bitta so'rovda
+        try:
+            ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            return Response({"error": "ids butun sonlar ro'yxati bo'lishi kerak"}, status=400)
+        if len(ids) > 1000:
+            return Response({"error": "Ko'pi bilan 1000 ta id"}, status=400)
+
+        liked = liked_product_ids(request.user.pk, ids)
+        return Response({str(pk): pk in liked for pk in ids})
 
 
 class ProductImageViewSet(viewsets.ModelViewSet):
@@ -93,14 +225,20 @@ class ProductImageViewSet(viewsets.ModelViewSet):
     filterset_fields = ['product']
 
 
-class CommentListCreateView(ListCreateAPIView):
+class CommentListCreateView(ConditionalGetMixin, ListCreateAPIView):
     serializer_class = CommentModelSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsWeekdayOrAdmin]
     pagination_class = StandardPagination
+    keyset_fields = ('created', 'id')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['product', 'user', 'rating']
     search_fields = ['message']
 
+    def get_conditional_tags(self, detail, instance=None):
+        # Izoh o'zgarsa olcha/signals.py shu teglarni oshiradi
+        product_id = self.kwargs.get('pk')
+        return [f'comments:product:{product_id}'] if product_id else ['comments']
+
     def get_queryset(self):
         product_id = self.kwargs.get('pk')
         if product_id:
@@ -110,29 +248,68 @@ class CommentListCreateView(ListCreateAPIView):
     def perform_create(self, serializer):
         product_id = self.kwargs.get('pk')
         if product_id:
-            serializer.save(user=self.request.user, product_id=product_id)
+            comment = serializer.save(user_id=self.request.user.pk, product_id=product_id)
         else:
-            serializer.save(user=self.request.user)
+            comment = serializer.save(user_id=self.request.user.pk)
+        enqueue('comments.notify_admins', comment.pk, idempotency_key=f'comment-created:{comment.pk}')
 
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = StandardPagination
+    keyset_fields = ('created_at', 'id')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['product']
     search_fields = ['full_name', 'phone']
     ordering_fields = ['created_at', 'total_price']
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticatedOrReadOnly])
+    def checkout(self, request):
+        serializer = CheckoutSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        orders = serializer.save()
+        return Response(OrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED)
+
     def get_queryset(self):
         user = self.request.user
         if user.is_staff:
             return Order.objects.all().order_by('-created_at')
         elif user.is_authenticated:
-            return Order.objects.filter(user=user).order_by('-created_at')
+            return Order.objects.filter(user_id=user.pk).order_by('-created_at')
         return Order.objects.none()
 
 
+class ReportViewSet(viewsets.ViewSet):
+    """
+    Savdo hisobotlari: faqat OrderRollup jadvalidan o'qiladi (olcha/reports.py), Order jadvali skan qilinmaydi.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get_params(self):
+        serializer = ReportQuerySerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        params['start'] = day_bounds(params['date_from'])[0]
+        params['end'] = day_bounds(params['date_to'])[1]
+        return params
+
+    def list(self, request):
+        # Davr (kun/soat) bo'yicha tushum, buyurtmalar va sotilgan donalar
+        params = self.get_params()
+        return Response(revenue_series(params['period'], params['start'], params['end']))
+
+    @action(detail=False, methods=['get'], url_path='top-products')
+    def top_products(self, request):
+        params = self.get_params()
+        return Response(top_products(params['start'], params['end'], params['limit'], params['by']))
+
+    @action(detail=False, methods=['get'])
+    def categories(self, request):
+        params = self.get_params()
+        return Response(category_totals(params['start'], params['end']))
+
+
 # JWT
 class RegisterView(APIView):
     permission_classes = [AllowAny]
@@ -155,7 +332,7 @@ class LoginView(APIView):
         user = authenticate(username=username, password=password)
 
         if user:
-            refresh = RefreshToken.for_user(user)
+            refresh = issue_tokens(user)
             return Response({
                 "access": str(refresh.access_token),
                 "refresh": str(refresh)
@@ -172,7 +349,7 @@ class LogoutView(APIView):
             if not refresh_token:
                 return Response({"error": "Refresh token talab qilinadi"}, status=400)
 
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(refresh_token)
             token.blacklist()
             return Response({"detail": "Tizimdan chiqildi"}, status=200)
         except Exception as e:
@@ -183,5 +360,6 @@ class UserDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        # request.user token'dan qurilgan bo'lishi mumkin — to'liq profil uchun bazadan o'qiymiz
+        serializer = UserSerializer(get_object_or_404(User, pk=request.user.pk))
         return Response(serializer.data)